@@ -6,60 +6,463 @@ Version complète avec interface native PyQt5
 
 import os
 import sys
+import time
+import uuid
+import shutil
 import threading
 import http.server
 import socketserver
+import urllib.parse
+from http import HTTPStatus
 from pathlib import Path
 
+from ordo_metrics import AccessLogger, MetricsRegistry
+from ordo_pack import load_asset_pack
+from ordo_proxy import CachingProxy, ProxyCache, REVERSE_PROXY_PREFIX, default_policy, tunnel
+from python.src.ordo.blocklist import load_blocklist
+from python.src.ordo.displays import ScreenManager, select_screens
+from python.src.ordo.profiles import apply_profile, report_startup, select_profile
+from python.src.ordo.routing import BLOCK, CACHED_RESOURCE_TYPES, route_subresource
+
 # Vérification et import des modules requis
 try:
     from PyQt5.QtCore import QUrl, Qt
     from PyQt5.QtWidgets import (QApplication, QMainWindow, QShortcut, 
                                QMessageBox, QLineEdit, QVBoxLayout, QWidget)
-    from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineSettings
+    from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineSettings, QWebEngineProfile
+    from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInfo, QWebEngineUrlRequestInterceptor
     from PyQt5.QtGui import QKeySequence
+    from PyQt5.QtNetwork import QNetworkProxy
     PYQT_AVAILABLE = True
 except ImportError as e:
     print(f"Erreur d'importation PyQt5: {e}")
     PYQT_AVAILABLE = False
     import webbrowser
+    # Classes de base factices: le module reste importable (repli navigateur
+    # système, tests du serveur local)
+    QMainWindow = QWebEngineUrlRequestInterceptor = object
 
 # Configuration
 PORT = 8000
 HERE = Path(__file__).parent.absolute()
 INDEX_FILE = HERE / "index.html"
+COPY_BUFFER_SIZE = 64 * 1024  # Taille du tampon de copie (mémoire constante)
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get("ORDO_ACCESS_LOG_SAMPLE", "1.0"))
+PROXY_ENABLED = os.environ.get("ORDO_PROXY") == "1"  # Proxy cache hors ligne pour les apps distantes
+
+
+def parse_byte_ranges(header, size):
+    """Analyse un en-tête Range (RFC 7233) pour un fichier de `size` octets
+
+    Retourne None si l'en-tête est invalide (à ignorer), une liste vide si
+    aucune plage n'est satisfaisable, sinon la liste des plages (début, fin)
+    inclusives.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec:
+        return None
+
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition('-')
+        if not sep:
+            return None
+        start, end = start.strip(), end.strip()
+        try:
+            if not start:
+                # Suffixe: les N derniers octets
+                length = int(end)
+                if length <= 0 or size == 0:
+                    continue
+                ranges.append((max(size - length, 0), size - 1))
+                continue
+            first = int(start)
+            last = int(end) if end else None
+        except ValueError:
+            return None
+        if first < 0 or (last is not None and last < first):
+            return None
+        if first >= size:
+            continue
+        ranges.append((first, size - 1 if last is None else min(last, size - 1)))
+    return ranges
+
+
+class PackedBody:
+    """Corps de réponse lu directement dans l'archive projetée en mémoire"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def close(self):
+        self.data = None
+
 
 class LocalServerHandler(http.server.SimpleHTTPRequestHandler):
     """Handler HTTP personnalisé pour servir les fichiers locaux"""
     
+    METRICS_PATH = '/__ordo/metrics'
+    PROXY_PREFIX = REVERSE_PROXY_PREFIX
+    NO_CACHE = 'no-store, no-cache, must-revalidate'
+
     def __init__(self, *args, **kwargs):
+        self._ranges = None
+        self._etag = None
+        self._cache_control = self.NO_CACHE
+        self._status = 0
+        self._content_length = 0
+        self._proxying = False
         super().__init__(*args, directory=str(HERE), **kwargs)
     
+    def handle_one_request(self):
+        """Mesure chaque requête et la transmet au journal et aux métriques"""
+        self.command = None
+        self._status = 0
+        self._content_length = 0
+        self._proxying = False
+        start = time.perf_counter()
+        super().handle_one_request()
+        if not self.command:
+            return
+        duration = time.perf_counter() - start
+        if self.command == 'CONNECT' or self.path.startswith(('http://', 'https://', self.PROXY_PREFIX)):
+            path = self.PROXY_PREFIX  # Une seule série pour le proxy, quelle que soit l'URL relayée
+        else:
+            path = urllib.parse.urlsplit(self.path).path
+        nbytes = self._content_length if self.command != 'HEAD' else 0
+        self.server.metrics.observe_request(self.command, path, self._status, nbytes, duration)
+        if self.server.access_log is not None:
+            self.server.access_log.log({
+                'ts': time.time(),
+                'client': self.client_address[0],
+                'method': self.command,
+                'path': self.path,
+                'status': self._status,
+                'bytes': nbytes,
+                'duration_ms': round(duration * 1000, 3),
+                'range': self.headers.get('Range') if self.headers else None,
+                'user_agent': self.headers.get('User-Agent') if self.headers else None,
+            })
+
+    def send_response(self, code, message=None):
+        self._status = int(code)
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length':
+            self._content_length = int(value)
+        super().send_header(keyword, value)
+
+    def do_GET(self):
+        if not self._proxy_request():
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self._proxy_request():
+            super().do_HEAD()
+
+    def do_POST(self):
+        """Relayé sans cache en mode proxy; les fichiers locaux ne l'acceptent pas"""
+        if not self._proxy_request():
+            self.send_error(HTTPStatus.NOT_IMPLEMENTED, f"Unsupported method ({self.command!r})")
+
+    def do_CONNECT(self):
+        """Tunnel https quand le mode proxy est actif (destinations filtrées)"""
+        if self.server.proxy is None:
+            self.send_error(HTTPStatus.METHOD_NOT_ALLOWED, "Proxy désactivé")
+            return
+        self._proxying = True
+        tunnel(self, self.path, self.server.proxy.policy)
+
+    def _proxy_request(self):
+        """Relaie les requêtes de proxy (URI absolue ou /__ordo/proxy/<url>)
+
+        Retourne False si la requête concerne un fichier local.
+        """
+        reverse = self.path.startswith(self.PROXY_PREFIX)
+        if self.path.startswith(('http://', 'https://')):
+            url = self.path
+        elif reverse:
+            url = self.path[len(self.PROXY_PREFIX):]
+            if not url.startswith(('http://', 'https://')):
+                url = urllib.parse.unquote(url)
+        else:
+            return False
+
+        if self.server.proxy is None or not url.startswith(('http://', 'https://')):
+            self.send_error(HTTPStatus.FORBIDDEN, "Proxy désactivé")
+            return True
+        self._proxying = True
+        hit = self.server.proxy.handle(self, url, reverse=reverse)
+        self.server.metrics.observe_cache('proxy', hit)
+        return True
+
+    def send_head(self):
+        """Gère l'archive d'assets et les requêtes partielles (Range / If-Range)"""
+        self._ranges = None
+        self._etag = None
+        self._cache_control = self.NO_CACHE
+        if urllib.parse.urlsplit(self.path).path == self.METRICS_PATH:
+            return self._send_metrics_head()
+        pack = self.server.asset_pack
+        if pack is not None:
+            body = self._send_packed_head(pack)
+            self.server.metrics.observe_cache('pack', body is not None)
+            if body is not None:
+                return body
+
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        fs = os.stat(path)
+        self._etag = f'"{fs.st_mtime_ns:x}-{fs.st_size:x}"'
+        range_header = self.headers.get('Range')
+        if not range_header or not self._if_range_matches(fs):
+            return super().send_head()
+
+        size = fs.st_size
+        ranges = parse_byte_ranges(range_header, size)
+        if ranges is None:
+            return super().send_head()
+        if not ranges:
+            self._send_unsatisfiable(size)
+            return None
+
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        ctype = self.guess_type(path)
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header('Last-Modified', self.date_time_string(fs.st_mtime))
+        if len(ranges) == 1:
+            first, last = ranges[0]
+            self._ranges = [(first, last, b'')]
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Range', f'bytes {first}-{last}/{size}')
+            self.send_header('Content-Length', str(last - first + 1))
+        else:
+            boundary = uuid.uuid4().hex
+            self._ranges = []
+            total = 0
+            for first, last in ranges:
+                part_header = (
+                    f'\r\n--{boundary}\r\n'
+                    f'Content-Type: {ctype}\r\n'
+                    f'Content-Range: bytes {first}-{last}/{size}\r\n\r\n'
+                ).encode('latin-1')
+                self._ranges.append((first, last, part_header))
+                total += len(part_header) + last - first + 1
+            self._ranges.append((0, -1, f'\r\n--{boundary}--\r\n'.encode('latin-1')))
+            total += len(self._ranges[-1][2])
+            self.send_header('Content-Type', f'multipart/byteranges; boundary={boundary}')
+            self.send_header('Content-Length', str(total))
+        self.end_headers()
+        return f
+
+    def _send_metrics_head(self):
+        """Expose les métriques au format texte Prometheus"""
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        return PackedBody(body)
+
+    def _send_unsatisfiable(self, size):
+        self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.send_header('Content-Range', f'bytes */{size}')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send_packed_head(self, pack):
+        """Sert un asset depuis l'archive d'après son chemin
+
+        Retourne None si l'asset n'est pas empaqueté ou si le fichier a changé
+        depuis la construction (repli sur le dossier). Une plage unique est
+        servie en 206; plusieurs plages reçoivent le contenu entier (200).
+        """
+        url_path = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        rel_path = url_path.lstrip('/')
+        if not rel_path or rel_path.endswith('/'):
+            rel_path += 'index.html'
+        digest = pack.lookup(rel_path)
+        if digest is None:
+            return None
+        self._cache_control = 'no-cache'
+
+        self._etag = f'"{digest}"'
+        if self.headers.get('If-None-Match') == self._etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return PackedBody(b'')
+
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range', '').strip()
+        if range_header and (not if_range or if_range == self._etag):
+            # Les plages portent sur le contenu non compressé
+            data, ctype, _ = pack.blob(digest)
+            ranges = parse_byte_ranges(range_header, len(data))
+            if ranges == []:
+                self._send_unsatisfiable(len(data))
+                return None
+            if ranges is not None and len(ranges) == 1:
+                first, last = ranges[0]
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Range', f'bytes {first}-{last}/{len(data)}')
+                self.send_header('Content-Length', str(last - first + 1))
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                return PackedBody(data[first:last + 1])
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return PackedBody(data)
+
+        accept_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        data, ctype, encoding = pack.blob(digest, accept_gzip)
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        return PackedBody(data)
+
+    def _if_range_matches(self, fs):
+        """Vérifie la condition If-Range (ETag ou date de modification)"""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            return if_range == self._etag
+        return if_range == self.date_time_string(fs.st_mtime)
+
+    def copyfile(self, source, outputfile):
+        """Copie le corps par blocs bornés, plage par plage si nécessaire"""
+        if isinstance(source, PackedBody):
+            outputfile.write(source.data)
+            return
+        if not self._ranges:
+            shutil.copyfileobj(source, outputfile, COPY_BUFFER_SIZE)
+            return
+        for first, last, part_header in self._ranges:
+            if part_header:
+                outputfile.write(part_header)
+            if last < first:
+                continue
+            source.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                chunk = source.read(min(COPY_BUFFER_SIZE, remaining))
+                if not chunk:
+                    break
+                outputfile.write(chunk)
+                remaining -= len(chunk)
+
+    def log_request(self, code='-', size='-'):
+        """Les accès sont journalisés par handle_one_request (hors console)"""
+
     def log_message(self, format, *args):
-        """Surcharge pour logger proprement"""
-        print(f"[Ordo Server] {format % args}")
+        """Surcharge pour logger proprement (journal structuré si disponible)"""
+        if self.server.access_log is not None:
+            self.server.access_log.log({'ts': time.time(), 'level': 'error', 'message': format % args})
+        else:
+            print(f"[Ordo Server] {format % args}")
     
     def end_headers(self):
         """Ajoute les headers CORS pour éviter les problèmes"""
+        if self._proxying:
+            # Les en-têtes de l'origine sont transmis tels quels
+            super().end_headers()
+            return
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        self.send_header('Cache-Control', self._cache_control)
+        self.send_header('Accept-Ranges', 'bytes')
+        if self._etag:
+            self.send_header('ETag', self._etag)
         super().end_headers()
 
 
+class OrdoHTTPServer(socketserver.ThreadingTCPServer):
+    """Serveur multi-thread: un flux média long ne bloque pas les autres requêtes"""
+    daemon_threads = True
+    asset_pack = None  # Archive d'assets partagée par tous les threads
+    proxy = None       # Proxy cache, actif avec ORDO_PROXY=1
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = MetricsRegistry()
+        self.access_log = None
+        super().__init__(*args, **kwargs)
+
+    def server_close(self):
+        super().server_close()
+        if self.access_log is not None:
+            self.access_log.close()
+
+
+class RequestInterceptor(QWebEngineUrlRequestInterceptor):
+    """Bloque régies et traceurs et fait passer les sous-ressources https par le cache
+
+    Liste compilée partagée avec le bureau; les blocages sont comptés par
+    site visité. En mode proxy, les scripts, styles, images et polices https
+    des hôtes autorisés sont redirigés vers le proxy inverse du serveur local
+    (un tunnel CONNECT ne peut pas être mis en cache). Les requêtes du serveur
+    local et les navigations de premier niveau passent toujours telles quelles.
+    """
+
+    def __init__(self, blocklist=None, proxy_policy=None, parent=None):
+        super().__init__(parent)
+        self.blocklist = blocklist
+        self.proxy_policy = proxy_policy
+        self.proxy_base = f"http://127.0.0.1:{PORT}" if proxy_policy is not None else None
+        self.cached_types = {getattr(QWebEngineUrlRequestInfo, name) for name in CACHED_RESOURCE_TYPES}
+
+    def interceptRequest(self, info):
+        url = info.requestUrl()
+        if url.scheme() not in ("http", "https") or url.host() in ("localhost", "127.0.0.1"):
+            return
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceTypeMainFrame:
+            return
+        route = route_subresource(
+            bytes(url.toEncoded()).decode("ascii"), info.firstPartyUrl().host() or "web",
+            bytes(info.requestMethod()).decode("ascii"), info.resourceType() in self.cached_types,
+            blocklist=self.blocklist, proxy_base=self.proxy_base,
+            proxied=self.proxy_policy.allows_host if self.proxy_policy is not None else None)
+        if route == BLOCK:
+            info.block(True)
+        elif route is not None:
+            info.redirect(QUrl(route))
+
+
 class OrdoBrowser(QMainWindow):
     """Fenêtre principale du navigateur Ordo avec WebEngine"""
     
-    def __init__(self, url):
+    def __init__(self, url, screen=None):
         super().__init__()
-        self.init_ui(url)
+        self.init_ui(url, screen)
     
-    def init_ui(self, url):
+    def init_ui(self, url, screen=None):
         """Initialise l'interface utilisateur"""
-        # Configuration de la fenêtre
+        # Configuration de la fenêtre (sur l'écran attribué en multi-écrans)
         self.setWindowTitle("Ordo Browser")
-        self.setGeometry(0, 0, 1920, 1080)
+        if screen is not None:
+            self.setGeometry(screen.geometry())
+        else:
+            self.setGeometry(0, 0, 1920, 1080)
         
         # Widget central et layout principal
         central_widget = QWidget()
@@ -198,7 +601,16 @@ class OrdoBrowser(QMainWindow):
 def start_local_server():
     """Lance le serveur HTTP local en arrière-plan"""
     try:
-        with socketserver.TCPServer(("", PORT), LocalServerHandler) as httpd:
+        # En mode proxy, jamais d'écoute hors de la machine (sinon proxy ouvert du réseau local)
+        host = "127.0.0.1" if PROXY_ENABLED else ""
+        with OrdoHTTPServer((host, PORT), LocalServerHandler) as httpd:
+            httpd.asset_pack = load_asset_pack()
+            httpd.access_log = AccessLogger(sample_rate=ACCESS_LOG_SAMPLE_RATE)
+            if PROXY_ENABLED:
+                httpd.proxy = CachingProxy(ProxyCache(), default_policy())
+                print(f"[Ordo Server] Proxy cache actif sur localhost:{PORT}")
+            if httpd.asset_pack:
+                print(f"[Ordo Server] Archive d'assets: {httpd.asset_pack.path}")
             print(f"[Ordo Server] Serveur démarré sur http://localhost:{PORT}")
             httpd.serve_forever()
     except OSError as e:
@@ -227,11 +639,38 @@ def check_needs_server():
 
 def launch_with_pyqt(url):
     """Lance le navigateur avec PyQt5"""
-    app = QApplication(sys.argv)
+    # Une fenêtre par écran dans ce seul processus (--screens all ou ORDO_SCREENS=all)
+    screens, argv = select_screens(sys.argv)
+    # Profil de performance (--perf-profile ou ORDO_PERF_PROFILE), avant QApplication
+    profile, argv = select_profile(argv)
+    apply_profile(profile)
+    
+    app = QApplication(argv)
     app.setApplicationName("Ordo Browser")
+    report_startup(profile, "Ordo Browser")
+    if profile.http_cache_bytes:
+        QWebEngineProfile.defaultProfile().setHttpCacheMaximumSize(profile.http_cache_bytes)
+    
+    # Liste de blocage (ORDO_BLOCKLIST=off pour la désactiver)
+    blocklist = load_blocklist()
+    if blocklist is not None:
+        app.aboutToQuit.connect(blocklist.report)
+    if blocklist is not None or PROXY_ENABLED:
+        interceptor = RequestInterceptor(blocklist, default_policy() if PROXY_ENABLED else None, app)
+        QWebEngineProfile.defaultProfile().setUrlRequestInterceptor(interceptor)
+    
+    if PROXY_ENABLED:
+        # Tout le trafic web passe par le proxy cache du serveur local
+        QNetworkProxy.setApplicationProxy(QNetworkProxy(QNetworkProxy.HttpProxy, "127.0.0.1", PORT))
+    
+    # Serveur local, profil WebEngine et cache restent uniques pour tous les écrans
+    def open_browser(screen, primary):
+        browser = OrdoBrowser(url, screen)
+        browser.show()
+        return browser
     
-    browser = OrdoBrowser(url)
-    browser.show()
+    displays = ScreenManager(app, open_browser, screens)
+    displays.start()
     
     sys.exit(app.exec_())
 
@@ -342,7 +781,7 @@ def main():
         print()
     
     # Détermination du mode de lancement
-    needs_server = check_needs_server()
+    needs_server = check_needs_server() or PROXY_ENABLED
     
     if needs_server:
         print("[Ordo Browser] Détection: serveur HTTP nécessaire")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Ordo Metrics - Journal d'accès structuré et métriques du serveur local
+
+Le journal d'accès est écrit en JSON lines par un thread de fond (la file
+d'attente découple l'écriture disque du thread qui sert la requête), avec
+échantillonnage et rotation. Les métriques sont agrégées en mémoire et
+exposées au format texte Prometheus.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+LOG_DIR = Path.home() / ".ordo_logs"
+ACCESS_LOG_FILE = LOG_DIR / "access.jsonl"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# Bornes des histogrammes de latence, en secondes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+MAX_TRACKED_PATHS = 200  # Au-delà, les chemins sont agrégés sous "other"
+
+
+class AccessLogger:
+    """Journal d'accès JSON lines écrit hors du thread de service"""
+
+    def __init__(self, path=ACCESS_LOG_FILE, sample_rate=1.0,
+                 max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        self.sample_rate = sample_rate
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        self._queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._queue, file_handler)
+        self._logger = logging.getLogger(f"ordo.access.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener.start()
+
+    def log(self, record):
+        """Enfile un enregistrement; les erreurs ne sont jamais échantillonnées"""
+        is_error = record.get("status", 0) >= 400 or record.get("level") == "error"
+        if not is_error and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self._logger.info(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+
+    def close(self):
+        self._listener.stop()
+
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes (format Prometheus)"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """Compteurs et histogrammes du serveur, partagés entre threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = {}        # (méthode, statut) -> nombre
+        self.bytes_sent = 0
+        self.latency = {}         # chemin -> Histogram
+        self.cache = {}           # (cache, résultat) -> nombre
+
+    def observe_request(self, method, path, status, nbytes, duration):
+        with self._lock:
+            key = (method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_sent += nbytes
+            if path not in self.latency and len(self.latency) >= MAX_TRACKED_PATHS:
+                path = "other"
+            histogram = self.latency.get(path)
+            if histogram is None:
+                histogram = self.latency[path] = Histogram()
+            histogram.observe(duration)
+
+    def observe_cache(self, cache, hit):
+        with self._lock:
+            key = (cache, "hit" if hit else "miss")
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+    def render(self):
+        """Rend les métriques au format texte Prometheus 0.0.4"""
+        with self._lock:
+            lines = [
+                "# HELP ordo_requests_total Requêtes HTTP servies.",
+                "# TYPE ordo_requests_total counter",
+            ]
+            for (method, status), value in sorted(self.requests.items()):
+                lines.append(f"ordo_requests_total{_labels(method=method, status=status)} {value}")
+
+            lines += [
+                "# HELP ordo_response_bytes_total Octets de corps envoyés.",
+                "# TYPE ordo_response_bytes_total counter",
+                f"ordo_response_bytes_total {self.bytes_sent}",
+                "# HELP ordo_request_duration_seconds Latence par chemin.",
+                "# TYPE ordo_request_duration_seconds histogram",
+            ]
+            for path, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"ordo_request_duration_seconds_bucket{_labels(path=path, le=le)} {cumulative}")
+                lines.append(f"ordo_request_duration_seconds_sum{_labels(path=path)} {histogram.total}")
+                lines.append(f"ordo_request_duration_seconds_count{_labels(path=path)} {histogram.count}")
+
+            lines += [
+                "# HELP ordo_cache_requests_total Consultations de cache par résultat.",
+                "# TYPE ordo_cache_requests_total counter",
+            ]
+            hits = {}
+            for (cache, result), value in sorted(self.cache.items()):
+                lines.append(f"ordo_cache_requests_total{_labels(cache=cache, result=result)} {value}")
+                total = hits.setdefault(cache, [0, 0])
+                total[1] += value
+                if result == "hit":
+                    total[0] += value
+            lines += [
+                "# HELP ordo_cache_hit_ratio Part des consultations servies depuis le cache.",
+                "# TYPE ordo_cache_hit_ratio gauge",
+            ]
+            for cache, (hit, total) in sorted(hits.items()):
+                lines.append(f"ordo_cache_hit_ratio{_labels(cache=cache)} {hit / total if total else 0.0}")
+
+            lines += [
+                "# HELP ordo_uptime_seconds Durée de fonctionnement du serveur.",
+                "# TYPE ordo_uptime_seconds gauge",
+                f"ordo_uptime_seconds {time.time() - self.started}",
+            ]
+        return "\n".join(lines) + "\n"
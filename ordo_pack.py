@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Ordo Pack - Archive adressée par contenu du bureau web et des apps
+
+Format du fichier (tout en little-endian):
+    MAGIC (8 octets) | longueur de l'index (u32) | index JSON | blobs
+
+L'index associe chaque chemin relatif à l'empreinte SHA-256 de son contenu
+et à la date de modification (ns) et la taille du fichier source, et chaque
+empreinte à son type MIME et à ses variantes (identité, gzip
+précompressé) sous forme de couples (offset, longueur) dans la zone des
+blobs. Les contenus identiques ne sont stockés qu'une fois. Un fichier
+modifié sur disque depuis la construction est servi depuis le dossier.
+
+Utilisation:
+    python ordo_pack.py            # construit ordo.pack à la racine du projet
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+MAGIC = b"ORDOPK2\0"
+HEADER = struct.Struct("<8sI")
+HERE = Path(__file__).parent.absolute()
+PACK_FILE = HERE / "ordo.pack"
+
+# Contenu du bureau web embarqué dans l'archive
+PACK_SOURCES = ["index.html", "footer.html", "css", "js", "apps"]
+MAX_PACKED_SIZE = 4 * 1024 * 1024  # Les gros médias restent servis depuis le disque
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+def _iter_sources(root):
+    """Liste les fichiers à empaqueter, en chemins relatifs POSIX triés"""
+    for source in PACK_SOURCES:
+        path = root / source
+        if path.is_file():
+            yield source
+        elif path.is_dir():
+            for file in sorted(path.rglob("*")):
+                if file.is_file():
+                    yield file.relative_to(root).as_posix()
+
+
+def build_pack(root=HERE, output=PACK_FILE):
+    """Construit l'archive à partir des fichiers de `root`
+
+    Retourne le nombre de chemins empaquetés.
+    """
+    paths = {}
+    blobs = {}
+    data = bytearray()
+
+    for rel_path in _iter_sources(root):
+        file = root / rel_path
+        stat = file.stat()
+        if stat.st_size > MAX_PACKED_SIZE:
+            continue
+        content = file.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        ctype = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        paths[rel_path] = [digest, stat.st_mtime_ns, stat.st_size]
+        if digest in blobs:
+            continue
+
+        variants = {"type": ctype, "identity": [len(data), len(content)]}
+        data += content
+        if ctype.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            # On ne garde la variante que si elle fait gagner au moins 10 %
+            if len(compressed) < len(content) * 0.9:
+                variants["gzip"] = [len(data), len(compressed)]
+                data += compressed
+        blobs[digest] = variants
+
+    index = json.dumps({"paths": paths, "blobs": blobs}, separators=(",", ":")).encode("utf-8")
+    tmp = output.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index)))
+        f.write(index)
+        f.write(data)
+    os.replace(tmp, output)
+    return len(paths)
+
+
+class AssetPack:
+    """Lecture d'une archive Ordo projetée en mémoire (mmap, lecture seule)
+
+    `root` est le dossier d'origine des fichiers: une entrée dont le fichier
+    a changé (date ou taille) ou a disparu n'est plus servie depuis l'archive.
+    """
+
+    def __init__(self, path, root=HERE):
+        self.path = Path(path)
+        self.root = Path(root)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_len = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Archive invalide: {self.path}")
+            start = HEADER.size
+            index = json.loads(self._mm[start:start + index_len])
+        except Exception:
+            self._file.close()
+            raise
+        self._paths = index["paths"]
+        self._blobs = index["blobs"]
+        self._data_offset = start + index_len
+        self._view = memoryview(self._mm)
+
+    def lookup(self, rel_path):
+        """Retourne l'empreinte du contenu d'un chemin, ou None (absent ou périmé)"""
+        entry = self._paths.get(rel_path)
+        if entry is None:
+            return None
+        digest, mtime_ns, size = entry
+        try:
+            stat = os.stat(self.root / rel_path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+            return None
+        return digest
+
+    def blob(self, digest, accept_gzip=False):
+        """Retourne (contenu, type MIME, encodage) sans copie
+
+        L'encodage vaut 'gzip' si une variante précompressée est servie, sinon None.
+        """
+        variants = self._blobs[digest]
+        encoding = "gzip" if accept_gzip and "gzip" in variants else None
+        offset, length = variants[encoding or "identity"]
+        offset += self._data_offset
+        return self._view[offset:offset + length], variants["type"], encoding
+
+    def close(self):
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+
+def load_asset_pack(path=PACK_FILE, root=HERE):
+    """Ouvre l'archive si elle existe et que le mode dev est désactivé"""
+    if os.environ.get("ORDO_DEV") == "1" or not Path(path).exists():
+        return None
+    try:
+        return AssetPack(path, root)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[Ordo Pack] Archive ignorée ({e}), service depuis le dossier")
+        return None
+
+
+if __name__ == "__main__":
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else PACK_FILE
+    count = build_pack(HERE, output)
+    print(f"[Ordo Pack] {count} fichiers empaquetés dans {output} ({output.stat().st_size} octets)")
@@ -0,0 +1,684 @@
+#!/usr/bin/env python3
+"""
+Ordo Proxy - Cache HTTP hors ligne d'abord pour les apps distantes
+
+Le serveur local peut servir de proxy:
+    - proxy direct pour http:// (requêtes en URI absolue), avec cache;
+    - tunnel CONNECT pour https:// (chiffré de bout en bout, donc sans cache);
+    - proxy inverse sur /__ordo/proxy/<url>, avec cache, pour http et https.
+Les navigateurs d'Ordo redirigent les sous-ressources https des apps (scripts,
+styles, images, polices) vers le proxy inverse: elles sont ainsi cachées.
+
+Les réponses cachables sont stockées sur disque (métadonnées JSON + corps),
+dans une limite de taille avec éviction LRU. Cache-Control et Vary sont
+respectés, stale-while-revalidate est pris en charge et le contenu périmé
+est servi quand le réseau est indisponible. Les autres méthodes (POST...)
+sont relayées sans cache.
+
+Le serveur n'écoute que sur 127.0.0.1 en mode proxy, et ProxyPolicy limite
+les destinations: ports web, adresses publiques, hôtes déclarés par les apps
+de apps.yaml (ORDO_PROXY_ALLOW=domaine,... pour en changer, '*' pour tous).
+"""
+
+import email.utils
+import hashlib
+import http.client
+import ipaddress
+import json
+import os
+import select
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from pathlib import Path
+
+from python.src.ordo.routing import REVERSE_PROXY_PREFIX, reverse_proxy_url  # noqa: F401 (réexportés)
+
+CACHE_DIR = Path.home() / ".ordo_cache" / "proxy"
+APPS_CONFIG = Path(__file__).parent.absolute() / "python" / "apps.yaml"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+MAX_OBJECT_BYTES = 32 * 1024 * 1024
+UPSTREAM_TIMEOUT = 10
+COPY_BUFFER_SIZE = 64 * 1024
+
+CACHEABLE_STATUSES = {200, 203, 301, 404, 410}
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "proxy-connection", "te", "trailer", "transfer-encoding", "upgrade",
+}
+# Erreurs réseau qui déclenchent le service de contenu périmé
+NETWORK_ERRORS = (OSError, http.client.HTTPException)
+# Le proxy inverse change d'origine: les identifiants ne doivent pas la traverser
+CREDENTIAL_HEADERS = {"cookie", "authorization", "set-cookie"}
+
+
+class ProxyRefused(Exception):
+    """Destination interdite par la politique du proxy"""
+
+
+class ProxyPolicy:
+    """Destinations que le proxy accepte de relayer
+
+    Ports web uniquement (443 pour CONNECT), jamais d'adresse non publique
+    (boucle locale, réseau privé, lien local): le proxy ne peut pas servir de
+    relais vers le réseau local. Si `hosts` est donné, seuls ces domaines et
+    leurs sous-domaines sont joignables.
+    """
+
+    def __init__(self, hosts=None, ports=(80, 443), connect_ports=(443,), allow_private=False):
+        self.hosts = None if hosts is None else frozenset(h.lower().strip(".") for h in hosts)
+        self.ports = frozenset(ports)
+        self.connect_ports = frozenset(connect_ports)
+        self.allow_private = allow_private
+
+    def allows_host(self, host):
+        if self.hosts is None:
+            return True
+        host = host.lower().rstrip(".")
+        while host:
+            if host in self.hosts:
+                return True
+            host = host.partition(".")[2]
+        return False
+
+    def check(self, host, port, connect=False):
+        """Raison du refus d'une destination, ou None (sans résolution DNS)"""
+        if port not in (self.connect_ports if connect else self.ports):
+            return f"Port non autorisé: {port}"
+        if not host or not self.allows_host(host):
+            return f"Hôte non autorisé: {host}"
+        return None
+
+    def resolve(self, host, port):
+        """Adresse de connexion de l'hôte; lève ProxyRefused si elle n'est pas publique"""
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        if not self.allow_private:
+            for *_, sockaddr in infos:
+                address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+                if not address.is_global:
+                    raise ProxyRefused(f"Adresse non publique: {host} ({address})")
+        return infos[0][4][:2]
+
+
+def app_hosts(config=APPS_CONFIG):
+    """Domaines déclarés par les apps de apps.yaml (url, preconnect, prefetch, policy.network)"""
+    try:
+        import yaml
+    except ImportError:
+        return set()
+    try:
+        data = yaml.safe_load(Path(config).read_text(encoding="utf-8")) or {}
+    except (OSError, yaml.YAMLError):
+        return set()
+    hosts = set()
+    for app in data.get("apps") or []:
+        urls = [app.get("url") or ""] + list(app.get("preconnect") or []) + list(app.get("prefetch") or [])
+        for url in urls:
+            host = urllib.parse.urlsplit(url).hostname
+            if host and urllib.parse.urlsplit(url).scheme in ("http", "https"):
+                hosts.add(host)
+        hosts.update((app.get("policy") or {}).get("network") or [])
+    return hosts
+
+
+def default_policy():
+    """Politique du serveur local: ORDO_PROXY_ALLOW, sinon les hôtes des apps"""
+    allow = os.environ.get("ORDO_PROXY_ALLOW", "").strip()
+    if allow == "*":
+        return ProxyPolicy()
+    if allow:
+        return ProxyPolicy(hosts=[h.strip() for h in allow.split(",") if h.strip()])
+    return ProxyPolicy(hosts=app_hosts() or None)
+
+
+def parse_cache_control(value):
+    """'max-age=60, no-cache' -> {'max-age': '60', 'no-cache': None}"""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _seconds(directives, name):
+    try:
+        return int(directives.get(name) or 0)
+    except ValueError:
+        return 0
+
+
+def _http_date(value):
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def freshness_lifetime(headers, stored_at):
+    """Durée de fraîcheur en secondes (RFC 7234 §4.2.1, heuristique incluse)"""
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "max-age" in directives:
+        return _seconds(directives, "max-age")
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        date = _http_date(headers.get("date")) or stored_at
+        return max(0, expires - date)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return max(0, (stored_at - last_modified) / 10)
+    return 0
+
+
+def is_storable(status, headers, request_headers):
+    """Réponse stockable dans le cache partagé (RFC 7234 §3)"""
+    if status not in CACHEABLE_STATUSES:
+        return False
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives or "no-store" in parse_cache_control(request_headers.get("cache-control")):
+        return False
+    if "private" in directives:
+        return False
+    # Réponse à une requête authentifiée: seulement si l'origine l'autorise explicitement
+    if "authorization" in request_headers and not ("public" in directives or "s-maxage" in directives):
+        return False
+    if headers.get("vary", "").strip() == "*":
+        return False
+    length = headers.get("content-length")
+    return not (length and length.isdigit() and int(length) > MAX_OBJECT_BYTES)
+
+
+class ProxyCache:
+    """Cache disque borné en taille, éviction du moins récemment utilisé
+
+    Chaque URL a un fichier .vary qui liste les en-têtes de requête de sa
+    réponse; la clé d'une variante combine l'URL et leurs valeurs.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()  # clé -> taille, du plus ancien au plus récent
+        self._size = 0
+        entries = []
+        for meta in self.root.glob("*.meta"):
+            key = meta.stem
+            body = self.root / f"{key}.body"
+            try:
+                entries.append((meta.stat().st_mtime, key, body.stat().st_size + meta.stat().st_size))
+            except OSError:
+                continue
+        for _, key, size in sorted(entries):
+            self._lru[key] = size
+            self._size += size
+
+    @staticmethod
+    def _url_key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _variant_key(self, url, vary, request_headers):
+        values = "\n".join(f"{name}:{request_headers.get(name, '')}" for name in vary)
+        return hashlib.sha256(f"{url}\n{values}".encode("utf-8")).hexdigest()
+
+    def _vary_names(self, url):
+        try:
+            return json.loads((self.root / f"{self._url_key(url)}.vary").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+
+    def lookup(self, url, request_headers):
+        """Retourne (clé, métadonnées) de la variante correspondante, ou None"""
+        key = self._variant_key(url, self._vary_names(url), request_headers)
+        try:
+            meta = json.loads((self.root / f"{key}.meta").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self.touch(key)
+        return key, meta
+
+    def body_path(self, key):
+        return self.root / f"{key}.body"
+
+    def open_body(self, key):
+        """Ouvre le corps d'une entrée, ou None s'il a été évincé entre-temps"""
+        try:
+            return open(self.body_path(key), "rb")
+        except OSError:
+            return None
+
+    def invalidate(self, url, request_headers):
+        """Retire la variante de `url` (après un POST réussi, par exemple)"""
+        self._remove(self._variant_key(url, self._vary_names(url), request_headers))
+
+    def _remove(self, key):
+        with self._lock:
+            self._size -= self._lru.pop(key, 0)
+        for suffix in (".meta", ".body"):
+            try:
+                (self.root / f"{key}{suffix}").unlink()
+            except OSError:
+                pass
+
+    def touch(self, key):
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+        try:
+            os.utime(self.root / f"{key}.meta")
+        except OSError:
+            pass
+
+    def update_meta(self, key, meta):
+        tmp = self.root / f"{key}.{threading.get_ident()}.meta.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.root / f"{key}.meta")
+
+    def open_writer(self, url, request_headers, status, headers):
+        """Prépare l'écriture d'une réponse; le corps est fourni par blocs
+
+        Set-Cookie n'est jamais stocké: il serait rejoué à tous les clients.
+        """
+        headers = {name: value for name, value in headers.items() if name != "set-cookie"}
+        vary = [name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()]
+        return _CacheWriter(self, url, vary, self._variant_key(url, vary, request_headers), status, headers)
+
+    def _commit(self, writer, size):
+        (self.root / f"{self._url_key(writer.url)}.vary").write_text(json.dumps(writer.vary), encoding="utf-8")
+        os.replace(writer.tmp_path, self.body_path(writer.key))
+        self.update_meta(writer.key, writer.meta(size))
+        with self._lock:
+            self._size -= self._lru.pop(writer.key, 0)
+            self._lru[writer.key] = size
+            self._size += size
+            evicted = []
+            while self._size > self.max_bytes and len(self._lru) > 1:
+                key, old_size = self._lru.popitem(last=False)
+                self._size -= old_size
+                evicted.append(key)
+        for key in evicted:
+            self._remove(key)
+
+
+class _CacheWriter:
+    def __init__(self, cache, url, vary, key, status, headers):
+        self.cache = cache
+        self.url = url
+        self.vary = vary
+        self.key = key
+        self.status = status
+        self.headers = headers
+        self.size = 0
+        self.tmp_path = cache.root / f"{key}.{threading.get_ident()}.part"
+        self._file = open(self.tmp_path, "wb")
+
+    def write(self, chunk):
+        if self._file is None:
+            return
+        self.size += len(chunk)
+        if self.size > MAX_OBJECT_BYTES:
+            self.abort()
+            return
+        self._file.write(chunk)
+
+    def meta(self, size):
+        return {
+            "url": self.url,
+            "status": self.status,
+            "headers": self.headers,
+            "stored_at": time.time(),
+            "size": size,
+        }
+
+    def finish(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.cache._commit(self, self.size)
+
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            self.tmp_path.unlink()
+        except OSError:
+            pass
+
+
+class _BoundedReader:
+    """Corps de requête lu sur le socket du client, sans dépasser Content-Length"""
+
+    def __init__(self, stream, length):
+        self.stream = stream
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.stream.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+class CachingProxy:
+    """Logique de proxy partagée par les threads du serveur local"""
+
+    def __init__(self, cache, policy=None):
+        self.cache = cache
+        self.policy = policy or ProxyPolicy()
+        self._revalidating = set()
+        self._lock = threading.Lock()
+
+    # --- Amont -----------------------------------------------------------
+
+    def _upstream_request(self, url, request_headers, extra_headers=None, method="GET", body=None):
+        parts = urllib.parse.urlsplit(url)
+        https = parts.scheme == "https"
+        # Vérifiée à chaque connexion: un nom qui se résout vers le réseau local est
+        # refusé, et la connexion vise l'adresse vérifiée (pas de nouvelle résolution)
+        address = self.policy.resolve(parts.hostname, parts.port or (443 if https else 80))
+        conn_class = http.client.HTTPSConnection if https else http.client.HTTPConnection
+        conn = conn_class(parts.netloc, timeout=UPSTREAM_TIMEOUT)
+        sock = socket.create_connection(address, timeout=UPSTREAM_TIMEOUT)
+        if https:
+            try:
+                # SNI et vérification du certificat sur le nom demandé
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+            except Exception:
+                sock.close()
+                raise
+        conn.sock = sock
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {k: v for k, v in request_headers.items() if k.lower() not in HOP_BY_HOP and k.lower() != "host"}
+        headers.update(extra_headers or {})
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            return conn, conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+
+    @staticmethod
+    def _response_headers(response, reverse=False):
+        headers = {}
+        for name, value in response.getheaders():
+            name = name.lower()
+            if name in HOP_BY_HOP or (reverse and name in CREDENTIAL_HEADERS):
+                continue
+            headers[name] = f"{headers[name]}, {value}" if name in headers and name != "set-cookie" else value
+        return headers
+
+    def _revalidate(self, url, request_headers, key, meta):
+        """Requête conditionnelle; met à jour l'entrée. Lève en cas d'erreur réseau"""
+        conditional = {}
+        if meta["headers"].get("etag"):
+            conditional["If-None-Match"] = meta["headers"]["etag"]
+        if meta["headers"].get("last-modified"):
+            conditional["If-Modified-Since"] = meta["headers"]["last-modified"]
+        conn, response = self._upstream_request(url, request_headers, conditional)
+        try:
+            if response.status == 304:
+                response.read()
+                for name, value in self._response_headers(response).items():
+                    if name not in ("content-length", "content-encoding", "set-cookie"):
+                        meta["headers"][name] = value
+                meta["stored_at"] = time.time()
+                self.cache.update_meta(key, meta)
+                conn.close()
+                return None
+            return conn, response
+        except Exception:
+            conn.close()
+            raise
+
+    def _background_revalidate(self, url, request_headers, key, meta, reverse):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def run():
+            try:
+                result = self._revalidate(url, request_headers, key, dict(meta))
+                if result is not None:
+                    conn, response = result
+                    try:
+                        headers = self._response_headers(response, reverse)
+                        if is_storable(response.status, headers, request_headers):
+                            writer = self.cache.open_writer(url, request_headers, response.status, headers)
+                            while True:
+                                chunk = response.read(COPY_BUFFER_SIZE)
+                                if not chunk:
+                                    break
+                                writer.write(chunk)
+                            writer.finish()
+                    finally:
+                        conn.close()
+            except (ProxyRefused, *NETWORK_ERRORS):
+                pass
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # --- Service -----------------------------------------------------------
+
+    def handle(self, handler, url, reverse=False):
+        """Relaie `url` (GET et HEAD via le cache); retourne True si servi depuis le cache
+
+        `reverse`: requête reçue sur /__ordo/proxy/, dont les cookies et
+        l'authentification (ceux du serveur local) ne sont pas transmis.
+        """
+        parts = urllib.parse.urlsplit(url)
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+        except ValueError:
+            handler.send_error(400, "Port invalide")
+            return False
+        refusal = self.policy.check(parts.hostname or "", port)
+        if refusal:
+            handler.send_error(403, refusal)
+            return False
+
+        request_headers = {k.lower(): v for k, v in handler.headers.items()}
+        if reverse:
+            request_headers = {k: v for k, v in request_headers.items() if k not in CREDENTIAL_HEADERS}
+        if handler.command not in ("GET", "HEAD"):
+            self._forward(handler, url, request_headers, reverse)
+            return False
+
+        try:
+            cached = self.cache.lookup(url, request_headers)
+            # Corps ouvert avant l'envoi du statut: une éviction concurrente ne
+            # peut plus tronquer la réponse (le fichier ouvert reste lisible)
+            body = self.cache.open_body(cached[0]) if cached is not None else None
+            if body is not None:
+                with body:
+                    result = self._answer_from_cache(handler, url, request_headers, reverse, *cached, body)
+                if result is None:
+                    return True
+                conn, response = result
+            else:
+                try:
+                    conn, response = self._upstream_request(url, request_headers)
+                except NETWORK_ERRORS as e:
+                    handler.send_error(502, f"Origine injoignable: {e}")
+                    return False
+        except ProxyRefused as e:
+            handler.send_error(403, str(e))
+            return False
+
+        try:
+            self._relay(handler, url, request_headers, response, reverse)
+        finally:
+            conn.close()
+        return False
+
+    def _answer_from_cache(self, handler, url, request_headers, reverse, key, meta, body):
+        """Sert l'entrée si possible (fraîche, SWR, revalidée, hors ligne)
+
+        Retourne None si la réponse est envoyée, sinon (connexion, réponse)
+        amont qui remplace l'entrée.
+        """
+        request_cc = parse_cache_control(request_headers.get("cache-control"))
+        age = time.time() - meta["stored_at"]
+        response_cc = parse_cache_control(meta["headers"].get("cache-control"))
+        lifetime = freshness_lifetime(meta["headers"], meta["stored_at"])
+        must_revalidate = "no-cache" in response_cc or "no-cache" in request_cc
+        if not must_revalidate and age < lifetime:
+            self._send_cached(handler, meta, body, age)
+            return None
+        swr = _seconds(response_cc, "stale-while-revalidate")
+        if not must_revalidate and age < lifetime + swr:
+            self._send_cached(handler, meta, body, age)
+            self._background_revalidate(url, request_headers, key, meta, reverse)
+            return None
+        try:
+            result = self._revalidate(url, request_headers, key, meta)
+        except NETWORK_ERRORS:
+            # Hors ligne: mieux vaut une page périmée qu'une erreur
+            self._send_cached(handler, meta, body, age, warning='111 - "Revalidation Failed"')
+            return None
+        if result is None:
+            self._send_cached(handler, meta, body, 0)
+        return result
+
+    def _forward(self, handler, url, request_headers, reverse):
+        """Relaie une requête avec corps (POST, PUT...) sans cache"""
+        if "chunked" in request_headers.get("transfer-encoding", "").lower():
+            handler.send_error(411, "Corps fragmenté non pris en charge, Content-Length requis")
+            return
+        try:
+            length = int(request_headers.get("content-length") or 0)
+        except ValueError:
+            handler.send_error(400, "Content-Length invalide")
+            return
+        body = _BoundedReader(handler.rfile, length) if length else None
+        try:
+            conn, response = self._upstream_request(url, request_headers, method=handler.command, body=body)
+        except ProxyRefused as e:
+            handler.close_connection = True
+            handler.send_error(403, str(e))
+            return
+        except NETWORK_ERRORS as e:
+            handler.close_connection = True
+            handler.send_error(502, f"Origine injoignable: {e}")
+            return
+        try:
+            if response.status < 400:
+                # Une modification réussie rend la copie en cache obsolète (RFC 7234 §4.4)
+                self.cache.invalidate(url, request_headers)
+            self._relay(handler, url, request_headers, response, reverse)
+        finally:
+            conn.close()
+
+    def _send_cached(self, handler, meta, body, age, warning=None):
+        handler.send_response(meta["status"])
+        for name, value in meta["headers"].items():
+            if name not in ("content-length", "age", "warning"):
+                handler.send_header(name, value)
+        # Taille du fichier ouvert: il peut avoir été remplacé depuis la lecture des métadonnées
+        handler.send_header("Content-Length", str(os.fstat(body.fileno()).st_size))
+        handler.send_header("Age", str(int(max(0, age))))
+        handler.send_header("X-Ordo-Cache", "HIT")
+        if warning:
+            handler.send_header("Warning", warning)
+        handler.end_headers()
+        if handler.command == "HEAD":
+            return
+        while True:
+            chunk = body.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            handler.wfile.write(chunk)
+
+    def _relay(self, handler, url, request_headers, response, reverse=False):
+        """Transmet la réponse amont au client en l'écrivant dans le cache au passage"""
+        headers = self._response_headers(response, reverse)
+        writer = None
+        if handler.command == "GET" and is_storable(response.status, headers, request_headers):
+            writer = self.cache.open_writer(url, request_headers, response.status, headers)
+
+        handler.send_response(response.status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("X-Ordo-Cache", "MISS")
+        handler.end_headers()
+        length = headers.get("content-length")
+        expected = int(length) if length and length.isdigit() else None
+        try:
+            while True:
+                chunk = response.read(COPY_BUFFER_SIZE)
+                if not chunk:
+                    break
+                if writer is not None:
+                    writer.write(chunk)
+                    if writer.size == expected:
+                        # Entrée enregistrée avant que le client ne reçoive le dernier octet:
+                        # sa requête suivante la trouve déjà en cache
+                        writer.finish()
+                        writer = None
+                if handler.command != "HEAD":
+                    handler.wfile.write(chunk)
+            if writer is not None:
+                if expected is not None and expected != writer.size:
+                    writer.abort()  # Réponse tronquée
+                else:
+                    writer.finish()
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            raise
+
+
+def tunnel(handler, authority, policy):
+    """Tunnel CONNECT (https): relaie les octets sans les déchiffrer"""
+    host, _, port = authority.rpartition(":")
+    host = host.strip("[]")
+    try:
+        port = int(port or 443)
+    except ValueError:
+        handler.send_error(400, f"Destination invalide: {authority}")
+        return
+    refusal = policy.check(host, port, connect=True)
+    if refusal:
+        handler.send_error(403, refusal)
+        return
+    try:
+        # Connexion à l'adresse vérifiée, pas à une nouvelle résolution du nom
+        upstream = socket.create_connection(policy.resolve(host, port), timeout=UPSTREAM_TIMEOUT)
+    except ProxyRefused as e:
+        handler.send_error(403, str(e))
+        return
+    except (OSError, ValueError) as e:
+        handler.send_error(502, f"Origine injoignable: {e}")
+        return
+    handler.send_response(200, "Connection Established")
+    handler.end_headers()
+    client = handler.connection
+    sockets = [client, upstream]
+    try:
+        while True:
+            readable, _, errored = select.select(sockets, [], sockets, 60)
+            if errored or not readable:
+                break
+            for sock in readable:
+                data = sock.recv(COPY_BUFFER_SIZE)
+                if not data:
+                    return
+                (upstream if sock is client else client).sendall(data)
+    except OSError:
+        pass
+    finally:
+        upstream.close()
+        handler.close_connection = True
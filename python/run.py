@@ -1,18 +1,70 @@
+import os
 import sys
-from PySide6.QtWidgets import QApplication
-from src.ordo.main_window import OrdoMainWindow
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from src.ordo.displays import ScreenManager, select_screens
+from src.ordo.profiles import append_chromium_flags, apply_profile, report_startup, select_profile
+
+# Pas de Qt au niveau du module: les processus 'spawn' de la reconstruction de
+# l'index des notes réimportent ce fichier (sous le nom __mp_main__) et ne
+# doivent pas charger PySide6. Qt est importé dans main().
+
+
+def configured_profile() -> Optional[str]:
+    """Profil de performance déclaré dans apps.yaml (clé performance_profile)"""
+    cfg_path = Path(__file__).parent / 'apps.yaml'
+    try:
+        data = yaml.safe_load(cfg_path.read_text(encoding='utf-8')) or {}
+    except (OSError, yaml.YAMLError):
+        return None
+    return data.get('performance_profile')
 
 
 def main() -> None:
+    from PySide6.QtNetwork import QNetworkProxy
+    from PySide6.QtWebEngineCore import QWebEngineProfile
+    from PySide6.QtWidgets import QApplication
+    from src.ordo.eink import REDUCED_MOTION_FLAG, eink_enabled
+    from src.ordo.main_window import OrdoMainWindow
+    from src.ordo.scheme import register_ordo_scheme
+
+    # Un seul processus pour tous les écrans (--screens all ou ORDO_SCREENS=all)
+    screens, argv = select_screens(sys.argv)
+    # Les drapeaux Chromium (profil, e-ink) doivent être posés avant QApplication
+    profile, argv = select_profile(argv, configured_profile())
+    apply_profile(profile)
+    if eink_enabled():
+        append_chromium_flags([REDUCED_MOTION_FLAG])
+
+    # Le schéma ordo:// doit être déclaré avant la création de l'application
+    register_ordo_scheme()
+
     # Création de l'application Qt
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
+    report_startup(profile, 'Ordo')
+    if profile.http_cache_bytes:
+        QWebEngineProfile.defaultProfile().setHttpCacheMaximumSize(profile.http_cache_bytes)
+    
+    # Proxy cache hors ligne du serveur local (ex: ORDO_PROXY_ADDR=127.0.0.1:8000)
+    proxy_addr = os.environ.get('ORDO_PROXY_ADDR')
+    if proxy_addr:
+        host, _, port = proxy_addr.rpartition(':')
+        QNetworkProxy.setApplicationProxy(QNetworkProxy(QNetworkProxy.HttpProxy, host, int(port)))
     
     # Configuration du style par défaut pour l'application
     app.setStyle("Fusion")  # Utilisation du style Fusion pour une apparence plus moderne
     
-    # Création et affichage de la fenêtre principale
-    window = OrdoMainWindow()
-    window.show()
+    # Une fenêtre principale par écran: registre, profil WebEngine et
+    # stockages sont partagés; les écrans branchés à chaud sont suivis
+    def open_desktop(screen, primary: bool) -> OrdoMainWindow:
+        window = OrdoMainWindow(screen, primary)
+        window.show()
+        return window
+
+    displays = ScreenManager(app, open_desktop, screens)
+    displays.start()
     
     # Démarrage de la boucle d'événements
     sys.exit(app.exec())
@@ -1,45 +1,377 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Deque, List, Optional, Tuple
 
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QLabel
+from PySide6.QtCore import QObject, Qt, QThread, QTimer, Signal
+from PySide6.QtGui import QKeySequence, QShortcut, QTextCursor
+from PySide6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QLabel, QSplitter, QLineEdit,
+    QListWidget, QListWidgetItem
+)
+from PySide6.QtWebEngineWidgets import QWebEngineView
+
+from ..launcher import LauncherIndex, LauncherItem
+from ..markdown import MarkdownDocument
+from ..vault import note_title, shared_vault
+
+# Document de l'aperçu: un nœud enfant de #doc par bloc Markdown
+PREVIEW_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>
+body { margin: 0; padding: 12px 16px; background: #fff; color: #000;
+       font-family: 'Courier New', 'Consolas', 'Monaco', monospace; font-size: 13px; }
+pre { border: 1px solid #000; margin: 8px 0; padding: 6px; white-space: pre-wrap; }
+pre.open { margin-bottom: 0; border-bottom: none; padding-bottom: 0; }
+pre.cont { margin-top: 0; border-top: none; padding-top: 0; }
+blockquote { border-left: 3px solid #000; margin: 8px 0; padding-left: 10px; }
+li.task { list-style: none; }
+a { color: #000; }
+</style><script>
+window.ordoPatch = function (patches) {
+    var root = document.getElementById('doc');
+    var template = document.createElement('template');
+    patches.forEach(function (patch) {
+        for (var i = 0; i < patch[1]; i++) {
+            root.removeChild(root.children[patch[0]]);
+        }
+        template.innerHTML = patch[2].join('');
+        root.insertBefore(template.content, root.children[patch[0]] || null);
+    });
+};
+</script></head><body><div id="doc"></div></body></html>
+"""
+
+# Modification en lignes entières: (première ligne, lignes retirées, nouvelles lignes)
+LineEdit = Tuple[int, int, List[str]]
+
+
+def _stop_thread(thread: QThread) -> None:
+    """Arrête la boucle d'un thread et attend sa fin (sans effet s'il est arrêté)"""
+    if thread.isRunning():
+        thread.quit()
+        thread.wait()
+
+
+class PreviewWorker(QObject):
+    """Analyse et rendu Markdown hors du thread de l'interface
+
+    Les modifications s'accumulent dans une file; le thread de rendu les
+    applique toutes d'un coup et n'émet qu'une liste de patchs par passage.
+    """
+
+    rendered = Signal(object, float)
+    _wake = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.document = MarkdownDocument()
+        self._lock = threading.Lock()
+        self._queue: Deque[Tuple[Optional[LineEdit], Optional[str], float]] = deque()
+        self._scheduled = False
+        self._wake.connect(self._drain)
+
+    def submit(self, edit: Optional[LineEdit], text: Optional[str] = None) -> None:
+        """Appelé depuis l'interface: une modification, ou le texte complet"""
+        with self._lock:
+            self._queue.append((edit, text, time.perf_counter()))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def _drain(self) -> None:
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+            self._scheduled = False
+        patches = []
+        for edit, text, _ in batch:
+            patch = self.document.reset(text) if edit is None else self.document.apply_edit(*edit)
+            if patch is not None:
+                patches.append(patch)
+        if patches:
+            # Latence mesurée depuis la plus ancienne frappe du lot
+            self.rendered.emit(patches, batch[0][2])
 
 
 class EditorWindow(QWidget):
+    """Éditeur Markdown multi-notes
+
+    Les notes sont les fichiers .md du coffre (~/.ordo_notes). Le champ du
+    haut cherche à la fois dans les titres (comme le lanceur) et dans le
+    texte des notes (index plein texte). Ctrl+P y place le curseur, Ctrl+N
+    crée une note. L'index est mis à jour hors du thread de l'interface.
+    """
+
+    LATENCY_SAMPLES = 1000
+    MAX_RESULTS = 20
+    DEFAULT_NOTE = 'Notes.md'
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle('Éditeur')
 
-        self.store_path = Path.home() / '.ordo_editor.txt'
+        self.vault = shared_vault()
+        self.current: Optional[str] = None
+        self._loading = False
+        # Un seul thread: réindexations et synchronisation restent ordonnées
+        self._indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ordo-vault')
 
         layout = QVBoxLayout(self)
-        self.text = QTextEdit()
+        row = QHBoxLayout()
+        self.note_label = QLabel()
+        self.search = QLineEdit()
+        self.search.setPlaceholderText('Rechercher dans les notes... (Ctrl+P)')
+        self.search.textChanged.connect(self.refresh_results)
+        self.search.returnPressed.connect(self._open_current_result)
+        self.search.installEventFilter(self)
+        row.addWidget(self.note_label)
+        row.addWidget(self.search, 1)
+        layout.addLayout(row)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self._open_result)
+        self.results.hide()
+        layout.addWidget(self.results)
+
+        splitter = QSplitter(Qt.Horizontal)
+        # Texte brut: mise en page incrémentale, tenable sur de gros documents
+        self.text = QPlainTextEdit()
+        self.preview = QWebEngineView()
+        self.preview.setContextMenuPolicy(Qt.NoContextMenu)
+        splitter.addWidget(self.text)
+        splitter.addWidget(self.preview)
         self.status = QLabel('└─ Sauvegarde automatique activée')
-        layout.addWidget(self.text, 1)
+        layout.addWidget(splitter, 1)
         layout.addWidget(self.status)
 
-        if self.store_path.exists():
+        # Aperçu: thread de rendu dédié, patchs appliqués bloc par bloc
+        self.latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._preview_ready = False
+        self._pending_patches: List = []
+        self._pending_started = 0.0
+        self._line_count = self.text.document().blockCount()
+        # Sans parent: le thread ne doit pas être détruit avec l'éditeur avant
+        # d'être arrêté. Fermeture, destruction sans fermeture (sous-fenêtre
+        # supprimée) et sortie de l'application l'arrêtent tous.
+        self._thread = QThread()
+        self.worker = PreviewWorker()
+        self.worker.moveToThread(self._thread)
+        self.worker.rendered.connect(self._apply_patches)
+        self._thread.finished.connect(self.worker.deleteLater)
+        self._thread.start()
+        app = QApplication.instance()
+        thread = self._thread
+
+        def stop_preview(*_) -> None:
+            _stop_thread(thread)
             try:
-                self.text.setText(self.store_path.read_text(encoding='utf-8'))
-            except Exception:
+                app.aboutToQuit.disconnect(stop_preview)
+            except (RuntimeError, TypeError):
                 pass
 
+        self._stop_preview = stop_preview
+        app.aboutToQuit.connect(stop_preview)
+        self.destroyed.connect(stop_preview)
+        self.preview.loadFinished.connect(self._on_preview_loaded)
+        self.preview.setHtml(PREVIEW_HTML)
+
         self.debounce = QTimer(self)
         self.debounce.setInterval(1000)
         self.debounce.setSingleShot(True)
         self.debounce.timeout.connect(self.save)
         self.text.textChanged.connect(self.on_change)
+        self.text.document().contentsChange.connect(self._on_contents_change)
+
+        QShortcut(QKeySequence('Ctrl+P'), self, self._focus_search)
+        QShortcut(QKeySequence('Ctrl+N'), self, self.new_note)
+
+        self._titles = LauncherIndex([])
+        self.vault.index.load()
+        notes = self.vault.list_notes()
+        if not notes:
+            notes = [self._migrate_legacy_store()]
+        self._refresh_titles(notes)
+        # Note la plus récemment modifiée
+        self.open_note(max(notes, key=lambda rel: self.vault.path_of(rel).stat().st_mtime))
+        # Notes modifiées hors de l'éditeur: index remis en phase en arrière-plan
+        self._indexer.submit(self.vault.sync)
+
+    # --- Notes ----------------------------------------------------------
+
+    def _migrate_legacy_store(self) -> str:
+        """Premier lancement: l'ancien fichier unique devient la première note"""
+        legacy = Path.home() / '.ordo_editor.txt'
+        text = ''
+        if legacy.exists():
+            try:
+                text = legacy.read_text(encoding='utf-8')
+            except Exception:
+                pass
+        self.vault.write(self.DEFAULT_NOTE, text)
+        self.vault.reindex(self.DEFAULT_NOTE, text)
+        return self.DEFAULT_NOTE
+
+    def _refresh_titles(self, notes: Optional[List[str]] = None) -> None:
+        notes = notes if notes is not None else self.vault.list_notes()
+        self._titles = LauncherIndex(LauncherItem(rel, note_title(rel)) for rel in notes)
+
+    def open_note(self, rel: str, offset: Optional[int] = None) -> None:
+        if rel != self.current:
+            if self.debounce.isActive():
+                self.debounce.stop()
+                self.save()
+            try:
+                text = self.vault.read(rel)
+            except OSError as e:
+                self.status.setText(f'└─ Note illisible: {e}')
+                return
+            self.current = rel
+            self._loading = True
+            self.text.setPlainText(text)
+            self._loading = False
+            self._line_count = self.text.document().blockCount()
+            self.worker.submit(None, text)
+            self.note_label.setText(note_title(rel))
+            self.status.setText('└─ Sauvegarde automatique activée')
+        if offset is not None:
+            cursor = self.text.textCursor()
+            cursor.setPosition(min(offset, self.text.document().characterCount() - 1))
+            self.text.setTextCursor(cursor)
+            self.text.centerCursor()
+        self.text.setFocus()
+
+    def new_note(self) -> None:
+        rel = self.vault.create(self.search.text().strip() or 'Sans titre')
+        self.search.clear()
+        self._refresh_titles()
+        self.open_note(rel)
+
+    # --- Recherche ------------------------------------------------------
+
+    def _focus_search(self) -> None:
+        self.search.setFocus()
+        self.search.selectAll()
+
+    def refresh_results(self, query: str) -> None:
+        """Titres d'abord (préfixes, fautes de frappe), puis le texte des notes"""
+        self.results.clear()
+        if not query.strip():
+            self.results.hide()
+            return
+        seen = set()
+        for item in self._titles.search(query, self.MAX_RESULTS):
+            seen.add(item.id)
+            self._add_result(item.title, item.id, None)
+        for hit in self.vault.index.search(query, self.MAX_RESULTS):
+            if hit.path not in seen and len(seen) < self.MAX_RESULTS:
+                seen.add(hit.path)
+                self._add_result(f'{hit.title}  ·  texte', hit.path, hit.offset)
+        self.results.setVisible(self.results.count() > 0)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def _add_result(self, label: str, rel: str, offset: Optional[int]) -> None:
+        row = QListWidgetItem(label)
+        row.setData(Qt.UserRole, (rel, offset))
+        self.results.addItem(row)
+
+    def eventFilter(self, obj, event) -> bool:
+        # Flèches haut/bas et Échap depuis le champ de recherche
+        if obj is self.search and event.type() == event.Type.KeyPress:
+            if event.key() in (Qt.Key_Up, Qt.Key_Down):
+                row = self.results.currentRow() + (1 if event.key() == Qt.Key_Down else -1)
+                if 0 <= row < self.results.count():
+                    self.results.setCurrentRow(row)
+                return True
+            if event.key() == Qt.Key_Escape:
+                self.search.clear()
+                self.text.setFocus()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _open_current_result(self) -> None:
+        item = self.results.currentItem()
+        if item:
+            self._open_result(item)
+
+    def _open_result(self, item: QListWidgetItem) -> None:
+        rel, offset = item.data(Qt.UserRole)
+        self.search.clear()
+        self.open_note(rel, offset)
+
+    # --- Édition --------------------------------------------------------
 
     def on_change(self) -> None:
+        if self._loading:
+            return
         self.status.setText('└─ Sauvegarde en cours...')
         self.debounce.start()
 
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        """Transmet au rendu les seules lignes touchées par la modification"""
+        if self._loading:
+            return  # Changement de note: rendu complet soumis par open_note
+        doc = self.text.document()
+        count = doc.blockCount()
+        first = doc.findBlock(position).blockNumber()
+        last_block = doc.findBlock(position + added)
+        last = last_block.blockNumber() if last_block.isValid() else count - 1
+        old_lines = (last - first + 1) - (count - self._line_count)
+        self._line_count = count
+        if first < 0 or old_lines < 0:
+            self.worker.submit(None, self.text.toPlainText())  # Incohérence: rendu complet
+            return
+        lines = [doc.findBlockByNumber(n).text() for n in range(first, last + 1)]
+        self.worker.submit((first, old_lines, lines))
+
+    def _on_preview_loaded(self, ok: bool) -> None:
+        self._preview_ready = ok
+        if ok and self._pending_patches:
+            patches, started = self._pending_patches, self._pending_started
+            self._pending_patches = []
+            self._apply_patches(patches, started)
+
+    def _apply_patches(self, patches: List, started: float) -> None:
+        if not self._preview_ready:
+            # Page pas encore chargée: les patchs s'enchaînent dans l'ordre
+            if not self._pending_patches:
+                self._pending_started = started
+            self._pending_patches.extend(patches)
+            return
+        script = f'ordoPatch({json.dumps(patches, ensure_ascii=False)})'
+        self.preview.page().runJavaScript(
+            script, 0, lambda _result, t=started: self.latencies.append(time.perf_counter() - t))
+
+    def latency_p99(self) -> Optional[float]:
+        """99e centile (secondes) entre la frappe et l'application du patch"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
     def save(self) -> None:
+        if self.current is None:
+            return
+        rel, text = self.current, self.text.toPlainText()
         try:
-            self.store_path.write_text(self.text.toPlainText(), encoding='utf-8')
+            self.vault.write(rel, text)
             self.status.setText('└─ Sauvegardé')
         except Exception:
             self.status.setText('└─ Erreur de sauvegarde')
+            return
+        self._indexer.submit(self.vault.reindex, rel, text)
 
-
+    def closeEvent(self, event) -> None:
+        if self.debounce.isActive():
+            self.debounce.stop()
+            self.save()
+        self._stop_preview()
+        # Les réindexations en attente se terminent sans bloquer la fermeture
+        self._indexer.shutdown(wait=False)
+        super().closeEvent(event)
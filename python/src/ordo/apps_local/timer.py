@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from PySide6.QtCore import QTimer
+import math
+import time
+from typing import Optional
+
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
 
+from ..eink import eink_enabled
+from ..scheduler import shared_scheduler
+
 
 class TimerWindow(QWidget):
+    DURATION = 25 * 60
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle('Minuteur')
 
-        self.time_left = 25 * 60
-        self.timer = QTimer(self)
-        self.timer.setInterval(1000)
-        self.timer.timeout.connect(self.tick)
+        # Le temps restant est calculé depuis une échéance monotone: pas de dérive
+        self.scheduler = shared_scheduler()
+        # En e-ink, un rafraîchissement par minute suffit (et évite 60 flashs)
+        self.eink = eink_enabled()
+        self.tick_period = 60.0 if self.eink else 1.0
+        self.remaining = float(self.DURATION)
+        self.deadline: Optional[float] = None
+        self._deadline_token: Optional[int] = None
+        self._tick = None
 
         layout = QVBoxLayout(self)
         self.display = QLabel(self.format_time(self.time_left))
@@ -29,29 +42,58 @@ class TimerWindow(QWidget):
         self.start_btn.clicked.connect(self.toggle)
         self.reset_btn.clicked.connect(self.reset)
 
+    @property
+    def running(self) -> bool:
+        return self.deadline is not None
+
+    @property
+    def time_left(self) -> int:
+        remaining = self.deadline - time.monotonic() if self.running else self.remaining
+        return max(0, math.ceil(remaining - 1e-6))
+
     def format_time(self, s: int) -> str:
+        if self.eink and self.running:
+            return f"{math.ceil(s / 60):02d} MIN"
         m, s = divmod(s, 60)
         return f"{m:02d}:{s:02d}"
 
     def tick(self) -> None:
-        self.time_left -= 1
         self.display.setText(self.format_time(self.time_left))
-        if self.time_left <= 0:
-            self.timer.stop()
-            self.start_btn.setText('[START]')
+
+    def finish(self) -> None:
+        self._deadline_token = None  # Échéance déjà consommée
+        self._stop()
+        self.remaining = 0.0
+        self.tick()
+
+    def _stop(self) -> None:
+        if self.running:
+            self.remaining = max(0.0, self.deadline - time.monotonic())
+        self.deadline = None
+        if self._tick is not None:
+            self.scheduler.unsubscribe(self._tick)
+            self._tick = None
+        if self._deadline_token is not None:
+            self.scheduler.cancel(self._deadline_token)
+            self._deadline_token = None
+        self.start_btn.setText('[START]')
 
     def toggle(self) -> None:
-        if self.timer.isActive():
-            self.timer.stop()
-            self.start_btn.setText('[START]')
-        else:
-            self.timer.start()
+        if self.running:
+            self._stop()
+            self.tick()
+        elif self.remaining > 0:
+            self.deadline = time.monotonic() + self.remaining
+            self._deadline_token = self.scheduler.call_at(self.deadline, self.finish, self)
+            self._tick = self.scheduler.subscribe(self.tick, self.tick_period, self)
             self.start_btn.setText('[PAUSE]')
+            self.tick()
 
     def reset(self) -> None:
-        self.timer.stop()
-        self.time_left = 25 * 60
-        self.display.setText(self.format_time(self.time_left))
-        self.start_btn.setText('[START]')
-
+        self._stop()
+        self.remaining = float(self.DURATION)
+        self.tick()
 
+    def closeEvent(self, event) -> None:
+        self._stop()
+        super().closeEvent(event)
@@ -1,79 +1,131 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
+import time
+from datetime import datetime
 from typing import List
 
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QListWidget, QListWidgetItem
+    QListWidget, QListWidgetItem, QComboBox, QLabel
 )
 
+from ..reminders import shared_todos
+from ..todos import Todo, parse_quick_add
+
+# Vues fixes: (libellé, requête du magasin)
+VIEWS = [
+    ('Ouvertes', lambda store, now, limit: store.open_todos(limit)),
+    ("Aujourd'hui", lambda store, now, limit: store.today(now, limit)),
+    ('En retard', lambda store, now, limit: store.overdue(now, limit)),
+    ('À venir', lambda store, now, limit: store.upcoming(now, limit)),
+    ('Terminées', lambda store, now, limit: store.completed(limit)),
+]
+
 
 class TodoWindow(QWidget):
+    """Tâches avec échéances, priorités et étiquettes
+
+    Saisie rapide: 'Payer le loyer @demain !2 #maison'. Les vues lisent les
+    index du magasin partagé; seules les VIEW_LIMIT premières lignes sont
+    affichées. Double-clic: terminer/rouvrir, Suppr: supprimer.
+    """
+
+    VIEW_LIMIT = 500
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle('Gestionnaire de tâches')
 
-        self.store_path = Path.home() / '.ordo_todos.json'
-        self.todos: List[dict] = []
+        self.service = shared_todos()
 
         layout = QVBoxLayout(self)
         row = QHBoxLayout()
         self.input = QLineEdit()
-        self.input.setPlaceholderText('Nouvelle tâche...')
+        self.input.setPlaceholderText('Nouvelle tâche... (@demain @18:00 !1-3 #étiquette)')
         add_btn = QPushButton('[+ ]')
         add_btn.clicked.connect(self.add_todo)
         row.addWidget(self.input)
         row.addWidget(add_btn)
         layout.addLayout(row)
 
+        self.view = QComboBox()
+        self.view.currentIndexChanged.connect(self.render)
+        layout.addWidget(self.view)
+
         self.list = QListWidget()
         layout.addWidget(self.list, 1)
+        self.count = QLabel()
+        layout.addWidget(self.count)
 
-        self.load()
+        self._refresh_views()
         self.render()
 
         self.input.returnPressed.connect(self.add_todo)
         self.list.itemDoubleClicked.connect(self.toggle_complete)
+        QShortcut(QKeySequence.Delete, self.list, self.remove_selected)
+        self.service.changed.connect(self._on_store_changed)
+
+    def _refresh_views(self) -> None:
+        """Vues fixes puis une vue par étiquette utilisée"""
+        current = self.view.currentData()
+        self.view.blockSignals(True)
+        self.view.clear()
+        for label, _ in VIEWS:
+            self.view.addItem(label, label)
+        for tag in sorted(self.service.store.tags):
+            self.view.addItem(f'#{tag}', f'#{tag}')
+        index = self.view.findData(current) if current else 0
+        self.view.setCurrentIndex(max(index, 0))
+        self.view.blockSignals(False)
+
+    def _on_store_changed(self) -> None:
+        self._refresh_views()
+        self.render()
 
-    def load(self) -> None:
-        if self.store_path.exists():
-            try:
-                self.todos = json.loads(self.store_path.read_text(encoding='utf-8'))
-            except Exception:
-                self.todos = []
-
-    def save(self) -> None:
-        try:
-            self.store_path.write_text(json.dumps(self.todos, ensure_ascii=False, indent=2), encoding='utf-8')
-        except Exception:
-            pass
+    def _query(self) -> List[Todo]:
+        store, now = self.service.store, time.time()
+        key = self.view.currentData() or VIEWS[0][0]
+        if key.startswith('#'):
+            return store.tagged(key[1:], self.VIEW_LIMIT)
+        query = dict(VIEWS)[key]
+        return query(store, now, self.VIEW_LIMIT)
+
+    @staticmethod
+    def _format(todo: Todo, now: float) -> str:
+        priority = '!' * todo.priority + ' ' if todo.priority else ''
+        parts = [('[x] ' if todo.completed else '[ ] ') + priority + todo.text]
+        if todo.due is not None:
+            due = f'{datetime.fromtimestamp(todo.due):%d/%m %H:%M}'
+            parts.append(f'— {due} (en retard)' if not todo.completed and todo.due < now else f'— {due}')
+        parts.extend(f'#{tag}' for tag in todo.tags)
+        return '  '.join(parts)
 
     def render(self) -> None:
+        now = time.time()
+        todos = self._query()
         self.list.clear()
-        for t in self.todos:
-            txt = ('[x] ' if t.get('completed') else '[ ] ') + t.get('text', '')
-            item = QListWidgetItem(txt)
-            if t.get('completed'):
-                item.setFlags(item.flags() | Qt.ItemIsSelectable)
+        for todo in todos:
+            item = QListWidgetItem(self._format(todo, now))
+            item.setData(Qt.UserRole, todo.id)
             self.list.addItem(item)
+        more = ' (les premières)' if len(todos) == self.VIEW_LIMIT else ''
+        self.count.setText(f'└─ {len(todos)} tâche(s){more}')
 
     def add_todo(self) -> None:
-        text = self.input.text().strip()
-        if not text:
+        fields = parse_quick_add(self.input.text())
+        if not fields['text']:
             return
-        self.todos.append({'text': text, 'completed': False})
-        self.save()
+        self.service.add(**fields)
         self.input.clear()
-        self.render()
 
     def toggle_complete(self, item: QListWidgetItem) -> None:
-        idx = self.list.row(item)
-        if 0 <= idx < len(self.todos):
-            self.todos[idx]['completed'] = not self.todos[idx].get('completed')
-            self.save()
-            self.render()
-
-
+        todo_id = item.data(Qt.UserRole)
+        if todo_id in self.service.store.todos:
+            self.service.toggle(todo_id)
+
+    def remove_selected(self) -> None:
+        item = self.list.currentItem()
+        if item is not None and item.data(Qt.UserRole) in self.service.store.todos:
+            self.service.remove(item.data(Qt.UserRole))
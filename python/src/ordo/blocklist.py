@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Format compilé (little-endian):
+#     MAGIC (8 octets) | longueur de l'en-tête (u32) | en-tête JSON | bourrage | table u64
+#
+# La table est adressée par empreinte (sondage linéaire, remplie au plus à
+# moitié, 0 = case vide): une vérification coûte une ou deux lectures.
+
+MAGIC = b'ORDOBL2\0'
+HEADER = struct.Struct('<8sI')
+ENV_VARIABLE = 'ORDO_BLOCKLIST'  # Chemin d'une autre liste source, ou 'off'
+DEFAULT_SOURCE = Path(__file__).resolve().parents[2] / 'blocklist.txt'
+COMPILED_FILE = Path.home() / '.ordo_blocklist.bin'
+STATS_LOG = Path.home() / '.ordo_logs' / 'blocklist.jsonl'
+HOST_CACHE_SIZE = 4096  # Les mêmes hôtes reviennent sur chaque page
+
+DOMAIN_RE = re.compile(r'^(?:[a-z0-9_](?:[a-z0-9_-]*[a-z0-9_])?\.)+[a-z0-9-]{2,}$')
+HOSTS_ADDRESSES = {'0.0.0.0', '127.0.0.1', '::', '::1'}
+IGNORED_DOMAINS = {'localhost', 'localhost.localdomain', 'local', 'broadcasthost', 'ip6-localhost'}
+
+
+def domain_hash(domain: str) -> int:
+    """Empreinte 64 bits non nulle d'un domaine (collision négligeable sur 10^6 entrées)"""
+    value = int.from_bytes(hashlib.blake2b(domain.encode('ascii', 'ignore'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def host_suffixes(host: str) -> Iterator[str]:
+    """'a.b.example.com' -> 'a.b.example.com', 'b.example.com', 'example.com'"""
+    host = host.lower().rstrip('.')
+    while '.' in host:
+        yield host
+        host = host.split('.', 1)[1]
+
+
+def parse_source(lines: Iterable[str]) -> Iterator[str]:
+    """Domaines d'une liste: fichier hosts, un domaine par ligne, ou règles `||domaine^`
+
+    Les règles d'exception (@@) et celles qui portent sur un chemin ou des
+    options autres que $third-party sont ignorées: seul le domaine compte ici.
+    Une règle $third-party bloque donc aussi les requêtes du site lui-même
+    (visite directe de ce domaine comprise, hors navigation de premier niveau).
+    """
+    for line in lines:
+        line = line.split('#', 1)[0].strip().lower()
+        if not line or line.startswith(('!', '[', '@@')):
+            continue
+        if line.startswith('||'):
+            domain, sep, rest = line[2:].partition('^')
+            if not sep or rest not in ('', '$third-party'):
+                continue
+        else:
+            parts = line.split()
+            if len(parts) > 1 and parts[0] in HOSTS_ADDRESSES:
+                parts = parts[1:]
+            elif len(parts) > 1:
+                continue
+            for domain in parts:
+                if domain not in IGNORED_DOMAINS and DOMAIN_RE.match(domain):
+                    yield domain
+            continue
+        if DOMAIN_RE.match(domain):
+            yield domain
+
+
+def compile_blocklist(source: Path, output: Path = COMPILED_FILE) -> int:
+    """Compile une liste source en table d'empreintes; retourne le nombre de domaines"""
+    with open(source, encoding='utf-8', errors='replace') as f:
+        hashes = {domain_hash(domain) for domain in parse_source(f)}
+    size = 1 << max(4, (2 * len(hashes)).bit_length())
+    mask = size - 1
+    table = array('Q', bytes(8 * size))
+    for value in hashes:
+        slot = value & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = value
+    stat = source.stat()
+    header = json.dumps({
+        'byteorder': sys.byteorder,
+        'count': len(hashes),
+        'slots': size,
+        'source': str(source.resolve()),
+        'source_mtime': stat.st_mtime,
+        'source_size': stat.st_size,
+    }).encode('utf-8')
+    # Table alignée sur 8 octets pour une vue u64 directe sur le fichier
+    padding = -(HEADER.size + len(header)) % 8
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(b'\0' * padding)
+        table.tofile(f)
+    tmp.replace(output)
+    return len(hashes)
+
+
+class Blocklist:
+    """Table d'empreintes de domaines projetée en mémoire
+
+    Un hôte est bloqué si lui-même ou l'un de ses domaines parents figure
+    dans la liste. Le résultat est mémorisé par hôte; les compteurs de
+    blocage sont mis à jour depuis le thread réseau de WebEngine.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_len = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError('signature invalide')
+            self.header = json.loads(self._map[HEADER.size:HEADER.size + header_len])
+            if self.header.get('byteorder') != sys.byteorder:
+                raise ValueError('liste compilée sur une autre architecture')
+            start = HEADER.size + header_len
+            start += -start % 8
+            slots = self.header['slots']
+            self._mask = slots - 1
+            self._table = memoryview(self._map)[start:start + 8 * slots].cast('Q')
+        except Exception:
+            self.close()
+            raise
+        self._cache: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: Counter[Tuple[str, str]] = Counter()  # (app, domaine bloqué) -> requêtes
+        self.checked = 0
+
+    def __len__(self) -> int:
+        return self.header['count']
+
+    def _contains(self, domain: str) -> bool:
+        value = domain_hash(domain)
+        table, mask = self._table, self._mask
+        slot = value & mask
+        while True:
+            stored = table[slot]
+            if stored == value:
+                return True
+            if not stored:
+                return False
+            slot = (slot + 1) & mask
+
+    def match(self, host: str) -> Optional[str]:
+        """Domaine de la liste qui bloque `host`, ou None"""
+        with self._lock:
+            if host in self._cache:
+                self._cache.move_to_end(host)
+                return self._cache[host]
+        matched = next((suffix for suffix in host_suffixes(host) if self._contains(suffix)), None)
+        with self._lock:
+            self._cache[host] = matched
+            if len(self._cache) > HOST_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return matched
+
+    def check(self, app_id: str, host: str, allow: Sequence[str] = ()) -> bool:
+        """True si la requête doit être bloquée (et la compte)"""
+        matched = self.match(host)
+        if matched is not None and allow and any(
+                suffix in allow for suffix in host_suffixes(host)):
+            matched = None
+        with self._lock:
+            self.checked += 1
+            if matched is not None:
+                self.hits[(app_id, matched)] += 1
+        return matched is not None
+
+    def report(self, path: Path = STATS_LOG) -> None:
+        """Ajoute les compteurs de la session à ~/.ordo_logs/blocklist.jsonl"""
+        with self._lock:
+            if not self.checked:
+                return
+            per_app: Dict[str, Dict[str, int]] = {}
+            for (app_id, domain), count in self.hits.most_common():
+                per_app.setdefault(app_id, {})[domain] = count
+            record = {'ts': time.time(), 'checked': self.checked,
+                      'blocked': sum(self.hits.values()), 'hits': per_app}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"Statistiques de blocage non écrites: {e}")
+
+    def close(self) -> None:
+        # La vue doit être relâchée avant de fermer la projection
+        table = getattr(self, '_table', None)
+        if table is not None:
+            table.release()
+            self._table = None
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def _is_stale(compiled: Path, source: Path) -> bool:
+    try:
+        with open(compiled, 'rb') as f:
+            magic, header_len = HEADER.unpack(f.read(HEADER.size))
+            header = json.loads(f.read(header_len)) if magic == MAGIC else {}
+        stat = source.stat()
+    except (OSError, ValueError, struct.error):
+        return True
+    return (header.get('source') != str(source.resolve())
+            or header.get('source_mtime') != stat.st_mtime
+            or header.get('source_size') != stat.st_size)
+
+
+def load_blocklist(source: Optional[Path] = None, compiled: Path = COMPILED_FILE) -> Optional[Blocklist]:
+    """Liste compilée, recompilée si la source a changé; None si désactivée ou absente"""
+    if source is None:
+        configured = os.environ.get(ENV_VARIABLE, '')
+        if configured.lower() in ('off', '0', 'false'):
+            return None
+        source = Path(configured).expanduser() if configured else DEFAULT_SOURCE
+    try:
+        if _is_stale(compiled, source):
+            count = compile_blocklist(source, compiled)
+            print(f"Liste de blocage compilée: {count} domaines ({source})")
+        return Blocklist(compiled)
+    except (OSError, ValueError) as e:
+        print(f"Liste de blocage indisponible: {e}")
+        return None
+
+
+# --- Banc d'essai ----------------------------------------------------------
+
+# Pages de test: une page "vidéo" et une page "recherche", chacune avec ses
+# ressources propres et celles de régies publicitaires et de traceurs (dont
+# certaines en chargent d'autres, comme dans la réalité).
+FIXTURE_LATENCY = {'first-party': 0.02, 'third-party': 0.04}  # Aller-retour simulé (s)
+FIXTURE_PAGES = {
+    'video': ('video.example', [
+        ('/app.js', 350_000), ('/app.css', 60_000), ('/thumbs.jpg', 180_000),
+        ('http://www.googletagmanager.com/gtm.js', 90_000),
+        ('http://securepubads.g.doubleclick.net/tag/js/gpt.js', 120_000),
+        ('http://static.doubleclick.net/instream/ad_status.js', 30_000),
+        ('http://pagead2.googlesyndication.com/pagead/show_ads_impl.js', 250_000),
+        ('http://connect.facebook.net/en_US/fbevents.js', 100_000),
+        ('http://sb.scorecardresearch.com/beacon.js', 12_000),
+    ]),
+    'search': ('search.example', [
+        ('/search.js', 150_000), ('/search.css', 25_000),
+        ('http://www.google-analytics.com/analytics.js', 50_000),
+        ('http://adservice.google.com/adsid/integrator.js', 8_000),
+        ('http://static.hotjar.com/c/hotjar.js', 70_000),
+        ('http://cdn.taboola.com/libtrc/loader.js', 180_000),
+    ]),
+}
+# Ressources chargées à leur tour par certains scripts tiers
+FIXTURE_CHAINS = {
+    'http://securepubads.g.doubleclick.net/tag/js/gpt.js': [
+        ('http://tpc.googlesyndication.com/safeframe/container.html', 40_000),
+        ('http://tpc.googlesyndication.com/simgad/banner.jpg', 150_000),
+    ],
+    'http://www.googletagmanager.com/gtm.js': [
+        ('http://www.google-analytics.com/analytics.js', 50_000),
+        ('http://bat.bing.com/bat.js', 30_000),
+    ],
+    'http://cdn.taboola.com/libtrc/loader.js': [
+        ('http://images.taboola.com/feed.jpg', 220_000),
+    ],
+}
+
+
+def _fixture_resources() -> Dict[str, bytes]:
+    """URL absolue -> corps; les pages référencent leurs ressources (balises et scripts)"""
+    bodies: Dict[str, bytes] = {}
+
+    def body(url: str, size: int, refs: Sequence[str] = ()) -> None:
+        text = ''.join(f'<script src="{ref}"></script>\n' for ref in refs)
+        bodies[url] = (text + '/' * max(0, size - len(text))).encode('ascii')
+
+    for host, resources in FIXTURE_PAGES.values():
+        urls = [url if url.startswith('http') else f'http://{host}{url}' for url, _ in resources]
+        body(f'http://{host}/', 40_000, urls)
+        for url, (_, size) in zip(urls, resources):
+            chain = FIXTURE_CHAINS.get(url, ())
+            body(url, size, [ref for ref, _ in chain])
+            for ref, ref_size in chain:
+                body(ref, ref_size)
+    return bodies
+
+
+def _load_page(url: str, opener, blocklist: Optional[Blocklist], first_party: str) -> Tuple[int, int, float]:
+    """Charge une page et ses ressources par vagues (6 connexions, comme Chromium)"""
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import urlsplit
+
+    ref_re = re.compile(rb'src="(http://[^"]+)"')
+    started = time.perf_counter()
+    fetched: set = set()
+    total_bytes = requests = 0
+    wave = [url]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        while wave:
+            wave = [u for u in dict.fromkeys(wave) if u not in fetched]
+            fetched.update(wave)
+            if blocklist is not None:
+                wave = [u for u in wave if not blocklist.check(first_party, urlsplit(u).hostname or '')]
+            bodies = list(pool.map(lambda u: opener.open(u).read(), wave))
+            requests += len(bodies)
+            total_bytes += sum(len(b) for b in bodies)
+            wave = [ref.decode() for b in bodies for ref in ref_re.findall(b)]
+    return requests, total_bytes, time.perf_counter() - started
+
+
+def _benchmark(domains: int = 200_000, lookups: int = 100_000) -> None:
+    """Coût d'une vérification, puis poids et durée des pages de test avec et sans blocage"""
+    import http.server
+    import random
+    import tempfile
+    import urllib.request
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. Liste synthétique de la taille d'une grosse liste publique + la liste fournie
+        source = Path(tmp) / 'hosts.txt'
+        lines = [f'0.0.0.0 {"".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(10))}.com'
+                 for _ in range(domains)]
+        if DEFAULT_SOURCE.exists():
+            lines += DEFAULT_SOURCE.read_text(encoding='utf-8').splitlines()
+        source.write_text('\n'.join(lines), encoding='utf-8')
+        started = time.perf_counter()
+        count = compile_blocklist(source, Path(tmp) / 'blocklist.bin')
+        print(f"Compilation: {count} domaines en {time.perf_counter() - started:.2f} s")
+        blocklist = Blocklist(Path(tmp) / 'blocklist.bin')
+
+        hosts = [f'cdn{rng.randint(0, 50)}.{rng.choice(["a", "b"])}.site{rng.randint(0, 5000)}.org'
+                 for _ in range(lookups)]
+        for label, sample in (('hôtes variés', hosts), ('hôtes récurrents', hosts[:200] * (lookups // 200))):
+            blocklist._cache.clear()
+            started = time.perf_counter()
+            for host in sample:
+                blocklist.check('bench', host)
+            per_call = (time.perf_counter() - started) / len(sample) * 1e6
+            print(f"Vérification ({label}): {per_call:.2f} µs/requête")
+
+        # 2. Pages de test servies par un proxy local (latence simulée par hôte)
+        bodies = _fixture_resources()
+        first_parties = {host for host, _ in FIXTURE_PAGES.values()}
+
+        class FixtureProxy(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = bodies.get(self.path)
+                host = self.path.split('/')[2]
+                time.sleep(FIXTURE_LATENCY['first-party' if host in first_parties else 'third-party'])
+                self.send_response(200 if data is not None else 404)
+                self.send_header('Content-Length', str(len(data or b'')))
+                self.end_headers()
+                self.wfile.write(data or b'')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureProxy)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        proxy = f'http://127.0.0.1:{server.server_address[1]}'
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({'http': proxy}))
+        try:
+            for name, (host, _) in FIXTURE_PAGES.items():
+                results = []
+                for active in (None, blocklist):
+                    runs = [_load_page(f'http://{host}/', opener, active, name) for _ in range(5)]
+                    requests, size = runs[0][:2]
+                    results.append((requests, size, sorted(r[2] for r in runs)[2]))
+                (r0, b0, t0), (r1, b1, t1) = results
+                print(f"Page '{name}': {r0} -> {r1} requêtes, {b0 / 1024:.0f} -> {b1 / 1024:.0f} Ko "
+                      f"(-{100 * (b0 - b1) / b0:.0f} %), {t0 * 1000:.0f} -> {t1 * 1000:.0f} ms")
+        finally:
+            server.shutdown()
+            blocklist.close()
+
+
+if __name__ == '__main__':
+    _benchmark()
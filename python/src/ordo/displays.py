@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CLI_OPTION = '--screens'
+ENV_VARIABLE = 'ORDO_SCREENS'
+SCREEN_MODES = ('primary', 'all')
+
+
+def select_screens(argv: Sequence[str]) -> Tuple[str, List[str]]:
+    """Mode d'affichage: 'primary' (un écran) ou 'all' (une fenêtre par écran)
+
+    Priorité: option --screens, puis variable ORDO_SCREENS, puis 'primary'.
+    Retourne aussi argv sans l'option, pour QApplication.
+    """
+    remaining = [argv[0]] if argv else []
+    requested = None
+    args = iter(argv[1:])
+    for arg in args:
+        if arg == CLI_OPTION:
+            requested = next(args, None)
+        elif arg.startswith(CLI_OPTION + '='):
+            requested = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    requested = requested or os.environ.get(ENV_VARIABLE) or 'primary'
+    if requested not in SCREEN_MODES:
+        print(f"Mode d'écrans inconnu '{requested}' (attendu: {', '.join(SCREEN_MODES)}), 'primary' utilisé")
+        requested = 'primary'
+    return requested, remaining
+
+
+def screen_key(screen) -> str:
+    """Nom stable d'un écran pour les fichiers (ex: 'HDMI-1' -> 'hdmi-1')"""
+    name = screen.name() or 'ecran'
+    return re.sub(r'[^a-z0-9_-]+', '-', name.lower()).strip('-') or 'ecran'
+
+
+class ScreenManager:
+    """Une fenêtre par écran dans un seul processus, branchements à chaud compris
+
+    `factory(screen, primary)` crée et affiche la fenêtre d'un écran; les
+    services lourds (serveur local, profil WebEngine, registre, stockages)
+    restent uniques car partagés par le processus. Un écran débranché voit
+    sa fenêtre fermée (sa session est enregistrée par closeEvent), sauf s'il
+    s'agit de la dernière: elle est alors déplacée sur l'écran restant.
+    """
+
+    def __init__(self, app, factory: Callable[[object, bool], object], mode: str = 'primary') -> None:
+        self.app = app
+        self.factory = factory
+        self.mode = mode
+        self.windows: Dict[object, object] = {}
+
+    def start(self) -> None:
+        primary = self.app.primaryScreen()
+        screens = self.app.screens() if self.mode == 'all' else [primary]
+        for screen in screens:
+            self._open(screen)
+        if self.mode == 'all':
+            self.app.screenAdded.connect(self._open)
+            self.app.screenRemoved.connect(self._close)
+
+    def _open(self, screen) -> None:
+        if screen in self.windows:
+            return
+        window = self.factory(screen, screen is self.app.primaryScreen())
+        self.windows[screen] = window
+        print(f"Écran '{screen.name()}': fenêtre ouverte ({len(self.windows)} au total)")
+
+    def _close(self, screen) -> None:
+        window = self.windows.pop(screen, None)
+        if window is None:
+            return
+        if not self.windows:
+            # Dernier écran retiré (veille, changement de câble): on garde la fenêtre
+            target = self.app.primaryScreen()
+            if target is not None and target is not screen:
+                self.windows[target] = window
+                window.setGeometry(target.geometry())
+                window.showFullScreen()
+            else:
+                self.windows[screen] = window
+            return
+        print(f"Écran '{screen.name()}' retiré: fenêtre fermée")
+        window.close()
+
+
+# --- Mesure mémoire --------------------------------------------------------
+
+def tree_memory(pid: int) -> Optional[int]:
+    """Mémoire d'un processus et de ses enfants (processus de rendu WebEngine)
+
+    PSS si disponible: les pages partagées (bibliothèques Qt et Chromium) sont
+    réparties entre les processus au lieu d'être comptées deux fois.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            info = process.memory_full_info()
+            total += getattr(info, 'pss', info.rss)
+        except psutil.Error:
+            continue
+    return total
+
+
+def _offscreen_config(directory: Path, screens: int) -> str:
+    """Plateforme Qt 'offscreen' avec plusieurs écrans virtuels côte à côte"""
+    path = directory / f'screens-{screens}.json'
+    path.write_text(json.dumps({'screens': [
+        {'name': f'virtual-{n}', 'x': 1920 * n, 'y': 0, 'width': 1920, 'height': 1080,
+         'logicalDpi': 96, 'logicalBaseDpi': 96, 'dpr': 1}
+        for n in range(screens)
+    ]}), encoding='utf-8')
+    return f'offscreen:configfile={path}'
+
+
+def _benchmark(screens: int = 2, settle: float = 20.0) -> None:
+    """Mémoire de N bureaux séparés contre un seul processus à N fenêtres
+
+    Lance python/run.py sur des écrans virtuels (plateforme offscreen), attend
+    que les sessions soient restaurées, puis additionne la mémoire de chaque
+    arbre de processus.
+    """
+    run_py = Path(__file__).resolve().parents[2] / 'run.py'
+    with tempfile.TemporaryDirectory() as tmp:
+        base_env = {**os.environ, 'ORDO_NO_WARMUP': '1'}
+
+        def measure(commands: List[Tuple[List[str], Dict[str, str]]]) -> Optional[int]:
+            processes = [subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+                         for command, env in commands]
+            try:
+                time.sleep(settle)
+                sizes = [tree_memory(p.pid) for p in processes]
+                return None if None in sizes else sum(sizes)
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait(timeout=30)
+
+        single = {**base_env, 'QT_QPA_PLATFORM': _offscreen_config(Path(tmp), 1)}
+        separate = measure([([sys.executable, str(run_py)], single)] * screens)
+        shared = measure([([sys.executable, str(run_py), CLI_OPTION, 'all'],
+                           {**base_env, 'QT_QPA_PLATFORM': _offscreen_config(Path(tmp), screens)})])
+    if separate is None or shared is None:
+        print("Mesure impossible (psutil requis, et le bureau doit démarrer)")
+        return
+    mb = 1024 * 1024
+    print(f"{screens} instances séparées: {separate / mb:.0f} Mo")
+    print(f"1 processus, {screens} fenêtres: {shared / mb:.0f} Mo")
+    print(f"Économie: {(separate - shared) / mb:.0f} Mo ({100 * (separate - shared) / separate:.0f} %)")
+
+
+if __name__ == '__main__':
+    _benchmark()
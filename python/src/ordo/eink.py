@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, Set
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QPoint, Qt, QTimer
+from PySide6.QtGui import QRegion
+from PySide6.QtWidgets import QApplication, QWidget
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineScript, QWebEngineSettings
+
+REDUCED_MOTION_FLAG = '--force-prefers-reduced-motion'
+
+# Injecté dans toutes les pages: pas d'animations, pas de défilement doux
+REDUCED_MOTION_SCRIPT = """
+(function () {
+    var style = document.createElement('style');
+    style.textContent = '*, *::before, *::after {' +
+        'animation: none !important; transition: none !important;' +
+        'scroll-behavior: auto !important; caret-color: auto !important; }';
+    (document.head || document.documentElement).appendChild(style);
+    var nativeMatch = window.matchMedia.bind(window);
+    window.matchMedia = function (query) {
+        if (/prefers-reduced-motion\\s*:\\s*reduce/.test(query)) {
+            var result = nativeMatch('all');
+            Object.defineProperty(result, 'media', { value: query });
+            return result;
+        }
+        return nativeMatch(query);
+    };
+})();
+"""
+
+
+def eink_enabled() -> bool:
+    return os.environ.get('ORDO_EINK') == '1'
+
+
+def eink_max_refresh_rate() -> float:
+    """Rafraîchissements maximum par seconde de l'écran (ORDO_EINK_FPS)"""
+    try:
+        return max(0.1, float(os.environ.get('ORDO_EINK_FPS', '2')))
+    except ValueError:
+        return 2.0
+
+
+class EinkController(QObject):
+    """Mode e-ink: regroupe les repeints du bureau et coupe les animations
+
+    Les UpdateRequest des fenêtres de premier niveau sont limités à
+    `max_rate` par seconde; entre deux passages, Qt fusionne les zones
+    sales dans le backing store, si bien qu'un seul rafraîchissement couvre
+    tous les changements. Les statistiques (rafraîchissements, surface sale)
+    permettent de vérifier le budget sur la plateforme offscreen; la surface
+    est comptée pendant le passage lui-même, qui est exécuté par le filtre.
+    """
+
+    def __init__(self, max_rate: float, profile: QWebEngineProfile = None, parent=None) -> None:
+        super().__init__(parent)
+        self.min_interval = 1.0 / max_rate
+        self.refreshes = 0
+        self.deferred = 0
+        self.dirty_area = 0
+        self.started = time.monotonic()
+        self._last_flush: Dict[QWidget, float] = {}
+        self._pending: Dict[QWidget, QTimer] = {}
+        self._dirty: Dict[QWidget, QRegion] = {}
+        self._flushing: Set[QWidget] = set()
+
+        self._disable_animations()
+        self._configure_web(profile or QWebEngineProfile.defaultProfile())
+        QApplication.instance().installEventFilter(self)
+
+    @staticmethod
+    def _disable_animations() -> None:
+        for effect in (Qt.UI_AnimateMenu, Qt.UI_FadeMenu, Qt.UI_AnimateCombo,
+                       Qt.UI_AnimateTooltip, Qt.UI_FadeTooltip, Qt.UI_AnimateToolBox):
+            QApplication.setEffectEnabled(effect, False)
+
+    @staticmethod
+    def _configure_web(profile: QWebEngineProfile) -> None:
+        settings = profile.settings()
+        settings.setAttribute(QWebEngineSettings.ScrollAnimatorEnabled, False)
+        script = QWebEngineScript()
+        script.setName('ordo-eink-reduced-motion')
+        script.setSourceCode(REDUCED_MOTION_SCRIPT)
+        script.setInjectionPoint(QWebEngineScript.DocumentReady)
+        script.setWorldId(QWebEngineScript.MainWorld)
+        script.setRunsOnSubFrames(True)
+        profile.scripts().insert(script)
+
+    def stats(self) -> dict:
+        elapsed_min = max(1e-9, (time.monotonic() - self.started) / 60)
+        return {
+            'refreshes': self.refreshes,
+            'refreshes_per_min': self.refreshes / elapsed_min,
+            'deferred': self.deferred,
+            'dirty_area': self.dirty_area,
+        }
+
+    def reset_stats(self) -> None:
+        self.refreshes = self.deferred = self.dirty_area = 0
+        self.started = time.monotonic()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        event_type = event.type()
+        if event_type == QEvent.Paint and isinstance(obj, QWidget):
+            window = obj.window()
+            offset = obj.mapTo(window, QPoint(0, 0)) if obj is not window else QPoint(0, 0)
+            region = event.region().translated(offset)
+            if window in self._flushing:
+                self._dirty[window] = self._dirty.get(window, QRegion()).united(region)
+            else:
+                self._account(region)  # repaint() direct, hors d'un passage
+        elif event_type == QEvent.UpdateRequest and isinstance(obj, QWidget) and obj.isWindow():
+            if self._throttle(obj):
+                return True
+            self._flush(obj, event)
+            return True
+        return super().eventFilter(obj, event)
+
+    def _account(self, region: QRegion) -> None:
+        if not region.isEmpty():
+            rect = region.boundingRect()
+            self.dirty_area += rect.width() * rect.height()
+
+    def _flush(self, window: QWidget, event: QEvent) -> None:
+        """Exécute le rafraîchissement et compte la surface qu'il a repeinte"""
+        self._flushing.add(window)
+        try:
+            # event() ne repasse pas par les filtres: les Paint, eux, y passent
+            window.event(event)
+        finally:
+            self._flushing.discard(window)
+            self._account(self._dirty.pop(window, QRegion()))
+
+    def _throttle(self, window: QWidget) -> bool:
+        """Laisse passer le rafraîchissement ou le reporte; True = événement absorbé"""
+        now = time.monotonic()
+        wait = self._last_flush.get(window, 0.0) + self.min_interval - now
+        if wait > 0:
+            self.deferred += 1
+            if window not in self._pending:
+                timer = QTimer(self)
+                timer.setSingleShot(True)
+                timer.timeout.connect(lambda w=window: self._flush_later(w))
+                timer.start(int(wait * 1000) + 1)
+                self._pending[window] = timer
+            return True
+
+        self._last_flush[window] = now
+        self.refreshes += 1
+        return False
+
+    def _flush_later(self, window: QWidget) -> None:
+        timer = self._pending.pop(window, None)
+        if timer is not None:
+            timer.deleteLater()
+        try:
+            QCoreApplication.postEvent(window, QEvent(QEvent.UpdateRequest))
+        except RuntimeError:
+            self._last_flush.pop(window, None)  # Fenêtre détruite entre-temps
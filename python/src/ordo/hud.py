@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer
+from PySide6.QtWidgets import QLabel, QMdiArea
+from PySide6.QtWebEngineWidgets import QWebEngineView
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """RSS d'un processus en octets (psutil si présent, sinon /proc)"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """Temps CPU cumulé (utilisateur + système) d'un processus"""
+    if psutil is not None:
+        try:
+            times = psutil.Process(pid).cpu_times()
+            return times.user + times.system
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            # Le nom du processus peut contenir des espaces: on repart après ')'
+            fields = f.read().rsplit(b')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SampleRing:
+    """Fichier circulaire à cases fixes: la taille sur disque ne grandit jamais
+
+    Chaque échantillon est une ligne JSON complétée par des espaces jusqu'à la
+    taille d'une case; l'ordre se retrouve via le champ 'ts'.
+    """
+
+    def __init__(self, path: Path, slots: int = 2048, slot_size: int = 1024) -> None:
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self._next = 0
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            mode = 'r+b' if self.path.exists() else 'w+b'
+            self._file = open(self.path, mode)
+            self._file.truncate(slots * slot_size)
+            self._next = self._find_next_slot()
+        except OSError as e:
+            print(f"Journal HUD indisponible: {e}")
+            self._file = None
+
+    def _find_next_slot(self) -> int:
+        """Reprend après l'échantillon le plus récent du fichier existant"""
+        latest_ts, latest_slot = -1.0, -1
+        for slot in range(self.slots):
+            self._file.seek(slot * self.slot_size)
+            line = self._file.read(self.slot_size).strip(b'\0 \n')
+            if not line:
+                continue
+            try:
+                ts = json.loads(line).get('ts', -1.0)
+            except ValueError:
+                continue
+            if ts > latest_ts:
+                latest_ts, latest_slot = ts, slot
+        return (latest_slot + 1) % self.slots
+
+    def append(self, sample: dict) -> None:
+        if self._file is None:
+            return
+        data = json.dumps(sample, separators=(',', ':')).encode('utf-8')
+        if len(data) >= self.slot_size:
+            data = json.dumps({'ts': sample.get('ts'), 'truncated': True}).encode('utf-8')
+        self._file.seek(self._next * self.slot_size)
+        self._file.write(data.ljust(self.slot_size - 1) + b'\n')
+        self._file.flush()
+        self._next = (self._next + 1) % self.slots
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def hud_ring_path(key: Optional[str] = None) -> Path:
+    """Fichier circulaire du HUD: écran principal, ou un fichier par écran secondaire"""
+    name = 'hud.ring' if key is None else f'hud-{key}.ring'
+    return Path.home() / '.ordo_logs' / name
+
+
+class PerformanceHud(QLabel):
+    """Indicateurs de performance affichés dans la barre des tâches
+
+    L'échantillonnage tourne en continu à basse fréquence (et plus vite quand
+    le HUD est visible); chaque échantillon est aussi écrit dans un fichier
+    circulaire récupérable sur le terrain.
+
+    Latence de la boucle d'événements: retard maximal d'une sonde précise et
+    courte (HUD visible) ou de la minuterie d'échantillonnage, précise elle
+    aussi (une minuterie grossière tolère 5 % de retard, soit 250 ms sur 5 s).
+    Images: peintures de la zone MDI seulement, pas des fenêtres de premier
+    niveau ni des vues WebEngine qui composent à part ('mdi_fps').
+    """
+
+    IDLE_INTERVAL_MS = 5000
+    VISIBLE_INTERVAL_MS = 1000
+    PROBE_INTERVAL_MS = 100
+
+    def __init__(self, mdi: QMdiArea, log_path: Optional[Path] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.setObjectName('perfHud')
+        self.mdi = mdi
+        self.ring = SampleRing(log_path or hud_ring_path())
+        self.hide()
+
+        self._frames = 0
+        self._last_sample = time.monotonic()
+        self._expected = self._last_sample
+        self._probe_expected = self._last_sample
+        self._max_lag = 0.0
+        self._cpu: Dict[int, Tuple[float, float]] = {}
+        self.mdi.viewport().installEventFilter(self)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.sample)
+        self._probe = QTimer(self)
+        self._probe.setTimerType(Qt.PreciseTimer)
+        self._probe.timeout.connect(self._on_probe)
+        self._schedule()
+
+    def toggle(self) -> None:
+        self.setVisible(not self.isVisible())
+        if self.isVisible():
+            self._probe_expected = time.monotonic() + self.PROBE_INTERVAL_MS / 1000
+            self._probe.start(self.PROBE_INTERVAL_MS)
+        else:
+            self._probe.stop()
+        self._schedule()
+
+    def _on_probe(self) -> None:
+        now = time.monotonic()
+        self._max_lag = max(self._max_lag, now - self._probe_expected)
+        self._probe_expected = now + self.PROBE_INTERVAL_MS / 1000
+
+    def _interval_ms(self) -> int:
+        return self.VISIBLE_INTERVAL_MS if self.isVisible() else self.IDLE_INTERVAL_MS
+
+    def _schedule(self) -> None:
+        interval = self._interval_ms()
+        self._expected = time.monotonic() + interval / 1000
+        self._timer.start(interval)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        # Peintures de la zone MDI (pas un compteur d'images de tout l'écran)
+        if event.type() == QEvent.Paint:
+            self._frames += 1
+        return super().eventFilter(obj, event)
+
+    def _cpu_percent(self, pid: int, now: float) -> Optional[float]:
+        seconds = process_cpu_seconds(pid)
+        if seconds is None:
+            return None
+        previous = self._cpu.get(pid)
+        self._cpu[pid] = (now, seconds)
+        if previous is None or now <= previous[0]:
+            return None
+        return round(100.0 * (seconds - previous[1]) / (now - previous[0]), 1)
+
+    def _renderers(self, now: float) -> Tuple[int, List[dict]]:
+        views = 0
+        renderers: Dict[int, dict] = {}
+        for sub in self.mdi.subWindowList():
+            widget = sub.widget()
+            if not isinstance(widget, QWebEngineView):
+                continue
+            views += 1
+            pid = widget.page().renderProcessPid()
+            if pid <= 0:
+                continue
+            if pid in renderers:
+                # Plusieurs vues peuvent partager un même processus de rendu
+                renderers[pid]['apps'].append(sub.property('app_id'))
+                continue
+            renderers[pid] = {
+                'apps': [sub.property('app_id')],
+                'pid': pid,
+                'rss': process_rss(pid),
+                'cpu': self._cpu_percent(pid, now),
+            }
+        # Oubli des processus disparus
+        alive = set(renderers) | {os.getpid()}
+        self._cpu = {pid: v for pid, v in self._cpu.items() if pid in alive}
+        return views, list(renderers.values())
+
+    def sample(self) -> None:
+        now = time.monotonic()
+        lag_ms = max(0.0, now - self._expected, self._max_lag) * 1000
+        self._max_lag = 0.0
+        elapsed = now - self._last_sample
+        fps = self._frames / elapsed if elapsed > 0 else 0.0
+        self._frames = 0
+        self._last_sample = now
+
+        views, renderers = self._renderers(now)
+        sample = {
+            'ts': time.time(),
+            'lag_ms': round(lag_ms, 1),
+            'mdi_fps': round(fps, 1),
+            'rss': process_rss(os.getpid()),
+            'cpu': self._cpu_percent(os.getpid(), now),
+            'views': views,
+            'renderers': renderers,
+        }
+        self.ring.append(sample)
+        if self.isVisible():
+            self.setText(self._format(sample))
+        self._schedule()
+
+    @staticmethod
+    def _format(sample: dict) -> str:
+        def mb(value: Optional[int]) -> str:
+            return f"{value / 1048576:.0f}M" if value else '?'
+
+        renderer_rss = sum(r['rss'] or 0 for r in sample['renderers'])
+        return (f"LAG {sample['lag_ms']:.0f}ms | MDI {sample['mdi_fps']:.0f} FPS | "
+                f"SHELL {mb(sample['rss'])} | WEB {sample['views']}x {mb(renderer_rss)}")
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QFrame, QLineEdit, QListWidget, QListWidgetItem, QPushButton, QVBoxLayout
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents ('Éditeur' -> 'editeur')"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class LauncherItem:
+    """Entrée indexée du lanceur"""
+    id: str
+    title: str
+    keywords: Tuple[str, ...] = ()
+
+
+class LauncherIndex:
+    """Index de recherche: trie de préfixes sur les mots + trigrammes pour le flou
+
+    Chaque nœud du trie porte l'ensemble des entrées dont un mot commence par
+    ce préfixe, une frappe coûte donc O(longueur de la requête) avant le tri.
+    """
+
+    PREFIX_WEIGHT = 3.0
+    TITLE_START_BONUS = 1.0
+    USAGE_WEIGHT = 0.5
+    MIN_FUZZY_SCORE = 0.3
+
+    def __init__(self, items: Iterable[LauncherItem], usage: Optional[Dict[str, int]] = None) -> None:
+        self.items: List[LauncherItem] = list(items)
+        self.usage = usage if usage is not None else {}
+        self._titles = [normalize(item.title) for item in self.items]
+        self._trie: Dict[str, dict] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        for idx, item in enumerate(self.items):
+            words = set(TOKEN_RE.findall(self._titles[idx]))
+            words.update(TOKEN_RE.findall(normalize(item.id)))
+            for keyword in item.keywords:
+                words.update(TOKEN_RE.findall(normalize(keyword)))
+            for word in words:
+                self._insert(word, idx)
+                for gram in trigrams(word):
+                    self._trigrams.setdefault(gram, set()).add(idx)
+
+    def _insert(self, word: str, idx: int) -> None:
+        node = self._trie
+        for char in word:
+            node = node.setdefault(char, {'': set()})
+            node[''].add(idx)
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node['']
+
+    def _usage_score(self, idx: int) -> float:
+        return self.USAGE_WEIGHT * math.log1p(self.usage.get(self.items[idx].id, 0))
+
+    def search(self, query: str, limit: int = 20) -> List[LauncherItem]:
+        """Retourne les meilleures entrées, classées par pertinence puis usage"""
+        tokens = TOKEN_RE.findall(normalize(query))
+        if not tokens:
+            ranked = heapq.nsmallest(limit, range(len(self.items)),
+                                     key=lambda i: (-self.usage.get(self.items[i].id, 0), self._titles[i]))
+            return [self.items[i] for i in ranked]
+
+        scores: Dict[int, float] = {}
+        for position, token in enumerate(tokens):
+            token_scores: Dict[int, float] = {}
+            for idx in self._prefix_matches(token):
+                token_scores[idx] = self.PREFIX_WEIGHT
+            if len(token) >= 3:
+                grams = trigrams(token)
+                counts: Dict[int, int] = {}
+                for gram in grams:
+                    for idx in self._trigrams.get(gram, ()):
+                        counts[idx] = counts.get(idx, 0) + 1
+                for idx, count in counts.items():
+                    fuzzy = count / len(grams)
+                    if fuzzy >= self.MIN_FUZZY_SCORE and fuzzy > token_scores.get(idx, 0.0):
+                        token_scores[idx] = fuzzy
+            # Tous les mots de la requête doivent correspondre
+            if position == 0:
+                scores = token_scores
+            else:
+                scores = {i: s + token_scores[i] for i, s in scores.items() if i in token_scores}
+            if not scores:
+                return []
+
+        first = tokens[0]
+        for idx in scores:
+            if self._titles[idx].startswith(first):
+                scores[idx] += self.TITLE_START_BONUS
+            scores[idx] += self._usage_score(idx)
+        ranked = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        return [self.items[i] for i in ranked]
+
+
+class UsageStore:
+    """Compteurs d'ouverture des apps, persistés dans le dossier utilisateur"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path.home() / '.ordo_launcher.json'
+        self.counts: Dict[str, int] = {}
+        if self.path.exists():
+            try:
+                self.counts = {k: int(v) for k, v in json.loads(self.path.read_text(encoding='utf-8')).items()}
+            except Exception:
+                self.counts = {}
+
+    def record(self, app_id: str) -> None:
+        self.counts[app_id] = self.counts.get(app_id, 0) + 1
+        try:
+            self.path.write_text(json.dumps(self.counts, ensure_ascii=False), encoding='utf-8')
+        except Exception:
+            pass
+
+
+class LauncherPopup(QFrame):
+    """Menu Démarrer: champ de recherche et liste de résultats remplie à la demande"""
+
+    hidden = Signal()
+    MAX_RESULTS = 20
+
+    def __init__(self, index: LauncherIndex, on_launch: Callable[[str], None],
+                 on_shutdown: Callable[[], None], parent=None) -> None:
+        super().__init__(parent, Qt.Popup | Qt.NoDropShadowWindowHint)
+        self.setObjectName('startMenu')
+        self.index = index
+        self.on_launch = on_launch
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+
+        self.input = QLineEdit()
+        self.input.setPlaceholderText('Rechercher une app...')
+        self.input.textChanged.connect(self.refresh)
+        self.input.returnPressed.connect(self._launch_current)
+        self.input.installEventFilter(self)
+        layout.addWidget(self.input)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self._launch_item)
+        layout.addWidget(self.results, 1)
+
+        shutdown = QPushButton('Arrêter...')
+        shutdown.setObjectName('shutdownItem')
+        shutdown.clicked.connect(on_shutdown)
+        layout.addWidget(shutdown)
+
+    def showEvent(self, event) -> None:
+        self.input.clear()
+        self.refresh('')
+        self.input.setFocus()
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        self.hidden.emit()
+        super().hideEvent(event)
+
+    def eventFilter(self, obj, event) -> bool:
+        # Flèches haut/bas depuis le champ de recherche
+        if obj is self.input and event.type() == event.Type.KeyPress and event.key() in (Qt.Key_Up, Qt.Key_Down):
+            row = self.results.currentRow() + (1 if event.key() == Qt.Key_Down else -1)
+            if 0 <= row < self.results.count():
+                self.results.setCurrentRow(row)
+            return True
+        return super().eventFilter(obj, event)
+
+    def refresh(self, query: str) -> None:
+        self.results.clear()
+        for item in self.index.search(query, self.MAX_RESULTS):
+            row = QListWidgetItem(item.title)
+            row.setData(Qt.UserRole, item.id)
+            self.results.addItem(row)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def _launch_current(self) -> None:
+        item = self.results.currentItem()
+        if item:
+            self._launch_item(item)
+
+    def _launch_item(self, item: QListWidgetItem) -> None:
+        self.hide()
+        self.on_launch(item.data(Qt.UserRole))
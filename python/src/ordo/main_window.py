@@ -1,20 +1,34 @@
 from __future__ import annotations
 
 import importlib
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import yaml
-from PySide6.QtCore import Qt, QUrl
-from PySide6.QtGui import QKeySequence, QAction, QIcon, QPixmap, QPainter, QFont, QFontMetrics, QShortcut
+from PySide6.QtCore import Qt, QUrl, QTimer, QEvent, QObject
+from PySide6.QtGui import QKeySequence, QAction, QIcon, QPixmap, QPainter, QFont, QFontMetrics, QScreen, QShortcut
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
-    QMdiArea, QMdiSubWindow, QStatusBar, QMenu, QStyle
+    QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
+    QMdiArea, QMdiSubWindow, QStatusBar, QStyle
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
 
+from .displays import screen_key
+from .eink import EinkController, eink_enabled, eink_max_refresh_rate
+from .hud import PerformanceHud, hud_ring_path
+from .launcher import LauncherIndex, LauncherItem, LauncherPopup, UsageStore
+from .manifests import ManifestScanner
+from .notifications import NotificationToast
+from .policy import AppPolicy, PolicyEnforcer, install_content_blocker, proxy_base_url
+from .reminders import shared_todos
+from .scheme import install_ordo_scheme, is_served_path, to_ordo_url
+from .session import PlaceholderWidget, SessionStore, WindowState, screen_session_root
+from .switcher import TaskSwitcher, ThumbnailCache, WindowList
+from .warmup import IdleWarmer
+
 
 @dataclass(frozen=True)
 class AppEntry:
@@ -29,13 +43,20 @@ class AppEntry:
     height: int = 400
     x: int = 100
     y: int = 100
+    keywords: Tuple[str, ...] = ()
+    preconnect: Tuple[str, ...] = ()
+    prefetch: Tuple[str, ...] = ()
+    warm_on_idle: bool = False
+    policy: AppPolicy = AppPolicy()
 
 
 @lru_cache(maxsize=1)
 def load_registry() -> Dict[str, AppEntry]:
     """Charge le registre des applications (avec cache)
     
-    Les chemins des applications sont résolus dynamiquement par rapport à l'emplacement du projet.
+    Les manifestes découverts dans apps/*/app.yaml sont fusionnés avec les
+    surcharges de apps.yaml (par id). Les chemins des applications sont résolus
+    dynamiquement par rapport à l'emplacement du projet.
     """
     registry: Dict[str, AppEntry] = {}
     
@@ -48,13 +69,24 @@ def load_registry() -> Dict[str, AppEntry]:
         if not cfg_path.exists():
             cfg_path = project_root / 'apps.yaml'
         
-        if not cfg_path.exists():
+        overrides: Dict[str, dict] = {}
+        if cfg_path.exists():
+            data = yaml.safe_load(cfg_path.read_text(encoding='utf-8')) or {}
+            for app in data.get('apps', []):
+                if 'id' not in app:
+                    print(f"Configuration invalide: champ manquant 'id' dans {app}")
+                    continue
+                overrides[app['id']] = app
+        else:
             print(f"Avertissement: Fichier apps.yaml introuvable dans {base_path}")
-            return registry
-            
-        data = yaml.safe_load(cfg_path.read_text(encoding='utf-8'))
         
-        for app in data.get('apps', []):
+        manifests = ManifestScanner(project_root / 'apps', project_root).scan()
+        
+        # Ordre: celui de apps.yaml, puis les apps découvertes non listées
+        app_ids = list(overrides) + [app_id for app_id in manifests if app_id not in overrides]
+        for app_id in app_ids:
+            manifest = manifests.get(app_id, {})
+            app = {**manifest, **overrides.get(app_id, {})}
             try:
                 # Traitement des URLs
                 url = app.get('url')
@@ -63,14 +95,15 @@ def load_registry() -> Dict[str, AppEntry]:
                     rel_path = url.replace('file://', '')
                     # Nettoyer le chemin (supprimer les / en début si nécessaire)
                     rel_path = rel_path.lstrip('/')
-                    # Construire le chemin absolu
                     abs_path = (project_root / rel_path).resolve()
-                    # Vérifier que le fichier existe
                     if not abs_path.exists():
                         print(f"Avertissement: Fichier introuvable: {abs_path}")
                         continue
-                    # Utiliser le chemin absolu avec le préfixe file://
-                    url = f'file:///{abs_path}'.replace('\\', '/')
+                    if is_served_path(rel_path):
+                        # Servi par le schéma ordo:// (pas d'origine file://, pas de socket)
+                        url = to_ordo_url(rel_path)
+                    else:
+                        url = abs_path.as_uri()
                 
                 entry = AppEntry(
                     id=app['id'], 
@@ -83,13 +116,16 @@ def load_registry() -> Dict[str, AppEntry]:
                     height=app.get('height', 400),
                     x=app.get('x', 100), 
                     y=app.get('y', 100),
+                    keywords=tuple(app.get('keywords', ())),
+                    preconnect=tuple(app.get('preconnect', ())),
+                    prefetch=tuple(app.get('prefetch', ())),
+                    warm_on_idle=bool(app.get('warm_on_idle', False)),
+                    policy=AppPolicy.from_config(app.get('policy'), app['id']),
                 )
                 registry[entry.id] = entry
             except KeyError as e:
                 print(f"Configuration invalide pour '{app.get('id', 'inconnu')}': champ manquant {e}")
                 
-    except FileNotFoundError:
-        print("Fichier apps.yaml introuvable")
     except yaml.YAMLError as e:
         print(f"Erreur de parsing YAML: {e}")
     except Exception as e:
@@ -98,8 +134,74 @@ def load_registry() -> Dict[str, AppEntry]:
     return registry
 
 
+class DesktopServices(QObject):
+    """Services uniques du processus, partagés par les bureaux de chaque écran
+
+    Registre, schéma ordo://, liste de blocage, compteurs du lanceur, tâches,
+    préchauffage, mode e-ink et politiques de ressources n'existent qu'une
+    fois, quel que soit le nombre d'écrans: leurs filtres d'événements sont
+    posés sur l'application et leurs scripts sur le profil partagé.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.registry = load_registry()
+        self.scheme_handler = install_ordo_scheme()
+        # Liste de blocage sur le profil partagé (avant tout chargement de page)
+        self.blocker = install_content_blocker(self.registry.values(), parent=self,
+                                               proxy_base=proxy_base_url())
+        self.usage = UsageStore()
+        # Tâches et rappels (une seule minuterie pour tous les écrans): chaque
+        # rappel est affiché une fois, sur le bureau de l'écran principal
+        self.todos = shared_todos()
+        self.windows: List[QMainWindow] = []
+        self.todos.reminder.connect(self._on_reminder)
+        # Préchauffage des apps distantes une fois le bureau inactif
+        self.warmer = IdleWarmer(self.registry.values(), parent=self)
+        self.warmer.start()
+        # Mode e-ink (ORDO_EINK=1): repeints regroupés, animations coupées
+        self.eink = EinkController(eink_max_refresh_rate(), parent=self) if eink_enabled() else None
+        # Politiques de ressources par app (bloc policy: de apps.yaml)
+        self.policies = PolicyEnforcer(parent=self)
+        app = QApplication.instance()
+        if app is not None and self.blocker and self.blocker.blocklist is not None:
+            app.aboutToQuit.connect(self.blocker.blocklist.report)
+
+
+    def add_window(self, window: QMainWindow, primary: bool) -> None:
+        """Bureau d'un écran; le principal passe en tête et reçoit les rappels"""
+        if primary:
+            self.windows.insert(0, window)
+        else:
+            self.windows.append(window)
+        window.destroyed.connect(lambda *_, w=window: self._remove_window(w))
+
+    def _remove_window(self, window: QMainWindow) -> None:
+        if window in self.windows:
+            self.windows.remove(window)
+
+    def _on_reminder(self, todo) -> None:
+        # Écran principal débranché (fenêtre fermée): le premier bureau
+        # encore affiché prend le relais
+        for window in self.windows:
+            if window.isVisible():
+                window.show_reminder(todo)
+                return
+
+
+_services: Optional[DesktopServices] = None
+
+
+def shared_services() -> DesktopServices:
+    """Services du bureau, créés avec la première fenêtre"""
+    global _services
+    if _services is None:
+        _services = DesktopServices(QApplication.instance())
+    return _services
+
+
 class OrdoMainWindow(QMainWindow):
-    """Fenêtre principale de l'application Ordo Desktop"""
+    """Fenêtre principale de l'application Ordo Desktop (une par écran)"""
     
     # Constantes de style (noir et blanc uniquement)
     BACKGROUND_COLOR = "#ffffff"  # Blanc pur
@@ -107,6 +209,8 @@ class OrdoMainWindow(QMainWindow):
     BORDER_WIDTH = 1             # Bordure plus fine
     MENU_WIDTH = 300
     MENU_HEIGHT = 400
+    SESSION_SAVE_DELAY_MS = 1000  # Regroupe les sauvegardes de session
+    SESSION_IDLE_DELAY_MS = 2000  # Délai d'inactivité avant d'hydrater un aperçu
     
     # Stylesheet centralisé (noir et blanc uniquement)
     STYLESHEET = """
@@ -123,6 +227,13 @@ class OrdoMainWindow(QMainWindow):
             margin: 0;
         }
         
+        QLabel#perfHud {
+            color: #000000;
+            font-family: 'Courier New', 'Consolas', 'Monaco', monospace;
+            font-size: 9px;
+            padding: 0 6px;
+        }
+        
         QStatusBar::item {
             border: none;
             padding: 0;
@@ -157,55 +268,87 @@ class OrdoMainWindow(QMainWindow):
             color: #ffffff;
         }
         
-        QMenu {
+        QPushButton#taskButton {
             background-color: #ffffff;
+            color: #000000;
             border: 1px solid #000000;
-            padding: 4px 0;
-            min-width: 250px;
-            max-width: 300px;
-            max-height: 500px;
+            padding: 2px 8px;
+            max-width: 160px;
+            min-height: 22px;
+            font-family: 'Courier New', 'Consolas', 'Monaco', monospace;
+            font-size: 9pt;
+            text-transform: uppercase;
+        }
+        
+        QPushButton#taskButton:checked {
+            background-color: #000000;
+            color: #ffffff;
+        }
+        
+        QFrame#taskSwitcher {
+            background-color: #ffffff;
+            border: 2px solid #000000;
+        }
+        
+        QFrame#switcherTile {
+            border: 1px solid #ffffff;
+            font-family: 'Courier New', 'Consolas', 'Monaco', monospace;
+            font-size: 9px;
+        }
+        
+        QFrame#switcherTile[selected="true"] {
+            border: 2px solid #000000;
+        }
+        
+        QFrame#notification {
+            background-color: #ffffff;
+            border: 2px solid #000000;
             font-family: 'Courier New', 'Consolas', 'Monaco', monospace;
             font-size: 10px;
             font-weight: normal;
-            margin: 0;
         }
         
-        QMenu::item {
-            padding: 8px 20px 8px 30px;
-            background: transparent;
-            min-height: 24px;
-            border: none;
-            margin: 0;
-            text-align: left;
-            color: #000000;
+        QLabel#notificationTitle {
+            font-weight: bold;
+        }
+        
+        QFrame#startMenu {
+            background-color: #ffffff;
+            border: 1px solid #000000;
             font-family: 'Courier New', 'Consolas', 'Monaco', monospace;
             font-size: 10px;
             font-weight: normal;
         }
         
-        QMenu::item:selected {
-            background-color: #000000;
-            color: #ffffff;
+        QFrame#startMenu QLineEdit {
+            border: 1px solid #000000;
+            padding: 4px 8px;
+            color: #000000;
         }
         
-        QMenu::separator {
-            height: 1px;
-            background: #000000;
-            margin: 4px 0;
+        QFrame#startMenu QListWidget {
+            border: none;
+            color: #000000;
         }
         
-        QMenu::item#shutdownItem {
-            background: #000000;
-            color: #ffffff;
+        QFrame#startMenu QListWidget::item {
             padding: 8px 20px 8px 30px;
-            margin: 4px 0 0 0;
-            font-weight: bold;
-            text-transform: uppercase;
+            min-height: 24px;
+        }
+        
+        QFrame#startMenu QListWidget::item:selected {
+            background-color: #000000;
+            color: #ffffff;
         }
         
-        QMenu::item#shutdownItem:selected {
+        QPushButton#shutdownItem {
             background: #000000;
             color: #ffffff;
+            border: none;
+            padding: 8px 20px 8px 30px;
+            text-align: left;
+            font-weight: bold;
+            text-transform: uppercase;
         }
         
         QMdiArea {
@@ -259,18 +402,32 @@ class OrdoMainWindow(QMainWindow):
         }
     """
     
-    def __init__(self) -> None:
+    def __init__(self, screen: Optional[QScreen] = None, primary: bool = True) -> None:
         super().__init__()
+        self.target_screen = screen
+        # Écran principal: session historique; autres écrans: une session chacun
+        self.session_root = None if primary or screen is None else screen_session_root(screen_key(screen))
+        self.services = shared_services()
+        self.scheme_handler = self.services.scheme_handler
+        self.blocker = self.services.blocker
+        self.warmer = self.services.warmer
+        self.eink = self.services.eink
+        self.policies = self.services.policies
+        self.services.add_window(self, primary)
         self._init_window()
         self._init_ui()
         self._init_shortcuts()
+        self._init_session()
         
     def _init_window(self) -> None:
         """Initialize window properties"""
         self.setWindowTitle('Ordo Desktop')
         
-        # Mode kiosk (plein écran sans bordure)
+        # Mode kiosk (plein écran sans bordure), sur l'écran attribué
         self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint)
+        if self.target_screen is not None:
+            self.setScreen(self.target_screen)
+            self.setGeometry(self.target_screen.geometry())
         self.showFullScreen()
         
         self.setStyleSheet(self.STYLESHEET)
@@ -284,7 +441,7 @@ class OrdoMainWindow(QMainWindow):
         
     def _init_shortcuts(self) -> None:
         """Initialize keyboard shortcuts"""
-        # Raccourci Alt pour le menu Démarrer
+        # Raccourci Alt pour le lanceur (recherche au fil de la frappe)
         alt_action = QAction('Show Start Menu', self)
         alt_action.setShortcut(QKeySequence('Alt'))
         alt_action.triggered.connect(self.toggle_start_menu)
@@ -296,13 +453,42 @@ class OrdoMainWindow(QMainWindow):
         esc_action.triggered.connect(self.toggle_fullscreen)
         self.addAction(esc_action)
         
+        # Sélecteur de fenêtres (Alt+Tab, Alt+Maj+Tab pour reculer)
+        self.shortcut_switch = QShortcut(QKeySequence('Alt+Tab'), self)
+        self.shortcut_switch.activated.connect(lambda: self.show_switcher(1))
+        self.shortcut_switch_back = QShortcut(QKeySequence('Alt+Shift+Backtab'), self)
+        self.shortcut_switch_back.activated.connect(lambda: self.show_switcher(-1))
+        
+        # Affichage des indicateurs de performance
+        self.shortcut_hud = QShortcut(QKeySequence('Ctrl+Shift+H'), self)
+        self.shortcut_hud.activated.connect(self.hud.toggle)
+        
         # Gestion spécifique de Ctrl+W pour éviter les conflits
         self.shortcut_close = QShortcut(QKeySequence('Ctrl+W'), self)
         self.shortcut_close.activated.connect(self.close)
         
+    def _init_session(self) -> None:
+        """Initialize session persistence and restore the previous session"""
+        self.session = SessionStore(self.session_root)
+        self._restoring = False
+        self._last_active: Optional[QMdiSubWindow] = None
+
+        self._session_timer = QTimer(self)
+        self._session_timer.setSingleShot(True)
+        self._session_timer.setInterval(self.SESSION_SAVE_DELAY_MS)
+        self._session_timer.timeout.connect(self.save_session)
+
+        self._hydrate_timer = QTimer(self)
+        self._hydrate_timer.setSingleShot(True)
+        self._hydrate_timer.setInterval(self.SESSION_IDLE_DELAY_MS)
+        self._hydrate_timer.timeout.connect(self._hydrate_next_placeholder)
+
+        self.mdi.subWindowActivated.connect(self._on_subwindow_activated)
+        self.restore_session()
+
     def _init_ui(self) -> None:
         """Initialize user interface components"""
-        self.registry = load_registry()
+        self.registry = self.services.registry
         self.start_menu_visible = False
         
         # Widget central
@@ -323,6 +509,13 @@ class OrdoMainWindow(QMainWindow):
         # Menu démarrer
         self._create_start_menu()
         
+        # Sélecteur de fenêtres: miniatures capturées à la perte du focus
+        self.thumbnails = ThumbnailCache()
+        self.switcher = TaskSwitcher(self.mdi, self.thumbnails, self._thumbnail_for, self)
+
+        # Notifications (rappels des tâches)
+        self.notifications = NotificationToast(self.mdi)
+        
     def _init_taskbar(self) -> None:
         """Initialize taskbar"""
         self.taskbar = QStatusBar()
@@ -341,7 +534,16 @@ class OrdoMainWindow(QMainWindow):
         self.start_button.clicked.connect(self.toggle_start_menu)
         
         taskbar_layout.addWidget(self.start_button)
-        taskbar_layout.addStretch()
+        
+        # Liste des fenêtres ouvertes
+        self.window_list = WindowList(self.mdi)
+        taskbar_layout.addWidget(self.window_list, 1)
+        
+        # Indicateurs de performance (masqués par défaut, Ctrl+Shift+H), un
+        # fichier circulaire par écran
+        ring_key = None if self.session_root is None else screen_key(self.target_screen)
+        self.hud = PerformanceHud(self.mdi, hud_ring_path(ring_key))
+        taskbar_layout.addWidget(self.hud)
         
         self.taskbar.addPermanentWidget(taskbar_container, 1)
         
@@ -354,6 +556,13 @@ class OrdoMainWindow(QMainWindow):
             self.start_menu.show()
             self.start_menu_visible = True
             
+    def show_reminder(self, todo) -> None:
+        """Show a todo reminder; clicking it opens the todo app"""
+        message = todo.text
+        if todo.due is not None:
+            message += f"  (échéance {datetime.fromtimestamp(todo.due):%d/%m %H:%M})"
+        self.notifications.notify('Rappel', message, lambda: self.open_app('todo'))
+
     def _on_menu_hidden(self) -> None:
         """Handle menu hide event"""
         self.start_menu_visible = False
@@ -436,6 +645,7 @@ class OrdoMainWindow(QMainWindow):
             return None
             
         view = QWebEngineView()
+        self.policies.apply(view, app.id, app.policy)
         view.setUrl(QUrl(app.url))
         return view
         
@@ -454,44 +664,199 @@ class OrdoMainWindow(QMainWindow):
             print(f"Erreur chargement classe '{app.class_path}': {e}")
             return None
             
-    def _create_subwindow(self, widget: QWidget, app: AppEntry) -> None:
+    def _create_subwindow(self, widget: QWidget, app: AppEntry) -> Optional[QMdiSubWindow]:
         """Create MDI subwindow for widget"""
         try:
             sub = QMdiSubWindow()
+            sub.setAttribute(Qt.WA_DeleteOnClose)
+            sub.setProperty('app_id', app.id)
             sub.setWidget(widget)
             sub.setWindowTitle(app.title)
             sub.resize(app.width, app.height)
             self.mdi.addSubWindow(sub)
             sub.move(app.x, app.y)
+            sub.installEventFilter(self)
+            sub.destroyed.connect(self._schedule_session_save)
+            sub.destroyed.connect(lambda *_, app_id=app.id: self.thumbnails.discard(app_id))
+            self.window_list.add(sub)
+            self.policies.watch(sub, app.id, app.policy)
+            self._watch_widget(widget)
             sub.show()
+            self._schedule_session_save()
+            return sub
         except Exception as e:
             print(f"Erreur affichage application '{app.id}': {e}")
+            return None
+
+    # --- Session -------------------------------------------------------
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        """Track subwindow geometry changes for the session"""
+        if event.type() in (QEvent.Move, QEvent.Resize, QEvent.WindowStateChange):
+            self._schedule_session_save()
+        return super().eventFilter(obj, event)
+
+    def _watch_widget(self, widget: QWidget) -> None:
+        """Save the session when a web view navigates or scrolls"""
+        if isinstance(widget, QWebEngineView):
+            widget.urlChanged.connect(self._schedule_session_save)
+            widget.page().scrollPositionChanged.connect(self._schedule_session_save)
+
+    def _schedule_session_save(self, *args) -> None:
+        if not self._restoring:
+            self._session_timer.start()
+        # Toute activité repousse l'hydratation en arrière-plan
+        if self._hydrate_timer.isActive():
+            self._hydrate_timer.start()
+
+    def _collect_session(self) -> List[WindowState]:
+        """Snapshot open subwindows, bottom of the stack first"""
+        windows: List[WindowState] = []
+        for sub in self.mdi.subWindowList(QMdiArea.StackingOrder):
+            app_id = sub.property('app_id')
+            if not app_id or (not sub.isVisible() and not sub.isMinimized()):
+                continue
+            geometry = sub.normalGeometry() if sub.isMinimized() else sub.geometry()
+            widget = sub.widget()
+            if isinstance(widget, PlaceholderWidget):
+                url, scroll_x, scroll_y = widget.state.url, widget.state.scroll_x, widget.state.scroll_y
+            elif isinstance(widget, QWebEngineView):
+                scroll = widget.page().scrollPosition()
+                url, scroll_x, scroll_y = widget.url().toString(), scroll.x(), scroll.y()
+            else:
+                url, scroll_x, scroll_y = None, 0.0, 0.0
+            windows.append(WindowState(
+                app_id=app_id, x=geometry.x(), y=geometry.y(),
+                width=geometry.width(), height=geometry.height(),
+                minimized=sub.isMinimized(), url=url,
+                scroll_x=scroll_x, scroll_y=scroll_y,
+            ))
+        return windows
+
+    def save_session(self) -> None:
+        """Persist the current session"""
+        self.session.save(self._collect_session())
+
+    def restore_session(self) -> None:
+        """Recreate saved windows as placeholders; real apps are built lazily"""
+        states = self.session.load()
+        if not states:
+            return
+
+        self._restoring = True
+        try:
+            for state in states:
+                app = self.registry.get(state.app_id)
+                if not app:
+                    continue
+                app = replace(app, x=state.x, y=state.y, width=state.width, height=state.height)
+                placeholder = PlaceholderWidget(state, app.title, self.session.screenshot_path(app.id))
+                sub = self._create_subwindow(placeholder, app)
+                if sub and state.minimized:
+                    sub.showMinimized()
+        finally:
+            self._restoring = False
+
+        active = self.mdi.activeSubWindow()
+        if active:
+            self._hydrate(active)
+        self._hydrate_timer.start()
+
+    def _on_subwindow_activated(self, sub: Optional[QMdiSubWindow]) -> None:
+        """Hydrate focused placeholders and capture the window losing focus"""
+        previous = self._last_active
+        self._last_active = sub
+        if previous is not None and previous is not sub:
+            try:
+                widget = previous.widget()
+                if widget and not isinstance(widget, PlaceholderWidget):
+                    # Une seule capture sert la miniature et l'aperçu de session
+                    app_id = previous.property('app_id')
+                    pixmap = self.thumbnails.capture(app_id, widget)
+                    if pixmap is not None:
+                        self.session.save_screenshot(app_id, pixmap)
+            except RuntimeError:
+                pass  # Sous-fenêtre déjà détruite
+        if sub is not None and not self._restoring:
+            self._hydrate(sub)
+        self._schedule_session_save()
+
+    def _hydrate(self, sub: QMdiSubWindow) -> None:
+        """Replace a placeholder by the real application widget"""
+        placeholder = sub.widget()
+        if not isinstance(placeholder, PlaceholderWidget):
+            return
+        app = self.registry.get(sub.property('app_id'))
+        if not app:
+            return
+
+        state = placeholder.state
+        if state.url:
+            app = replace(app, url=state.url)
+        widget = self._create_app_widget(app)
+        if not widget:
+            return
+
+        if isinstance(widget, QWebEngineView) and (state.scroll_x or state.scroll_y):
+            script = f"window.scrollTo({state.scroll_x}, {state.scroll_y})"
+
+            def restore_scroll(ok: bool, view: QWebEngineView = widget) -> None:
+                view.loadFinished.disconnect(restore_scroll)
+                if ok:
+                    view.page().runJavaScript(script)
+
+            widget.loadFinished.connect(restore_scroll)
+        sub.setWidget(widget)
+        placeholder.deleteLater()
+        self._watch_widget(widget)
+
+    def _hydrate_next_placeholder(self) -> None:
+        """Build one pending app per idle period, topmost first"""
+        for sub in reversed(self.mdi.subWindowList(QMdiArea.StackingOrder)):
+            if isinstance(sub.widget(), PlaceholderWidget):
+                self._hydrate(sub)
+                self._hydrate_timer.start()
+                return
+
+    def closeEvent(self, event) -> None:
+        """Save the session (and the active window preview) before quitting"""
+        active = self.mdi.activeSubWindow()
+        if active and not isinstance(active.widget(), PlaceholderWidget):
+            self.session.save_screenshot(active.property('app_id'), active.widget().grab())
+        self._session_timer.stop()
+        self.save_session()
+        super().closeEvent(event)
+            
+    # --- Sélecteur de fenêtres -------------------------------------------
+
+    def show_switcher(self, step: int = 1) -> None:
+        """Open the Alt+Tab switcher (refreshing only the active thumbnail)"""
+        active = self.mdi.activeSubWindow()
+        if active and not self.switcher.isVisible() and not isinstance(active.widget(), PlaceholderWidget):
+            self.thumbnails.refresh(active.property('app_id'), active.widget())
+        self.switcher.open(step)
+
+    def _thumbnail_for(self, sub: QMdiSubWindow) -> Optional[QPixmap]:
+        """Cached thumbnail; placeholders fall back to their saved screenshot"""
+        app_id = sub.property('app_id')
+        if isinstance(sub.widget(), PlaceholderWidget):
+            return self.thumbnails.load(app_id, self.session.screenshot_path(app_id))
+        return self.thumbnails.get(app_id)
             
     def _create_start_menu(self) -> None:
-        """Create start menu with application list (without icons)"""
-        self.start_menu = QMenu(self)
-        self.start_menu.setObjectName("startMenu")
-        
-        # Désactiver la fermeture automatique du menu
-        self.start_menu.setWindowFlags(self.start_menu.windowFlags() | Qt.Popup | Qt.NoDropShadowWindowHint)
-        self.start_menu.aboutToHide.connect(self._on_menu_hidden)
-        
-        # Ajouter les applications triées
-        for app_id, app in sorted(self.registry.items(), key=lambda x: x[1].title.lower()):
-            action = QAction(app.title, self)
-            action.setData(app_id)
-            action.triggered.connect(lambda checked=False, a=app_id: self.open_app(a))
-            self.start_menu.addAction(action)
-        
-        # Bouton d'arrêt
-        self.start_menu.addSeparator()
-        shutdown_action = QAction("Arrêter...", self)
-        shutdown_action.triggered.connect(self.close)
-        shutdown_action.setObjectName("shutdownItem")
-        self.start_menu.addAction(shutdown_action)
-        
-        self.start_menu.setMinimumWidth(250)
-        self.start_menu.setMaximumHeight(500)
+        """Create the start menu launcher backed by a prebuilt search index"""
+        self.usage = self.services.usage  # Compteurs communs à tous les écrans
+        index = LauncherIndex(
+            (LauncherItem(app.id, app.title, app.keywords) for app in self.registry.values()),
+            self.usage.counts,
+        )
+        self.start_menu = LauncherPopup(index, self.launch_app, self.close, self)
+        self.start_menu.hidden.connect(self._on_menu_hidden)
+        
+    def launch_app(self, app_id: str) -> None:
+        """Open an application from the launcher and record its usage"""
+        self.usage.record(app_id)
+        self.open_app(app_id)
         
     def _create_app_icon(self, app: AppEntry) -> Optional[QIcon]:
         """Désactivé - Ne plus afficher d'icônes"""
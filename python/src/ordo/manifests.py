@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import yaml
+
+MANIFEST_NAME = 'app.yaml'
+LEGACY_ICON_NAME = 'app.txt'  # Ancien format: ne contient que l'icône
+PARALLEL_THRESHOLD = 16  # En dessous, un thread de plus coûte plus qu'il ne rapporte
+CACHE_VERSION = 2
+
+
+def _signature(entry: os.DirEntry) -> list:
+    """Empreinte d'un dossier d'app: date du dossier, puis nom, date et taille du manifeste
+
+    Modifier app.yaml sur place ne change pas la date du dossier: le fichier
+    lui-même est donc pris en compte. L'ancien app.txt n'est consulté que si
+    app.yaml est absent.
+    """
+    signature = [entry.stat().st_mtime_ns]
+    for name in (MANIFEST_NAME, LEGACY_ICON_NAME):
+        try:
+            stat = os.stat(os.path.join(entry.path, name))
+        except OSError:
+            continue
+        return signature + [name, stat.st_mtime_ns, stat.st_size]
+    return signature + [None]
+
+
+def _read_manifest(app_dir: Path, project_root: Path) -> Optional[dict]:
+    """Lit le manifeste d'un dossier d'app et complète les valeurs par défaut"""
+    manifest: dict = {}
+    manifest_path = app_dir / MANIFEST_NAME
+    legacy_path = app_dir / LEGACY_ICON_NAME
+    try:
+        if manifest_path.exists():
+            manifest = yaml.safe_load(manifest_path.read_text(encoding='utf-8')) or {}
+        elif legacy_path.exists():
+            manifest = {'icon': legacy_path.read_text(encoding='utf-8').strip()}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"Manifeste invalide dans {app_dir}: {e}")
+        return None
+
+    manifest.setdefault('id', app_dir.name)
+    manifest.setdefault('title', app_dir.name.capitalize())
+    manifest.setdefault('type', 'web')
+    if 'url' not in manifest and manifest['type'] == 'web':
+        index = app_dir / 'index.html'
+        if not index.exists():
+            return None
+        manifest['url'] = 'file:///' + index.relative_to(project_root).as_posix()
+    return manifest
+
+
+class ManifestScanner:
+    """Découverte des manifestes d'apps dans apps/*/
+
+    Le résultat est mis en cache sur disque, par arbre d'apps puis par
+    dossier, indexé par la date du dossier et celle du manifeste (voir
+    _signature): un arbre inchangé coûte deux stat par dossier (le dossier
+    et son app.yaml; trois pour un ancien dossier à app.txt). Les dossiers
+    modifiés sont relus en parallèle.
+    """
+
+    def __init__(self, apps_dir: Path, project_root: Path, cache_path: Optional[Path] = None) -> None:
+        self.apps_dir = apps_dir
+        self.project_root = project_root
+        self.cache_path = cache_path or Path.home() / '.ordo_manifests.json'
+        # Deux arbres (ex: installation et copie de développement) ne partagent pas d'entrées
+        self.cache_key = str(apps_dir.resolve())
+
+    def _load_trees(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('trees', {})
+
+    def _load_cache(self) -> Dict[str, dict]:
+        return self._load_trees().get(self.cache_key, {})
+
+    def _save_cache(self, cache: Dict[str, dict]) -> None:
+        trees = self._load_trees()
+        trees[self.cache_key] = cache
+        data = {'version': CACHE_VERSION, 'trees': trees}
+        try:
+            self.cache_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        except OSError as e:
+            print(f"Cache des manifestes non sauvegardé: {e}")
+
+    def scan(self) -> Dict[str, dict]:
+        """Retourne les manifestes découverts, par id d'app, triés par dossier"""
+        if not self.apps_dir.is_dir():
+            return {}
+
+        cache = self._load_cache()
+        fresh: Dict[str, dict] = {}
+        stale: Dict[str, Tuple[Path, list]] = {}
+        with os.scandir(self.apps_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                signature = _signature(entry)
+                cached = cache.get(entry.name)
+                if cached and cached.get('signature') == signature:
+                    fresh[entry.name] = cached
+                else:
+                    stale[entry.name] = (Path(entry.path), signature)
+
+        if stale:
+            names = list(stale)
+            dirs = [stale[name][0] for name in names]
+            if len(dirs) >= PARALLEL_THRESHOLD:
+                with ThreadPoolExecutor() as pool:
+                    manifests = list(pool.map(_read_manifest, dirs, [self.project_root] * len(dirs)))
+            else:
+                manifests = [_read_manifest(d, self.project_root) for d in dirs]
+            for name, manifest in zip(names, manifests):
+                fresh[name] = {'signature': stale[name][1], 'manifest': manifest}
+
+        if stale or len(fresh) != len(cache):
+            self._save_cache(fresh)
+
+        discovered: Dict[str, dict] = {}
+        for name in sorted(fresh):
+            manifest = fresh[name]['manifest']
+            if manifest:
+                discovered[manifest['id']] = manifest
+        return discovered
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import html
+import re
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})(.*)$')
+HEADING_RE = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?[ \t#]*$')
+HR_RE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+LIST_RE = re.compile(r'^( {0,3})([-*+]|\d{1,9}[.)])[ \t]+(.*)$')
+TASK_RE = re.compile(r'^\[([ xX])\][ \t]+(.*)$')
+QUOTE_RE = re.compile(r'^ {0,3}> ?(.*)$')
+
+CODE_SPAN_RE = re.compile(r'(`+)(.+?)\1')
+IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)\)')
+LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+STRONG_RE = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1')
+EM_RE = re.compile(r'(\*|_)(?=\S)(.+?)(?<=\S)\1')
+STRIKE_RE = re.compile(r'~~(?=\S)(.+?)(?<=\S)~~')
+SAFE_URL_RE = re.compile(r'^(?:https?:|mailto:|ordo:|#|/|\.{0,2}/|[\w.-]+(?:/|$))', re.IGNORECASE)
+
+# Les longs blocs de code et listes sont découpés en segments: une frappe ne
+# réanalyse et ne réaffiche qu'un segment. Les coupures dépendent du contenu
+# des lignes (et non de leur position), si bien qu'une insertion ne décale pas
+# les segments suivants et que l'analyse incrémentale se resynchronise.
+MIN_SEGMENT_LINES = 16
+MAX_SEGMENT_LINES = 256
+SEGMENT_MODULUS = 16
+
+# Un patch remplace `remove` blocs à partir de `index` par les blocs HTML donnés
+Patch = Tuple[int, int, List[str]]
+
+
+class Block:
+    """Bloc Markdown de premier niveau: lignes [start, end) du document
+
+    `fence` est le délimiteur d'un bloc de code ouvert avant ce bloc (segment
+    de suite), `carry` celui qui reste ouvert après lui.
+    """
+
+    __slots__ = ('start', 'end', 'kind', 'source', 'fence', 'carry', 'html')
+
+    def __init__(self, start: int, end: int, kind: str, source: str,
+                 fence: Optional[str] = None, carry: Optional[str] = None) -> None:
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.source = source
+        self.fence = fence
+        self.carry = carry
+        self.html: Optional[str] = None
+
+
+def _closes_fence(line: str, marker: str) -> bool:
+    close = FENCE_RE.match(line)
+    return bool(close and close.group(1)[0] == marker[0] and len(close.group(1)) >= len(marker)
+                and not close.group(2).strip())
+
+
+def _segment_boundary(line: str, length: int) -> bool:
+    """Coupure de segment avant `line`, le segment courant comptant `length` lignes"""
+    if length >= MAX_SEGMENT_LINES:
+        return True
+    return length >= MIN_SEGMENT_LINES and zlib.crc32(line.encode('utf-8')) % SEGMENT_MODULUS == 0
+
+
+def _starts_block(line: str) -> bool:
+    """Ligne qui interrompt un paragraphe"""
+    return bool(FENCE_RE.match(line) or HEADING_RE.match(line) or HR_RE.match(line)
+                or QUOTE_RE.match(line) or LIST_RE.match(line))
+
+
+def _scan_code(lines: Sequence[str], i: int, marker: str, length: int) -> Tuple[int, Optional[str]]:
+    """Avance dans un bloc de code; retourne la fin du segment et le délimiteur resté ouvert"""
+    n = len(lines)
+    while i < n:
+        line = lines[i]
+        if _closes_fence(line, marker):
+            return i + 1, None
+        if _segment_boundary(line, length):
+            return i, marker
+        i += 1
+        length += 1
+    return n, None
+
+
+def parse_blocks(lines: Sequence[str], start: int = 0, fence: Optional[str] = None) -> Iterator[Block]:
+    """Découpe les lignes en blocs à partir de `start` (qui doit débuter un bloc)
+
+    L'analyse ne dépend que des lignes qui suivent `start` (et du délimiteur
+    de code éventuellement ouvert): c'est ce qui permet de ne réanalyser
+    qu'une fenêtre autour d'une modification.
+    """
+    n = len(lines)
+    i = start
+    while i < n:
+        begin = i
+        if fence is not None:
+            # Suite d'un bloc de code découpé en segments
+            i, carry = _scan_code(lines, i, fence, 0)
+            yield Block(begin, i, 'code', '\n'.join(lines[begin:i]), fence, carry)
+            fence = carry
+            continue
+
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        opening = FENCE_RE.match(line)
+        if opening:
+            i, carry = _scan_code(lines, i + 1, opening.group(1), 1)
+            yield Block(begin, i, 'code', '\n'.join(lines[begin:i]), None, carry)
+            fence = carry
+            continue
+
+        if HEADING_RE.match(line):
+            i += 1
+            kind = 'heading'
+        elif HR_RE.match(line):
+            i += 1
+            kind = 'hr'
+        elif QUOTE_RE.match(line):
+            i += 1
+            while i < n and lines[i].strip() and QUOTE_RE.match(lines[i]):
+                i += 1
+            kind = 'quote'
+        elif LIST_RE.match(line):
+            i += 1
+            # Éléments suivants et lignes de continuation, jusqu'à une ligne vide
+            while i < n and lines[i].strip() and not (
+                    FENCE_RE.match(lines[i]) or HEADING_RE.match(lines[i]) or HR_RE.match(lines[i])):
+                if LIST_RE.match(lines[i]) and _segment_boundary(lines[i], i - begin):
+                    break
+                i += 1
+            kind = 'list'
+        else:
+            i += 1
+            while i < n and lines[i].strip() and not _starts_block(lines[i]):
+                i += 1
+            kind = 'paragraph'
+        yield Block(begin, i, kind, '\n'.join(lines[begin:i]))
+
+
+def _safe_url(url: str) -> str:
+    return url if SAFE_URL_RE.match(html.unescape(url)) else '#'
+
+
+def _attr(escaped: str) -> str:
+    """Valeur d'attribut à partir d'un texte déjà échappé (sans double échappement)"""
+    return html.escape(html.unescape(escaped))
+
+
+def render_inline(text: str) -> str:
+    """Éléments en ligne: code, images, liens, gras, italique, barré"""
+    codes: List[str] = []
+
+    def stash(match: re.Match) -> str:
+        codes.append(f'<code>{html.escape(match.group(2).strip())}</code>')
+        return f'\x00{len(codes) - 1}\x00'
+
+    text = CODE_SPAN_RE.sub(stash, text)
+    text = html.escape(text, quote=False)
+    text = IMAGE_RE.sub(lambda m: f'<img alt="{_attr(m.group(1))}" src="{_attr(_safe_url(m.group(2)))}">', text)
+    text = LINK_RE.sub(lambda m: f'<a href="{_attr(_safe_url(m.group(2)))}">{m.group(1)}</a>', text)
+    text = STRONG_RE.sub(r'<strong>\2</strong>', text)
+    text = EM_RE.sub(r'<em>\2</em>', text)
+    text = STRIKE_RE.sub(r'<del>\1</del>', text)
+    return re.sub('\x00(\\d+)\x00', lambda m: codes[int(m.group(1))], text)
+
+
+def _render_list(lines: List[str]) -> str:
+    items: List[List[str]] = []
+    marker = LIST_RE.match(lines[0]).group(2)
+    ordered = marker[0] not in '-*+'
+    for line in lines:
+        item = LIST_RE.match(line)
+        if item:
+            items.append([item.group(3)])
+        else:
+            items[-1].append(line.strip())
+    parts = []
+    for item in items:
+        text = ' '.join(item)
+        task = TASK_RE.match(text)
+        if task:
+            checked = ' checked' if task.group(1) in 'xX' else ''
+            parts.append(f'<li class="task"><input type="checkbox" disabled{checked}> {render_inline(task.group(2))}</li>')
+        else:
+            parts.append(f'<li>{render_inline(text)}</li>')
+    if not ordered:
+        return f'<ul>{"".join(parts)}</ul>'
+    # Un segment de suite reprend la numérotation écrite dans le source
+    number = int(marker[:-1])
+    start = f' start="{number}"' if number != 1 else ''
+    return f'<ol{start}>{"".join(parts)}</ol>'
+
+
+def render_block(block: Block) -> str:
+    """HTML d'un bloc: toujours un seul élément racine (un bloc = un nœud du DOM)"""
+    lines = block.source.split('\n')
+    if block.kind == 'code':
+        classes = []
+        if block.fence is None:
+            opening = FENCE_RE.match(lines[0])
+            marker, body = opening.group(1), lines[1:]
+            language = opening.group(2).strip().split(' ')[0]
+            if language:
+                classes.append(f'language-{html.escape(language)}')
+        else:
+            marker, body = block.fence, lines
+            classes.append('cont')  # Segment de suite: collé au précédent
+        if block.carry is not None:
+            classes.append('open')
+        elif body and _closes_fence(body[-1], marker):
+            body = body[:-1]
+        css = f' class="{" ".join(classes)}"' if classes else ''
+        return f'<pre{css}><code>{html.escape(chr(10).join(body))}</code></pre>'
+    if block.kind == 'heading':
+        match = HEADING_RE.match(lines[0])
+        level = len(match.group(1))
+        return f'<h{level}>{render_inline(match.group(2) or "")}</h{level}>'
+    if block.kind == 'hr':
+        return '<hr>'
+    if block.kind == 'quote':
+        inner = [QUOTE_RE.match(line).group(1) for line in lines]
+        body = ''.join(render_block(b) for b in parse_blocks(inner))
+        return f'<blockquote>{body}</blockquote>'
+    if block.kind == 'list':
+        return _render_list(lines)
+    return f'<p>{render_inline(" ".join(line.strip() for line in lines))}</p>'
+
+
+def _same(a: Block, b: Block) -> bool:
+    """Même rendu garanti: même source, même type, même état de code"""
+    return a.source == b.source and a.kind == b.kind and a.fence == b.fence and a.carry == b.carry
+
+
+class MarkdownDocument:
+    """Document Markdown découpé en blocs, mis à jour de façon incrémentale
+
+    Une modification remplace des lignes entières; seuls les blocs qui les
+    touchent (plus le précédent, qui peut fusionner) sont réanalysés, puis
+    l'analyse avance jusqu'à retomber sur une frontière de bloc inchangée.
+    Les blocs dont le source n'a pas changé gardent leur HTML.
+    """
+
+    def __init__(self, text: str = '') -> None:
+        self.lines: List[str] = text.split('\n')
+        self.blocks: List[Block] = list(parse_blocks(self.lines))
+
+    def html_blocks(self) -> List[str]:
+        return [self._html(block) for block in self.blocks]
+
+    @staticmethod
+    def _html(block: Block) -> str:
+        if block.html is None:
+            block.html = render_block(block)
+        return block.html
+
+    def reset(self, text: str) -> Patch:
+        removed = len(self.blocks)
+        self.__init__(text)
+        return 0, removed, self.html_blocks()
+
+    def apply_edit(self, first: int, removed: int, new_lines: List[str]) -> Optional[Patch]:
+        """Remplace les lignes [first, first + removed) et retourne le patch du rendu"""
+        old = self.blocks
+        delta = len(new_lines) - removed
+        self.lines[first:first + removed] = new_lines
+        edit_end = first + len(new_lines)
+
+        # Le bloc précédent peut absorber la modification (paragraphe, liste)
+        k = max(0, bisect_right(old, first, key=lambda b: b.end) - 1)
+        if old and old[k].start <= first:
+            start_line, fence = old[k].start, old[k].fence
+        else:
+            start_line, fence = first, None  # Lignes vides avant le premier bloc
+        j = max(k, bisect_left(old, first + removed, key=lambda b: b.start))
+
+        fresh: List[Block] = []
+        for block in parse_blocks(self.lines, start_line, fence):
+            if block.start >= edit_end:
+                while j < len(old) and old[j].start + delta < block.start:
+                    j += 1
+                if j < len(old) and old[j].start + delta == block.start and old[j].fence == block.fence:
+                    break  # Resynchronisé: la suite du document est inchangée
+            fresh.append(block)
+        else:
+            j = len(old)
+
+        for block in old[j:]:
+            block.start += delta
+            block.end += delta
+
+        # Les blocs identiques en tête et en queue gardent leur rendu et leur nœud
+        replaced = old[k:j]
+        head = 0
+        while head < min(len(fresh), len(replaced)) and _same(fresh[head], replaced[head]):
+            fresh[head].html = replaced[head].html
+            head += 1
+        tail = 0
+        while tail < min(len(fresh), len(replaced)) - head \
+                and _same(fresh[-1 - tail], replaced[-1 - tail]):
+            fresh[-1 - tail].html = replaced[-1 - tail].html
+            tail += 1
+
+        self.blocks[k:j] = fresh
+        changed = fresh[head:len(fresh) - tail]
+        remove = len(replaced) - head - tail
+        if not changed and not remove:
+            return None
+        return k + head, remove, [self._html(block) for block in changed]
+
+
+def _benchmark(size: int = 1024 * 1024, edits: int = 2000) -> None:
+    """Latence d'une frappe sur un document de `size` octets (analyse + rendu)"""
+    import random
+    import time
+
+    chunk = ('# Titre de section\n\nUn paragraphe avec du **gras**, de l\'*italique* et un '
+             '[lien](https://ordo.local).\nSuite du paragraphe sur une seconde ligne.\n\n'
+             '- élément un\n- [x] tâche faite\n- élément `code`\n\n'
+             '```python\nprint("bonjour")\n```\n\n> citation\n> sur deux lignes\n\n')
+    text = chunk * (size // len(chunk) + 1)
+    started = time.perf_counter()
+    document = MarkdownDocument(text[:size])
+    document.html_blocks()
+    print(f"Rendu initial: {len(document.blocks)} blocs en {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    rng = random.Random(0)
+    timings = []
+    for _ in range(edits):
+        line = rng.randrange(len(document.lines))
+        current = document.lines[line]
+        col = rng.randrange(len(current) + 1)
+        roll = rng.random()
+        started = time.perf_counter()
+        if roll < 0.9:
+            document.apply_edit(line, 1, [current[:col] + rng.choice('abc *#`') + current[col:]])
+        elif roll < 0.95:
+            document.apply_edit(line, 1, [current[:col], current[col:]])  # Entrée
+        elif line + 1 < len(document.lines):
+            document.apply_edit(line, 2, [current + document.lines[line + 1]])  # Retour arrière
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[int(len(timings) * 0.99)] * 1000
+    print(f"{edits} frappes: p50 {p50:.2f} ms, p99 {p99:.2f} ms (budget d'une image: 16.7 ms)")
+
+    # Contrôle: l'état incrémental doit égaler une analyse complète
+    reference = [render_block(b) for b in parse_blocks(document.lines)]
+    assert reference == document.html_blocks(), "état incrémental divergent"
+
+
+if __name__ == '__main__':
+    _benchmark()
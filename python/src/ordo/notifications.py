@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QFrame, QLabel, QVBoxLayout, QWidget
+
+
+class NotificationToast(QFrame):
+    """Notification du bureau, dans le coin inférieur droit de la zone MDI
+
+    Les messages arrivés pendant l'affichage s'ajoutent à la liste; un clic
+    déclenche l'action du dernier message (ex: ouvrir l'app concernée).
+    """
+
+    DISPLAY_MS = 8000
+    WIDTH = 320
+    MARGIN = 12
+    MAX_LINES = 3
+
+    def __init__(self, area: QWidget) -> None:
+        super().__init__(area)
+        self.setObjectName('notification')
+        self.setFixedWidth(self.WIDTH)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 8, 10, 8)
+        self.title = QLabel()
+        self.title.setObjectName('notificationTitle')
+        self.body = QLabel()
+        self.body.setWordWrap(True)
+        layout.addWidget(self.title)
+        layout.addWidget(self.body)
+        self._lines: List[str] = []
+        self._action: Optional[Callable[[], None]] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.hide)
+        area.installEventFilter(self)
+        self.hide()
+
+    def notify(self, title: str, message: str, action: Optional[Callable[[], None]] = None) -> None:
+        if not self.isVisible() or title != self.title.text():
+            self._lines = []
+        self._lines.append(message)
+        extra = len(self._lines) - self.MAX_LINES
+        lines = self._lines[-self.MAX_LINES:] + ([f'(+{extra} autres)'] if extra > 0 else [])
+        self.title.setText(title)
+        self.body.setText('\n'.join(lines))
+        self._action = action
+        self.adjustSize()
+        self._place()
+        self.show()
+        self.raise_()
+        self._timer.start(self.DISPLAY_MS)
+
+    def _place(self) -> None:
+        area = self.parentWidget()
+        self.move(area.width() - self.width() - self.MARGIN, area.height() - self.height() - self.MARGIN)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if obj is self.parentWidget() and event.type() == QEvent.Resize and self.isVisible():
+            self._place()
+        return super().eventFilter(obj, event)
+
+    def mousePressEvent(self, event) -> None:
+        self.hide()
+        if self._action is not None:
+            self._action()
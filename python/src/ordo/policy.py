@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject, QTimer, QUrl
+from PySide6.QtWidgets import QMdiSubWindow
+from PySide6.QtWebEngineCore import (
+    QWebEnginePage, QWebEngineProfile, QWebEngineScript, QWebEngineSettings, QWebEngineUrlRequestInfo,
+    QWebEngineUrlRequestInterceptor
+)
+from PySide6.QtWebEngineWidgets import QWebEngineView
+
+from .blocklist import Blocklist, host_suffixes, load_blocklist
+from .hud import process_rss
+from .routing import BLOCK, CACHED_RESOURCE_TYPES, route_subresource, upstream_url
+from .scheduler import shared_scheduler
+
+BACKGROUND_MODES = ('run', 'freeze', 'discard')
+IMAGE_MODES = ('eager', 'lazy', 'none')
+LOCAL_SCHEMES = {'ordo', 'data', 'blob', 'about', 'qrc', 'file'}
+PROXY_ENV = 'ORDO_PROXY_ADDR'  # Proxy cache du serveur local (ex: 127.0.0.1:8000)
+
+# Chargement différé des images et iframes sans attribut `loading` explicite
+LAZY_IMAGES_SCRIPT = """
+(function () {
+    function lazy(el) {
+        if ((el.tagName === 'IMG' || el.tagName === 'IFRAME') && !el.hasAttribute('loading')) {
+            el.loading = 'lazy';
+        }
+    }
+    new MutationObserver(function (records) {
+        records.forEach(function (record) {
+            record.addedNodes.forEach(function (node) {
+                if (node.nodeType !== 1) return;
+                lazy(node);
+                node.querySelectorAll('img:not([loading]), iframe:not([loading])').forEach(lazy);
+            });
+        });
+    }).observe(document, { childList: true, subtree: true });
+})();
+"""
+
+
+@dataclass(frozen=True)
+class AppPolicy:
+    """Politique de ressources d'une app (bloc `policy:` de apps.yaml)
+
+    Sans bloc `policy`, l'app n'a aucune limite (cas des apps locales).
+    `network` vaut None (tout est permis) ou la liste des domaines autorisés.
+    `blocklist` active la liste de blocage partagée; `blocklist_allow` en
+    exempte des domaines pour cette app (ex: un lecteur vidéo tiers).
+    """
+    max_memory_mb: Optional[int] = None
+    background: str = 'run'  # 'run' | 'freeze' | 'discard'
+    network: Optional[Tuple[str, ...]] = None
+    javascript: bool = True
+    autoplay: bool = True
+    images: str = 'eager'  # 'eager' | 'lazy' | 'none'
+    blocklist: bool = True
+    blocklist_allow: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, data: Optional[dict], app_id: str) -> 'AppPolicy':
+        if not data:
+            return cls()
+        background = data.get('background', 'run')
+        if background not in BACKGROUND_MODES:
+            print(f"Politique invalide pour '{app_id}': background={background!r}, 'run' utilisé")
+            background = 'run'
+        images = data.get('images', 'eager')
+        if images not in IMAGE_MODES:
+            print(f"Politique invalide pour '{app_id}': images={images!r}, 'eager' utilisé")
+            images = 'eager'
+        network = data.get('network')
+        max_memory = data.get('max_memory_mb')
+        return cls(
+            max_memory_mb=int(max_memory) if max_memory else None,
+            background=background,
+            network=tuple(d.lower().lstrip('.') for d in network) if network is not None else None,
+            javascript=bool(data.get('javascript', True)),
+            autoplay=bool(data.get('autoplay', True)),
+            images=images,
+            blocklist=bool(data.get('blocklist', True)),
+            blocklist_allow=tuple(d.lower().lstrip('.') for d in data.get('blocklist_allow', ())),
+        )
+
+    def allows_host(self, host: str) -> bool:
+        if self.network is None:
+            return True
+        host = host.lower()
+        return any(host == domain or host.endswith('.' + domain) for domain in self.network)
+
+
+class PolicyReporter:
+    """Télémétrie des violations de politique (~/.ordo_logs/policy.jsonl)
+
+    Chaque violation est comptée; seule la première occurrence d'un même
+    (app, type, détail) est écrite, pour qu'une page bavarde ne remplisse pas
+    le disque. Appelé aussi depuis le thread réseau de WebEngine.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path.home() / '.ordo_logs' / 'policy.jsonl'
+        self.counts: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def report(self, app_id: str, kind: str, detail: str, **extra) -> None:
+        key = (app_id, kind, detail)
+        with self._lock:
+            seen = self.counts.get(key, 0)
+            self.counts[key] = seen + 1
+            if seen:
+                return
+            record = {'ts': time.time(), 'app': app_id, 'violation': kind, 'detail': detail, **extra}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            except OSError as e:
+                print(f"Télémétrie de politique non écrite: {e}")
+
+
+class NetworkPolicyInterceptor(QWebEngineUrlRequestInterceptor):
+    """Bloque les requêtes d'une page vers des domaines non autorisés
+
+    Une sous-ressource redirigée vers le proxy cache est jugée sur son URL
+    d'origine, pas sur l'adresse du serveur local.
+    """
+
+    def __init__(self, app_id: str, policy: AppPolicy, reporter: PolicyReporter, parent=None) -> None:
+        super().__init__(parent)
+        self.app_id = app_id
+        self.policy = policy
+        self.reporter = reporter
+        self.proxy_base = proxy_base_url()
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo) -> None:
+        url = info.requestUrl()
+        upstream = upstream_url(bytes(url.toEncoded()).decode('ascii'), self.proxy_base)
+        if upstream is not None:
+            url = QUrl.fromEncoded(upstream.encode('ascii'))
+        if url.scheme() in LOCAL_SCHEMES:
+            return
+        host = url.host()
+        if not self.policy.allows_host(host):
+            info.block(True)
+            self.reporter.report(self.app_id, 'network', host)
+
+
+def proxy_base_url() -> Optional[str]:
+    """Adresse du proxy cache du serveur local (ORDO_PROXY_ADDR), ou None"""
+    address = os.environ.get(PROXY_ENV)
+    return f'http://{address}' if address else None
+
+
+class ContentBlocker(QWebEngineUrlRequestInterceptor):
+    """Bloque les régies et traceurs pour toutes les pages du profil partagé
+
+    Installé sur le profil, il voit aussi les pages préchauffées. L'app d'une
+    requête est retrouvée par le site de premier niveau (firstPartyUrl), ce
+    qui applique ses exceptions. Les navigations de premier niveau ne sont
+    jamais bloquées: un lien suivi volontairement doit s'ouvrir.
+
+    Avec un proxy cache, les scripts, styles, images et polices https des
+    hôtes déclarés par les apps passent par son proxy inverse: un tunnel
+    CONNECT ne peut pas être mis en cache.
+    """
+
+    CACHED_TYPES = {getattr(QWebEngineUrlRequestInfo.ResourceType, name) for name in CACHED_RESOURCE_TYPES}
+
+    def __init__(self, blocklist: Optional[Blocklist], proxy_base: Optional[str] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.blocklist = blocklist
+        self.proxy_base = proxy_base
+        self._sites: Dict[str, Tuple[str, AppPolicy]] = {}
+        self._proxy_hosts: set = set()
+
+    def register(self, app_id: str, url: str, policy: AppPolicy, hosts: Tuple[str, ...] = ()) -> None:
+        host = QUrl(url).host().lower()
+        if host:
+            self._sites[host[4:] if host.startswith('www.') else host] = (app_id, policy)
+            self._proxy_hosts.add(host)
+        self._proxy_hosts.update(h.lower() for h in hosts)
+        self._proxy_hosts.update(policy.network or ())
+
+    def _proxied(self, host: str) -> bool:
+        return any(suffix in self._proxy_hosts for suffix in host_suffixes(host))
+
+    def _app_for(self, first_party: str) -> Tuple[str, Optional[AppPolicy]]:
+        for suffix in host_suffixes(first_party):
+            site = self._sites.get(suffix)
+            if site is not None:
+                return site
+        return first_party or 'web', None
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo) -> None:
+        url = info.requestUrl()
+        if url.scheme() in LOCAL_SCHEMES:
+            return
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return
+        app_id, policy = self._app_for(info.firstPartyUrl().host())
+        blocking = policy is None or policy.blocklist
+        route = route_subresource(
+            bytes(url.toEncoded()).decode('ascii'), app_id, bytes(info.requestMethod()).decode('ascii'),
+            info.resourceType() in self.CACHED_TYPES,
+            blocklist=self.blocklist if blocking else None,
+            allow=policy.blocklist_allow if policy is not None else (),
+            proxy_base=self.proxy_base, proxied=self._proxied)
+        if route == BLOCK:
+            info.block(True)
+        elif route is not None:
+            info.redirect(QUrl(route))
+
+
+def install_content_blocker(apps, profile: Optional[QWebEngineProfile] = None, parent=None,
+                            proxy_base: Optional[str] = None) -> Optional[ContentBlocker]:
+    """Installe la liste compilée et la redirection vers le proxy cache sur le profil
+
+    Retourne None si ni l'une ni l'autre n'est active.
+    """
+    blocklist = load_blocklist()
+    if blocklist is None and proxy_base is None:
+        return None
+    blocker = ContentBlocker(blocklist, proxy_base, parent)
+    for app in apps:
+        if app.url:
+            hosts = tuple(QUrl(u).host() for u in app.preconnect + app.prefetch if QUrl(u).host())
+            blocker.register(app.id, app.url, app.policy, hosts)
+    (profile or QWebEngineProfile.defaultProfile()).setUrlRequestInterceptor(blocker)
+    return blocker
+
+
+class PolicyEnforcer(QObject):
+    """Applique les politiques de apps.yaml aux vues web du bureau
+
+    Les réglages (JavaScript, lecture automatique, images, réseau) sont posés
+    à la création de la vue. Une sous-fenêtre réduite passe, après un court
+    délai, à l'état de cycle de vie Frozen ou Discarded; la mémoire des
+    processus de rendu est contrôlée périodiquement. Un dépassement est
+    toujours signalé, et l'app est déchargée si elle n'est pas visible.
+    """
+
+    BACKGROUND_GRACE_MS = 5000
+    MEMORY_CHECK_PERIOD = 10.0
+
+    def __init__(self, reporter: Optional[PolicyReporter] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.reporter = reporter or PolicyReporter()
+        self._watched: Dict[QMdiSubWindow, Tuple[str, AppPolicy]] = {}
+        self._pending: Dict[QMdiSubWindow, QTimer] = {}
+        self._memory_tick = None
+
+    def apply(self, view: QWebEngineView, app_id: str, policy: AppPolicy) -> None:
+        """Réglages de la page, avant le premier chargement"""
+        page = view.page()
+        settings = page.settings()
+        settings.setAttribute(QWebEngineSettings.JavascriptEnabled, policy.javascript)
+        settings.setAttribute(QWebEngineSettings.PlaybackRequiresUserGesture, not policy.autoplay)
+        settings.setAttribute(QWebEngineSettings.AutoLoadImages, policy.images != 'none')
+        if policy.images == 'lazy':
+            script = QWebEngineScript()
+            script.setName('ordo-lazy-images')
+            script.setSourceCode(LAZY_IMAGES_SCRIPT)
+            script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+            script.setWorldId(QWebEngineScript.ApplicationWorld)
+            script.setRunsOnSubFrames(True)
+            page.scripts().insert(script)
+        if policy.network is not None:
+            # L'intercepteur appartient à la page (non possédé par WebEngine)
+            page.setUrlRequestInterceptor(NetworkPolicyInterceptor(app_id, policy, self.reporter, page))
+
+    def watch(self, sub: QMdiSubWindow, app_id: str, policy: AppPolicy) -> None:
+        """Suivi de l'arrière-plan et de la mémoire d'une sous-fenêtre"""
+        if policy.background == 'run' and policy.max_memory_mb is None:
+            return
+        self._watched[sub] = (app_id, policy)
+        sub.installEventFilter(self)
+        sub.destroyed.connect(lambda *_, s=sub: self._forget(s))
+        if policy.max_memory_mb is not None and self._memory_tick is None:
+            self._memory_tick = shared_scheduler().subscribe(self._check_memory, self.MEMORY_CHECK_PERIOD)
+
+    def _forget(self, sub: QMdiSubWindow) -> None:
+        self._watched.pop(sub, None)
+        timer = self._pending.pop(sub, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        if self._memory_tick is not None and not any(
+                policy.max_memory_mb is not None for _, policy in self._watched.values()):
+            shared_scheduler().unsubscribe(self._memory_tick)
+            self._memory_tick = None
+
+    @staticmethod
+    def _page(sub: QMdiSubWindow) -> Optional[QWebEnginePage]:
+        widget = sub.widget()
+        return widget.page() if isinstance(widget, QWebEngineView) else None
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.WindowStateChange and obj in self._watched:
+            if obj.isMinimized():
+                self._schedule_background(obj)
+            else:
+                self._foreground(obj)
+        return super().eventFilter(obj, event)
+
+    def _schedule_background(self, sub: QMdiSubWindow) -> None:
+        _, policy = self._watched[sub]
+        if policy.background == 'run' or sub in self._pending:
+            return
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda s=sub: self._background(s))
+        timer.start(self.BACKGROUND_GRACE_MS)
+        self._pending[sub] = timer
+
+    def _background(self, sub: QMdiSubWindow) -> None:
+        timer = self._pending.pop(sub, None)
+        if timer is not None:
+            timer.deleteLater()
+        page = self._page(sub)
+        if page is None or sub not in self._watched or not sub.isMinimized():
+            return
+        _, policy = self._watched[sub]
+        state = (QWebEnginePage.LifecycleState.Discarded if policy.background == 'discard'
+                 else QWebEnginePage.LifecycleState.Frozen)
+        page.setLifecycleState(state)
+
+    def _foreground(self, sub: QMdiSubWindow) -> None:
+        timer = self._pending.pop(sub, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        page = self._page(sub)
+        if page is not None and page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
+    def _check_memory(self) -> None:
+        for sub, (app_id, policy) in list(self._watched.items()):
+            if policy.max_memory_mb is None:
+                continue
+            page = self._page(sub)
+            if page is None:
+                continue
+            pid = page.renderProcessPid()
+            rss = process_rss(pid) if pid > 0 else None
+            if rss is None or rss <= policy.max_memory_mb * 1024 * 1024:
+                continue
+            self.reporter.report(app_id, 'memory', f'> {policy.max_memory_mb} Mo', rss=rss, pid=pid)
+            if not sub.widget().isVisible():
+                page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
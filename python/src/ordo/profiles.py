@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CLI_OPTION = '--perf-profile'
+ENV_VARIABLE = 'ORDO_PERF_PROFILE'
+DEFAULT_PROFILE = 'desktop'
+STARTUP_LOG = Path.home() / '.ordo_logs' / 'startup.jsonl'
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """Réglages WebEngine nommés, adaptés à une classe de matériel"""
+    name: str
+    description: str
+    chromium_flags: Tuple[str, ...] = ()
+    http_cache_bytes: int = 0  # 0 = taille par défaut de Chromium
+
+
+PROFILES: Dict[str, PerformanceProfile] = {
+    'desktop': PerformanceProfile(
+        name='desktop',
+        description="Valeurs par défaut de WebEngine (un processus de rendu par site)",
+    ),
+    'balanced': PerformanceProfile(
+        name='balanced',
+        description="Cartes de 4 Go: moins de processus, pas de réseau d'arrière-plan",
+        chromium_flags=(
+            '--renderer-process-limit=4',
+            '--disable-background-networking',
+            '--js-flags=--max-old-space-size=512',
+        ),
+        http_cache_bytes=100 * MB,
+    ),
+    'low-ram': PerformanceProfile(
+        name='low-ram',
+        description="Cartes de 1 à 2 Go sans GPU: processus par site, tas JS plafonné",
+        chromium_flags=(
+            '--process-per-site',
+            '--renderer-process-limit=2',
+            '--disable-gpu',
+            '--disable-gpu-rasterization',
+            '--disable-background-networking',
+            '--disable-features=BackForwardCache',
+            '--js-flags=--max-old-space-size=192,--lite-mode',
+        ),
+        http_cache_bytes=32 * MB,
+    ),
+    'minimal': PerformanceProfile(
+        name='minimal',
+        description="Un seul processus: mémoire minimale, un onglet planté emporte tout",
+        chromium_flags=(
+            '--single-process',
+            '--disable-gpu',
+            '--disable-background-networking',
+            '--disable-features=BackForwardCache',
+            '--js-flags=--max-old-space-size=128,--lite-mode',
+        ),
+        http_cache_bytes=16 * MB,
+    ),
+}
+
+
+# Drapeaux dont la valeur est une liste séparée par des virgules: fusionnés
+LIST_FLAGS = ('--disable-features', '--enable-features', '--js-flags')
+
+
+def _merge_list(current: str, added: str) -> str:
+    """Union de deux listes 'a,b=1': un élément '--x=v' remplace '--x'"""
+    items = [item for item in current.split(',') if item]
+    for item in added.split(','):
+        if not item:
+            continue
+        key = item.split('=', 1)[0]
+        items = [i for i in items if i.split('=', 1)[0] != key]
+        items.append(item)
+    return ','.join(items)
+
+
+def append_chromium_flags(flags: Sequence[str]) -> None:
+    """Ajoute des drapeaux à QTWEBENGINE_CHROMIUM_FLAGS (sans doublon)
+
+    Les drapeaux '--nom=valeur' remplacent une valeur déjà présente pour '--nom',
+    sauf ceux de LIST_FLAGS dont les listes sont fusionnées. Qt découpe la
+    variable sur les espaces: aucune valeur ne doit en contenir.
+    """
+    current: Dict[str, Optional[str]] = {}
+    for flag in os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', '').split() + list(flags):
+        name, sep, value = flag.partition('=')
+        if not sep:
+            current[name] = None
+        elif name in LIST_FLAGS and current.get(name):
+            current[name] = _merge_list(current[name], value)
+        else:
+            current.pop(name, None)
+            current[name] = value
+    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = ' '.join(
+        name if value is None else f'{name}={value}' for name, value in current.items())
+
+
+def select_profile(argv: Sequence[str], configured: Optional[str] = None) -> Tuple[PerformanceProfile, List[str]]:
+    """Choisit le profil: ligne de commande, puis variable d'environnement, puis configuration
+
+    Retourne le profil et les arguments restants (sans l'option du profil).
+    """
+    remaining: List[str] = []
+    chosen: Optional[str] = None
+    args = list(argv)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == CLI_OPTION and i + 1 < len(args):
+            chosen = args[i + 1]
+            i += 2
+            continue
+        if arg.startswith(CLI_OPTION + '='):
+            chosen = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+        i += 1
+
+    name = chosen or os.environ.get(ENV_VARIABLE) or configured or DEFAULT_PROFILE
+    profile = PROFILES.get(name)
+    if profile is None:
+        print(f"Profil de performance inconnu '{name}', utilisation de '{DEFAULT_PROFILE}'")
+        profile = PROFILES[DEFAULT_PROFILE]
+    return profile, remaining
+
+
+def apply_profile(profile: PerformanceProfile) -> None:
+    """Pose les drapeaux Chromium du profil (avant la création de QApplication)"""
+    append_chromium_flags(profile.chromium_flags)
+
+
+def report_startup(profile: PerformanceProfile, app_name: str) -> None:
+    """Télémétrie de démarrage: profil actif et drapeaux effectivement passés"""
+    record = {
+        'ts': time.time(),
+        'app': app_name,
+        'pid': os.getpid(),
+        'platform': platform.platform(),
+        'profile': asdict(profile),
+        'effective_flags': os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', ''),
+    }
+    print(f"[{app_name}] Profil de performance: {profile.name} ({profile.description})")
+    try:
+        STARTUP_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(STARTUP_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError as e:
+        print(f"Télémétrie de démarrage non écrite: {e}")
+
+
+# --- Mesure ----------------------------------------------------------------
+
+PROBE_OPTION = '--probe'
+
+
+def _probe(name: str, url: str) -> None:
+    """Processus de mesure: applique le profil, charge `url` et attend
+
+    Imprime la durée de chargement (JSON sur une ligne) puis garde les
+    processus de rendu en vie jusqu'à ce que le parent le termine.
+    """
+    profile = PROFILES[name]
+    apply_profile(profile)
+    from PySide6.QtCore import QUrl
+    from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication([sys.argv[0]])
+    web_profile = QWebEngineProfile.defaultProfile()
+    if profile.http_cache_bytes:
+        web_profile.setHttpCacheMaximumSize(profile.http_cache_bytes)
+    page = QWebEnginePage(web_profile)
+    started = time.perf_counter()
+
+    def finished(ok: bool) -> None:
+        print(json.dumps({'ok': ok, 'load_ms': (time.perf_counter() - started) * 1000}), flush=True)
+
+    page.loadFinished.connect(finished)
+    page.load(QUrl(url))
+    app.exec()
+
+
+def _benchmark(urls: Sequence[str] = (), runs: int = 3, settle: float = 3.0) -> None:
+    """Mémoire et durée de chargement d'une page pour chaque profil
+
+    Chaque mesure est un processus neuf (plateforme offscreen): les drapeaux
+    Chromium ne s'appliquent qu'au démarrage. La mémoire est celle de tout
+    l'arbre de processus, `settle` secondes après la fin du chargement;
+    on garde la médiane de `runs` essais.
+    """
+    from .displays import tree_memory
+
+    root = Path(__file__).resolve().parents[3]
+    urls = list(urls) or [(root / 'index.html').as_uri(), (root / 'ordo-desktop-poc.html').as_uri()]
+    env = {**os.environ, 'QT_QPA_PLATFORM': 'offscreen'}
+    env.pop('QTWEBENGINE_CHROMIUM_FLAGS', None)
+
+    def measure(name: str, url: str) -> Tuple[Optional[float], Optional[int]]:
+        process = subprocess.Popen([sys.executable, '-m', __spec__.name, PROBE_OPTION, name, url],
+                                   env=env, stdout=subprocess.PIPE, text=True)
+        try:
+            line = process.stdout.readline()
+            if not line:
+                return None, None
+            result = json.loads(line)
+            time.sleep(settle)
+            return (result['load_ms'] if result['ok'] else None), tree_memory(process.pid)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    for url in urls:
+        print(url)
+        for name in PROFILES:
+            samples = [measure(name, url) for _ in range(runs)]
+            loads = [load for load, _ in samples if load is not None]
+            sizes = [size for _, size in samples if size is not None]
+            if not loads:
+                print(f"  {name:<9} échec du chargement (PySide6 WebEngine requis)")
+                continue
+            memory = f'{statistics.median(sizes) / MB:.0f} Mo' if sizes else '? (psutil requis)'
+            print(f"  {name:<9} chargement {statistics.median(loads):6.0f} ms, mémoire {memory}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == PROBE_OPTION:
+        _probe(sys.argv[2], sys.argv[3])
+    else:
+        _benchmark(sys.argv[1:])
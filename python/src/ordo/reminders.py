@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+from .todos import Todo, TodoStore
+
+
+class TodoService(QObject):
+    """Tâches du processus et minuterie unique des rappels
+
+    Toutes les modifications passent par ce service: il réarme une seule
+    minuterie sur la prochaine échéance du tas (aucune scrutation) et
+    prévient les vues. `reminder` est relayé au bureau pour notification.
+    """
+
+    changed = Signal()
+    reminder = Signal(object)  # Todo
+
+    MAX_WAIT_MS = 24 * 3600 * 1000  # QTimer prend un int: au-delà, on recalcule chaque jour
+
+    def __init__(self, store: Optional[TodoStore] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.store = store or TodoStore(Path.home() / '.ordo_todos.json')
+        self.store.load()
+        self._armed_for: Optional[float] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._fire)
+        # Rappels échus pendant l'arrêt: délivrés au démarrage
+        self._rearm()
+
+    def add(self, text: str, **fields) -> Todo:
+        todo = self.store.add(text, **fields)
+        self._changed()
+        return todo
+
+    def update(self, todo_id: int, **changes) -> Todo:
+        todo = self.store.update(todo_id, **changes)
+        self._changed()
+        return todo
+
+    def toggle(self, todo_id: int) -> Todo:
+        todo = self.store.toggle(todo_id)
+        self._changed()
+        return todo
+
+    def remove(self, todo_id: int) -> None:
+        self.store.remove(todo_id)
+        self._changed()
+
+    def _changed(self) -> None:
+        self._rearm()
+        self.changed.emit()
+
+    def _rearm(self) -> None:
+        deadline = self.store.reminders.next_deadline()
+        if deadline == self._armed_for and (deadline is None or self._timer.isActive()):
+            return
+        self._armed_for = deadline
+        if deadline is None:
+            self._timer.stop()
+            return
+        delay_ms = max(0, int((deadline - time.time()) * 1000))
+        self._timer.start(min(delay_ms, self.MAX_WAIT_MS))
+
+    def _fire(self) -> None:
+        self._armed_for = None
+        due = self.store.pop_due_reminders(time.time())
+        self._rearm()
+        for todo in due:
+            self.reminder.emit(todo)
+        if due:
+            self.changed.emit()
+
+    def close(self) -> None:
+        self._timer.stop()
+        self.store.compact()
+
+
+_shared: Optional[TodoService] = None
+
+
+def shared_todos() -> TodoService:
+    """Service des tâches partagé par les fenêtres et les écrans du bureau"""
+    global _shared
+    if _shared is None:
+        app = QApplication.instance()
+        _shared = TodoService(parent=app)
+        if app is not None:
+            app.aboutToQuit.connect(_shared.close)
+    return _shared
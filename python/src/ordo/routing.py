@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, Sequence
+from urllib.parse import urlsplit
+
+REVERSE_PROXY_PREFIX = '/__ordo/proxy/'
+BLOCK = 'block'
+
+# Types de sous-ressources mises en cache par le proxy inverse (noms des
+# valeurs de QWebEngineUrlRequestInfo, communs à PySide6 et PyQt5)
+CACHED_RESOURCE_TYPES = (
+    'ResourceTypeScript',
+    'ResourceTypeStylesheet',
+    'ResourceTypeImage',
+    'ResourceTypeFontResource',
+)
+
+
+def reverse_proxy_url(base: str, url: str) -> str:
+    """URL du proxy inverse pour `url` (ex: http://127.0.0.1:8000/__ordo/proxy/https://...)"""
+    return f"{base.rstrip('/')}{REVERSE_PROXY_PREFIX}{url}"
+
+
+def upstream_url(url: str, base: Optional[str]) -> Optional[str]:
+    """URL d'origine d'une requête redirigée vers le proxy inverse, sinon None"""
+    if base is None:
+        return None
+    prefix = base.rstrip('/') + REVERSE_PROXY_PREFIX
+    return url[len(prefix):] if url.startswith(prefix) else None
+
+
+def route_subresource(url: str, site: str, method: str, cacheable: bool,
+                      blocklist=None, allow: Sequence[str] = (),
+                      proxy_base: Optional[str] = None,
+                      proxied: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+    """Décision des intercepteurs (bureau et Ordo_browser) pour une sous-ressource
+
+    Retourne BLOCK si la liste de blocage la refuse pour `site`, l'URL du
+    proxy inverse si c'est une ressource https cachable d'un hôte `proxied`,
+    sinon None (requête inchangée). Les navigations de premier niveau ne
+    passent pas par ici.
+    """
+    host = urlsplit(url).hostname or ''
+    if blocklist is not None and blocklist.check(site, host, allow):
+        return BLOCK
+    if (proxy_base is not None and proxied is not None and cacheable and method == 'GET'
+            and url.startswith('https:') and proxied(host)):
+        return reverse_proxy_url(proxy_base, url)
+    return None
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer
+from PySide6.QtWidgets import QWidget
+
+EARLY_TOLERANCE = 0.005  # Un réveil légèrement en avance compte comme à l'heure
+
+
+class Subscription:
+    """Rappel périodique aligné sur les multiples de `period` (horloge monotone)"""
+
+    def __init__(self, callback: Callable[[], None], period: float, widget: Optional[QWidget]) -> None:
+        self.callback = callback
+        self.period = period
+        self.widget = widget
+        self.next_due = 0.0
+        self.cancelled = False
+
+    def align(self, now: float) -> None:
+        self.next_due = (math.floor(now / self.period) + 1) * self.period
+
+    @property
+    def active(self) -> bool:
+        if self.cancelled:
+            return False
+        if self.widget is None:
+            return True
+        window = self.widget.window()
+        return self.widget.isVisible() and not (window and window.isMinimized())
+
+
+class TickScheduler(QObject):
+    """Horloge centrale du bureau: un seul timer pour tous les consommateurs
+
+    Les rappels périodiques sont alignés sur des frontières communes (un rappel
+    à 1 s et un à 60 s se réveillent ensemble), ceux dont le widget est masqué
+    ou minimisé sont suspendus, et les échéances ponctuelles (fin de minuteur)
+    tombent à l'heure exacte. Le timer est arrêté quand plus rien n'est dû.
+
+    `destroyed` n'est connecté qu'une fois par widget ou propriétaire: ses
+    abonnements et échéances sont suivis dans des dictionnaires (clé id()),
+    et des abonnements répétés n'accumulent ni connexions ni fermetures.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.wakeups = 0
+        self._subs: List[Subscription] = []
+        self._deadlines: List[Tuple[float, int, Callable[[], None]]] = []
+        self._cancelled_deadlines = set()
+        self._widget_subs: Dict[int, List[Subscription]] = {}
+        self._owner_tokens: Dict[int, Set[int]] = {}
+        self._token_owner: Dict[int, int] = {}
+        self._counter = itertools.count()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_wakeup)
+
+    def subscribe(self, callback: Callable[[], None], period: float = 1.0,
+                  widget: Optional[QWidget] = None) -> Subscription:
+        sub = Subscription(callback, period, widget)
+        sub.align(time.monotonic())
+        self._subs.append(sub)
+        if widget is not None:
+            key = id(widget)
+            subs = self._widget_subs.get(key)
+            if subs is None:
+                subs = self._widget_subs[key] = []
+                # Un widget détruit sans fermeture (sous-fenêtre fermée) libère ses rappels
+                widget.destroyed.connect(lambda *_, k=key: self._drop_widget(k))
+            if not subs:
+                widget.installEventFilter(self)
+            subs.append(sub)
+        self._reschedule()
+        return sub
+
+    def _drop_widget(self, key: int) -> None:
+        for sub in self._widget_subs.pop(key, ()):
+            sub.cancelled = True
+            sub.widget = None
+            if sub in self._subs:
+                self._subs.remove(sub)
+        self._reschedule()
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        sub.cancelled = True
+        if sub in self._subs:
+            self._subs.remove(sub)
+        if sub.widget is not None:
+            subs = self._widget_subs.get(id(sub.widget))
+            if subs is not None and sub in subs:
+                subs.remove(sub)
+                if not subs:
+                    sub.widget.removeEventFilter(self)
+        self._reschedule()
+
+    def call_at(self, deadline: float, callback: Callable[[], None],
+                owner: Optional[QObject] = None) -> int:
+        """Programme `callback` à l'instant monotone `deadline`; retourne un jeton
+
+        Si `owner` est détruit avant l'échéance, le rappel est annulé.
+        """
+        token = next(self._counter)
+        heapq.heappush(self._deadlines, (deadline, token, callback))
+        if owner is not None:
+            key = id(owner)
+            tokens = self._owner_tokens.get(key)
+            if tokens is None:
+                tokens = self._owner_tokens[key] = set()
+                owner.destroyed.connect(lambda *_, k=key: self._drop_owner(k))
+            tokens.add(token)
+            self._token_owner[token] = key
+        self._reschedule()
+        return token
+
+    def _drop_owner(self, key: int) -> None:
+        for token in self._owner_tokens.pop(key, ()):
+            self._token_owner.pop(token, None)
+            self._cancelled_deadlines.add(token)
+        self._reschedule()
+
+    def _forget_token(self, token: int) -> None:
+        key = self._token_owner.pop(token, None)
+        if key is not None:
+            self._owner_tokens.get(key, set()).discard(token)
+
+    def cancel(self, token: int) -> None:
+        if any(pending == token for _, pending, _ in self._deadlines):
+            self._forget_token(token)
+            self._cancelled_deadlines.add(token)
+            self._reschedule()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        # Un consommateur redevient visible: rafraîchissement immédiat
+        if event.type() in (QEvent.Show, QEvent.Hide):
+            if event.type() == QEvent.Show:
+                now = time.monotonic()
+                for sub in list(self._widget_subs.get(id(obj), ())):
+                    sub.align(now)
+                    sub.callback()
+            self._reschedule()
+        return super().eventFilter(obj, event)
+
+    def _next_wakeup(self) -> Optional[float]:
+        while self._deadlines and self._deadlines[0][1] in self._cancelled_deadlines:
+            self._cancelled_deadlines.discard(heapq.heappop(self._deadlines)[1])
+        candidates = [sub.next_due for sub in self._subs if sub.active]
+        if self._deadlines:
+            candidates.append(self._deadlines[0][0])
+        return min(candidates) if candidates else None
+
+    def _reschedule(self) -> None:
+        wakeup = self._next_wakeup()
+        if wakeup is None:
+            self._timer.stop()
+            return
+        delay_ms = max(0, math.ceil((wakeup - time.monotonic()) * 1000))
+        self._timer.start(delay_ms)
+
+    def _on_wakeup(self) -> None:
+        self.wakeups += 1
+        now = time.monotonic() + EARLY_TOLERANCE
+
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, token, callback = heapq.heappop(self._deadlines)
+            if token in self._cancelled_deadlines:
+                self._cancelled_deadlines.discard(token)
+                continue
+            self._forget_token(token)
+            callback()
+
+        for sub in list(self._subs):
+            if not sub.active:
+                continue
+            if sub.next_due <= now:
+                sub.callback()
+                sub.align(now)
+        self._reschedule()
+
+
+_shared: Optional[TickScheduler] = None
+
+
+def shared_scheduler() -> TickScheduler:
+    """Horloge partagée par tout le processus du bureau"""
+    global _shared
+    if _shared is None:
+        _shared = TickScheduler()
+    return _shared
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import mimetypes
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PySide6.QtCore import QBuffer, QByteArray, QFile, QIODevice
+from PySide6.QtWebEngineCore import (
+    QWebEngineProfile, QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+)
+
+SCHEME = b'ordo'
+HOST = 'local'
+# Seuls les assets web sont servis (jamais .git/, python/ ni les fichiers
+# voisins): les apps et les feuilles de style et scripts qu'elles partagent
+SERVED_DIRS = ('apps', 'css', 'js')
+
+# Types MIME indispensables aux modules ES et à fetch(), indépendants du système
+MIME_OVERRIDES = {
+    '.js': 'text/javascript',
+    '.mjs': 'text/javascript',
+    '.css': 'text/css',
+    '.html': 'text/html',
+    '.json': 'application/json',
+    '.svg': 'image/svg+xml',
+    '.wasm': 'application/wasm',
+}
+
+
+def project_root() -> Path:
+    """Racine du projet (dossier parent de python/)"""
+    return Path(__file__).resolve().parents[3]
+
+
+def is_served_path(rel_path: str) -> bool:
+    """Vrai si un chemin relatif à la racine est accessible par ordo://"""
+    parts = Path(rel_path.lstrip('/')).parts
+    return len(parts) > 1 and parts[0] in SERVED_DIRS
+
+
+def to_ordo_url(rel_path: str) -> str:
+    """Construit l'URL ordo:// d'un fichier relatif à la racine du projet"""
+    return f"{SCHEME.decode()}://{HOST}/{rel_path.lstrip('/')}"
+
+
+def register_ordo_scheme() -> None:
+    """Déclare le schéma ordo:// (à appeler avant la création de QApplication)"""
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+        | QWebEngineUrlScheme.Flag.FetchApiAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class OrdoSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Sert les assets des apps locales sans passer par un socket
+
+    Seuls les dossiers SERVED_DIRS de la racine sont accessibles. Les petits
+    fichiers sont gardés dans un cache LRU borné en octets, invalidé par la
+    date de modification; les autres (vidéos, archives) sont transmis par un
+    QFile, lu au fil de la requête sans être chargé en mémoire.
+    """
+
+    def __init__(self, root: Optional[Path] = None, cache_bytes: int = 16 * 1024 * 1024, parent=None) -> None:
+        super().__init__(parent)
+        self.root = (root or project_root()).resolve()
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[Path, Tuple[int, bytes]] = OrderedDict()
+        self._cached_size = 0
+        self._lock = threading.Lock()
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob) -> None:
+        url = job.requestUrl()
+        if url.host() != HOST:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlInvalid)
+            return
+
+        path = self._resolve(url.path())
+        if path is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        try:
+            stat = path.stat()
+            data = self._read(path, stat.st_mtime_ns) if stat.st_size <= self.max_cached_file else None
+        except OSError:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        # Le périphérique appartient au job: il est libéré avec la requête
+        if data is None:
+            device = QFile(str(path), job)
+            if not device.open(QIODevice.OpenModeFlag.ReadOnly):
+                job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+                return
+        else:
+            device = QBuffer(job)
+            device.setData(QByteArray(data))
+        job.reply(self._mime_type(path), device)
+
+    @property
+    def max_cached_file(self) -> int:
+        return self.cache_bytes // 4
+
+    def _resolve(self, url_path: str) -> Optional[Path]:
+        """Résout un chemin d'URL en fichier d'un dossier servi (sans échappement)"""
+        rel_path = url_path.lstrip('/')
+        if not rel_path or rel_path.endswith('/'):
+            rel_path += 'index.html'
+        path = (self.root / rel_path).resolve()
+        if not path.is_relative_to(self.root):
+            return None
+        parts = path.relative_to(self.root).parts
+        if len(parts) < 2 or parts[0] not in SERVED_DIRS or any(p.startswith('.') for p in parts):
+            return None
+        if path.is_dir():
+            path = path / 'index.html'
+        return path
+
+    def _read(self, path: Path, mtime: int) -> bytes:
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == mtime:
+                self._cache.move_to_end(path)
+                return cached[1]
+
+        data = path.read_bytes()
+        if len(data) <= self.max_cached_file:
+            with self._lock:
+                old = self._cache.pop(path, None)
+                if old:
+                    self._cached_size -= len(old[1])
+                self._cache[path] = (mtime, data)
+                self._cached_size += len(data)
+                while self._cached_size > self.cache_bytes:
+                    _, (_, evicted) = self._cache.popitem(last=False)
+                    self._cached_size -= len(evicted)
+        return data
+
+    @staticmethod
+    def _mime_type(path: Path) -> bytes:
+        mime = MIME_OVERRIDES.get(path.suffix.lower())
+        if not mime:
+            mime = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        return mime.encode('ascii')
+
+
+def install_ordo_scheme(profile: Optional[QWebEngineProfile] = None) -> OrdoSchemeHandler:
+    """Installe le gestionnaire ordo:// sur le profil (par défaut le profil partagé)"""
+    profile = profile or QWebEngineProfile.defaultProfile()
+    handler = OrdoSchemeHandler(parent=profile)
+    profile.installUrlSchemeHandler(SCHEME, handler)
+    return handler
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import List, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+
+@dataclass
+class WindowState:
+    """État sauvegardé d'une sous-fenêtre (ordre de la liste = ordre d'empilement)"""
+    app_id: str
+    x: int
+    y: int
+    width: int
+    height: int
+    minimized: bool = False
+    url: Optional[str] = None
+    scroll_x: float = 0.0
+    scroll_y: float = 0.0
+
+
+def screen_session_root(key: str) -> Path:
+    """Dossier de session d'un écran secondaire (multi-écrans)"""
+    return Path.home() / '.ordo_session' / 'screens' / key
+
+
+class SessionStore:
+    """Persistance de la session du bureau dans le dossier utilisateur"""
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = root or Path.home() / '.ordo_session'
+        self.state_path = self.root / 'session.json'
+
+    def load(self) -> List[WindowState]:
+        if not self.state_path.exists():
+            return []
+        try:
+            data = json.loads(self.state_path.read_text(encoding='utf-8'))
+            known = {f.name for f in fields(WindowState)}
+            return [WindowState(**{k: v for k, v in w.items() if k in known}) for w in data.get('windows', [])]
+        except Exception as e:
+            print(f"Session illisible, ignorée: {e}")
+            return []
+
+    def save(self, windows: List[WindowState]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'windows': [asdict(w) for w in windows]}, ensure_ascii=False), encoding='utf-8')
+            tmp.replace(self.state_path)
+        except Exception as e:
+            print(f"Erreur sauvegarde session: {e}")
+
+    def screenshot_path(self, app_id: str) -> Path:
+        return self.root / f'{app_id}.png'
+
+    def save_screenshot(self, app_id: str, pixmap: QPixmap) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            pixmap.save(str(self.screenshot_path(app_id)), 'PNG')
+        except Exception as e:
+            print(f"Erreur capture '{app_id}': {e}")
+
+
+class PlaceholderWidget(QWidget):
+    """Aperçu léger (dernière capture + titre) affiché avant la vraie application"""
+
+    def __init__(self, state: WindowState, title: str, screenshot: Path, parent=None) -> None:
+        super().__init__(parent)
+        self.state = state
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        preview = QLabel()
+        preview.setAlignment(Qt.AlignCenter)
+        pixmap = QPixmap(str(screenshot)) if screenshot.exists() else QPixmap()
+        if pixmap.isNull():
+            preview.setText(title)
+        else:
+            preview.setPixmap(pixmap)
+        layout.addWidget(preview, 1)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import (
+    QFrame, QGridLayout, QHBoxLayout, QLabel, QMdiArea, QMdiSubWindow, QPushButton,
+    QVBoxLayout, QWidget
+)
+
+THUMBNAIL_SIZE = QSize(240, 150)
+
+
+class ThumbnailCache:
+    """Miniatures des sous-fenêtres, réduites et bornées (LRU)
+
+    Une capture n'est faite que lorsqu'une fenêtre perd le focus ou, pour la
+    fenêtre active, au plus une fois toutes les `min_interval` secondes: ouvrir
+    le sélecteur ne force jamais le rendu d'une page web en arrière-plan.
+    """
+
+    def __init__(self, max_entries: int = 32, size: QSize = THUMBNAIL_SIZE, min_interval: float = 2.0) -> None:
+        self.max_entries = max_entries
+        self.size = size
+        self.min_interval = min_interval
+        self.captures = 0
+        self._entries: 'OrderedDict[str, Tuple[QPixmap, float]]' = OrderedDict()
+
+    def put(self, key: str, pixmap: QPixmap) -> None:
+        """Range une capture pleine taille (réduite ici)"""
+        if pixmap.isNull():
+            return
+        thumb = pixmap.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._entries[key] = (thumb, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[QPixmap]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def capture(self, key: str, widget: QWidget) -> Optional[QPixmap]:
+        """Capture le widget visible et retourne la capture pleine taille"""
+        if widget is None or not widget.isVisible():
+            return None
+        pixmap = widget.grab()
+        self.captures += 1
+        self.put(key, pixmap)
+        return pixmap
+
+    def refresh(self, key: str, widget: QWidget) -> None:
+        """Recapture si la miniature est absente ou plus vieille que `min_interval`"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] >= self.min_interval:
+            self.capture(key, widget)
+
+    def load(self, key: str, path: Path) -> Optional[QPixmap]:
+        """Miniature depuis une capture disque (aperçu de session non hydraté)"""
+        if key not in self._entries and path.exists():
+            self.put(key, QPixmap(str(path)))
+        return self.get(key)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class WindowList(QWidget):
+    """Liste des fenêtres ouvertes dans la barre des tâches"""
+
+    def __init__(self, mdi: QMdiArea, parent=None) -> None:
+        super().__init__(parent)
+        self.mdi = mdi
+        self._buttons: Dict[QMdiSubWindow, QPushButton] = {}
+        self._layout = QHBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(2)
+        self._layout.addStretch()
+        mdi.subWindowActivated.connect(self._on_activated)
+
+    def add(self, sub: QMdiSubWindow) -> None:
+        button = QPushButton(sub.windowTitle())
+        button.setObjectName('taskButton')
+        button.setCheckable(True)
+        button.clicked.connect(lambda *_, s=sub: self._on_clicked(s))
+        sub.windowTitleChanged.connect(button.setText)
+        sub.destroyed.connect(lambda *_, s=sub: self._remove(s))
+        self._layout.insertWidget(self._layout.count() - 1, button)
+        self._buttons[sub] = button
+
+    def _remove(self, sub: QMdiSubWindow) -> None:
+        button = self._buttons.pop(sub, None)
+        if button is not None:
+            button.deleteLater()
+
+    def _on_clicked(self, sub: QMdiSubWindow) -> None:
+        # Clic sur la fenêtre active: on la réduit, sinon on l'active
+        if sub is self.mdi.activeSubWindow() and not sub.isMinimized():
+            sub.showMinimized()
+            self._buttons[sub].setChecked(False)
+        else:
+            activate_subwindow(self.mdi, sub)
+
+    def _on_activated(self, sub: Optional[QMdiSubWindow]) -> None:
+        for window, button in self._buttons.items():
+            button.setChecked(window is sub)
+
+
+def activate_subwindow(mdi: QMdiArea, sub: QMdiSubWindow) -> None:
+    if sub.isMinimized():
+        sub.showNormal()
+    mdi.setActiveSubWindow(sub)
+
+
+class TaskSwitcher(QFrame):
+    """Sélecteur Alt+Tab: miniatures en cache, ordre d'activation récent
+
+    Tab (ou Maj+Tab) déplace la sélection tant que Alt est maintenu; relâcher
+    Alt active la fenêtre choisie, Échap annule.
+    """
+
+    COLUMNS = 5
+
+    def __init__(self, mdi: QMdiArea, thumbnails: ThumbnailCache,
+                 thumbnail_for: Callable[[QMdiSubWindow], Optional[QPixmap]], parent=None) -> None:
+        super().__init__(parent, Qt.Popup | Qt.FramelessWindowHint)
+        self.setObjectName('taskSwitcher')
+        self.mdi = mdi
+        self.thumbnails = thumbnails
+        self.thumbnail_for = thumbnail_for
+        self.last_open_ms = 0.0
+        self._windows: List[QMdiSubWindow] = []
+        self._tiles: List[QFrame] = []
+        self._index = 0
+        self._grid = QGridLayout(self)
+        self._grid.setContentsMargins(8, 8, 8, 8)
+        self._grid.setSpacing(8)
+
+    def open(self, step: int = 1) -> None:
+        """Affiche le sélecteur sur la fenêtre suivante (ou précédente)"""
+        if self.isVisible():
+            self.advance(step)
+            return
+        started = time.perf_counter()
+        # Plus récemment activée en premier
+        self._windows = list(reversed(self.mdi.subWindowList(QMdiArea.ActivationHistoryOrder)))
+        if len(self._windows) < 2:
+            return
+        self._build_tiles()
+        self._index = step % len(self._windows)
+        self._highlight()
+        self.adjustSize()
+        area = self.mdi.viewport()
+        center = area.mapToGlobal(area.rect().center())
+        self.move(center.x() - self.width() // 2, center.y() - self.height() // 2)
+        self.show()
+        self.setFocus()
+        self.last_open_ms = (time.perf_counter() - started) * 1000
+
+    def _build_tiles(self) -> None:
+        for tile in self._tiles:
+            self._grid.removeWidget(tile)
+            tile.deleteLater()
+        self._tiles = []
+        for position, sub in enumerate(self._windows):
+            tile = QFrame()
+            tile.setObjectName('switcherTile')
+            layout = QVBoxLayout(tile)
+            layout.setContentsMargins(4, 4, 4, 4)
+            preview = QLabel()
+            preview.setAlignment(Qt.AlignCenter)
+            preview.setFixedSize(self.thumbnails.size)
+            pixmap = self.thumbnail_for(sub)
+            if pixmap is None:
+                preview.setText(sub.windowTitle())
+            else:
+                preview.setPixmap(pixmap)
+            title = QLabel(sub.windowTitle())
+            title.setAlignment(Qt.AlignCenter)
+            layout.addWidget(preview)
+            layout.addWidget(title)
+            self._grid.addWidget(tile, *divmod(position, self.COLUMNS))
+            self._tiles.append(tile)
+
+    def _highlight(self) -> None:
+        for position, tile in enumerate(self._tiles):
+            tile.setProperty('selected', position == self._index)
+            tile.style().unpolish(tile)
+            tile.style().polish(tile)
+
+    def advance(self, step: int) -> None:
+        if self._windows:
+            self._index = (self._index + step) % len(self._windows)
+            self._highlight()
+
+    def commit(self) -> None:
+        chosen = self._windows[self._index] if self._windows else None
+        self.hide()
+        if chosen is not None:
+            try:
+                activate_subwindow(self.mdi, chosen)
+            except RuntimeError:
+                pass  # Fenêtre fermée pendant la sélection
+
+    def keyPressEvent(self, event) -> None:
+        key = event.key()
+        if key == Qt.Key_Tab:
+            self.advance(1)
+        elif key == Qt.Key_Backtab:
+            self.advance(-1)
+        elif key == Qt.Key_Escape:
+            self.hide()
+        elif key in (Qt.Key_Return, Qt.Key_Enter):
+            self.commit()
+        else:
+            super().keyPressEvent(event)
+
+    def keyReleaseEvent(self, event) -> None:
+        if event.key() == Qt.Key_Alt:
+            self.commit()
+        else:
+            super().keyReleaseEvent(event)
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self._windows = []
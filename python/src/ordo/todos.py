@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import time
+from bisect import bisect_left, insort
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+INF = float('inf')
+MAX_PRIORITY = 3
+COMPACT_AFTER = 1000  # Entrées du journal avant réécriture de l'instantané
+DEFAULT_REMINDER_HOUR = 9  # '@demain' ou '@2026-10-20' sans heure
+
+# Clé de tri des vues: échéance (sans échéance en dernier), priorité, création
+SortKey = Tuple[float, int, int]
+
+
+@dataclass(frozen=True)
+class Todo:
+    """Tâche (immuable: une modification produit une nouvelle version)
+
+    Les dates sont des horodatages Unix. Sans `remind_at`, le rappel a lieu
+    à l'échéance; `reminded` évite de le redélivrer au redémarrage.
+    """
+    id: int
+    text: str
+    completed: bool = False
+    due: Optional[float] = None
+    priority: int = 0  # 0 (aucune) à MAX_PRIORITY
+    tags: Tuple[str, ...] = ()
+    remind_at: Optional[float] = None
+    created: float = 0.0
+    done_at: Optional[float] = None
+    reminded: bool = False
+
+    @property
+    def key(self) -> SortKey:
+        return (self.due if self.due is not None else INF, -self.priority, self.id)
+
+    def reminder_time(self) -> Optional[float]:
+        if self.completed or self.reminded:
+            return None
+        return self.remind_at if self.remind_at is not None else self.due
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['tags'] = list(self.tags)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, todo_id: int) -> 'Todo':
+        """Accepte aussi l'ancien format {'text', 'completed'}"""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        values.setdefault('id', todo_id)
+        values['tags'] = tuple(values.get('tags', ()))
+        return cls(**values)
+
+
+class SortedIndex:
+    """Liste triée découpée en seaux (comme sortedcontainers, sans dépendance)
+
+    Recherche par dichotomie sur les maxima des seaux puis dans un seau de
+    taille bornée: ajout, retrait et début d'un parcours en O(log n), sans
+    déplacer en mémoire toute la liste comme le ferait insort.
+    """
+
+    LOAD = 256
+
+    def __init__(self) -> None:
+        self._buckets: List[list] = []
+        self._maxes: list = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+        i = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        self._len += 1
+        if len(bucket) > 2 * self.LOAD:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+
+    def remove(self, key) -> None:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            raise KeyError(key)
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        if j == len(bucket) or bucket[j] != key:
+            raise KeyError(key)
+        del bucket[j]
+        self._len -= 1
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def irange(self, low=None, high=None) -> Iterator:
+        """Clés k telles que low <= k < high, dans l'ordre"""
+        i = bisect_left(self._maxes, low) if low is not None else 0
+        j = bisect_left(self._buckets[i], low) if low is not None and i < len(self._buckets) else 0
+        for bucket in islice(self._buckets, i, None):
+            for key in islice(bucket, j, None):
+                if high is not None and key >= high:
+                    return
+                yield key
+            j = 0
+
+
+class ReminderQueue:
+    """Tas min des prochains rappels
+
+    Replanifier empile une nouvelle entrée; l'ancienne devient périmée et
+    sera écartée en arrivant au sommet (suppression paresseuse). Le tas est
+    reconstruit quand les entrées périmées dominent: O(log n) amorti.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int]] = []
+        self._current: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def schedule(self, todo_id: int, at: Optional[float]) -> None:
+        if at is None:
+            self.cancel(todo_id)
+            return
+        if self._current.get(todo_id) == at:
+            return
+        self._current[todo_id] = at
+        heapq.heappush(self._heap, (at, todo_id))
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [(when, i) for i, when in self._current.items()]
+            heapq.heapify(self._heap)
+
+    def cancel(self, todo_id: int) -> None:
+        self._current.pop(todo_id, None)
+
+    def _prune(self) -> None:
+        heap = self._heap
+        while heap and self._current.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_deadline(self) -> Optional[float]:
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[int]:
+        """Retire et retourne les rappels échus (les plus anciens d'abord)"""
+        due = []
+        while True:
+            self._prune()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, todo_id = heapq.heappop(self._heap)
+            del self._current[todo_id]
+            due.append(todo_id)
+
+
+class TodoStore:
+    """Tâches, index secondaires et rappels, tenus à jour à chaque modification
+
+    Index: tâches ouvertes par échéance, tâches ouvertes par étiquette (même
+    ordre), tâches terminées (les plus récentes d'abord). Chaque modification
+    retire les clés de l'ancienne version et ajoute celles de la nouvelle.
+
+    Persistance: instantané JSON (~/.ordo_todos.json, format historique
+    étendu) et journal des modifications, réécrit après COMPACT_AFTER
+    entrées. Sans `path`, le stockage reste en mémoire.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.journal_path = path.with_suffix('.journal.jsonl') if path else None
+        self.todos: Dict[int, Todo] = {}
+        self.open = SortedIndex()
+        self.done = SortedIndex()
+        self.tags: Dict[str, SortedIndex] = {}
+        self.reminders = ReminderQueue()
+        self.next_id = 0
+        self.journal_entries = 0
+
+    # --- Index ----------------------------------------------------------
+
+    def _index(self, todo: Todo) -> None:
+        self.todos[todo.id] = todo
+        if todo.completed:
+            self.done.add((-(todo.done_at or 0.0), todo.id))
+        else:
+            self.open.add(todo.key)
+            for tag in todo.tags:
+                index = self.tags.get(tag)
+                if index is None:
+                    index = self.tags[tag] = SortedIndex()
+                index.add(todo.key)
+        self.reminders.schedule(todo.id, todo.reminder_time())
+
+    def _unindex(self, todo: Todo) -> None:
+        del self.todos[todo.id]
+        if todo.completed:
+            self.done.remove((-(todo.done_at or 0.0), todo.id))
+        else:
+            self.open.remove(todo.key)
+            for tag in todo.tags:
+                index = self.tags[tag]
+                index.remove(todo.key)
+                if not index:
+                    del self.tags[tag]
+        self.reminders.cancel(todo.id)
+
+    # --- Modifications --------------------------------------------------
+
+    def add(self, text: str, due: Optional[float] = None, priority: int = 0,
+            tags: Iterable[str] = (), remind_at: Optional[float] = None) -> Todo:
+        todo = Todo(self.next_id, text, due=due, priority=max(0, min(priority, MAX_PRIORITY)),
+                    tags=normalize_tags(tags), remind_at=remind_at, created=time.time())
+        self.next_id += 1
+        self._index(todo)
+        self._journal({'op': 'put', 'todo': todo.to_dict()})
+        return todo
+
+    def update(self, todo_id: int, **changes) -> Todo:
+        old = self.todos[todo_id]
+        if 'tags' in changes:
+            changes['tags'] = normalize_tags(changes['tags'])
+        if ('due' in changes or 'remind_at' in changes) and 'reminded' not in changes:
+            changes['reminded'] = False  # Nouvelle échéance: nouveau rappel
+        if 'completed' in changes and changes['completed'] != old.completed:
+            changes.setdefault('done_at', time.time() if changes['completed'] else None)
+        new = replace(old, **changes)
+        self._unindex(old)
+        self._index(new)
+        self._journal({'op': 'put', 'todo': new.to_dict()})
+        return new
+
+    def toggle(self, todo_id: int) -> Todo:
+        return self.update(todo_id, completed=not self.todos[todo_id].completed)
+
+    def remove(self, todo_id: int) -> None:
+        self._unindex(self.todos[todo_id])
+        self._journal({'op': 'del', 'id': todo_id})
+
+    def pop_due_reminders(self, now: float) -> List[Todo]:
+        """Rappels échus, marqués délivrés (un rappel n'est délivré qu'une fois)"""
+        return [self.update(i, reminded=True) for i in self.reminders.pop_due(now) if i in self.todos]
+
+    # --- Requêtes (O(log n + k)) ----------------------------------------
+
+    def _take(self, keys: Iterator, limit: Optional[int]) -> List[Todo]:
+        return [self.todos[key[-1]] for key in islice(keys, limit)]
+
+    def open_todos(self, limit: Optional[int] = None) -> List[Todo]:
+        return self._take(self.open.irange(), limit)
+
+    def overdue(self, now: float, limit: Optional[int] = None) -> List[Todo]:
+        return self._take(self.open.irange(None, (now,)), limit)
+
+    def due_between(self, start: float, end: float, limit: Optional[int] = None) -> List[Todo]:
+        return self._take(self.open.irange((start,), (end,)), limit)
+
+    def today(self, now: float, limit: Optional[int] = None) -> List[Todo]:
+        """Échues aujourd'hui (en retard compris) dans l'ordre des échéances"""
+        midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        return self._take(self.open.irange(None, ((midnight + timedelta(days=1)).timestamp(),)), limit)
+
+    def upcoming(self, now: float, limit: Optional[int] = None) -> List[Todo]:
+        return self._take(self.open.irange((now,), (INF,)), limit)
+
+    def tagged(self, tag: str, limit: Optional[int] = None) -> List[Todo]:
+        index = self.tags.get(tag.lower())
+        return self._take(index.irange(), limit) if index else []
+
+    def completed(self, limit: Optional[int] = None) -> List[Todo]:
+        return self._take(self.done.irange(), limit)
+
+    # --- Persistance ----------------------------------------------------
+
+    def load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            data = []
+        except ValueError as e:
+            print(f"Tâches illisibles, ignorées: {e}")
+            data = []
+        for position, item in enumerate(data):
+            try:
+                todo = Todo.from_dict(item, position)
+            except (TypeError, ValueError):
+                continue
+            self._index(todo)
+            self.next_id = max(self.next_id, todo.id + 1)
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._replay(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Dernière ligne tronquée par un arrêt brutal
+                    self.journal_entries += 1
+        except FileNotFoundError:
+            pass
+
+    def _replay(self, record: dict) -> None:
+        if record['op'] == 'del':
+            todo = self.todos.get(record['id'])
+            if todo is not None:
+                self._unindex(todo)
+            return
+        todo = Todo.from_dict(record['todo'], record['todo']['id'])
+        old = self.todos.get(todo.id)
+        if old is not None:
+            self._unindex(old)
+        self._index(todo)
+        self.next_id = max(self.next_id, todo.id + 1)
+
+    def _journal(self, record: dict) -> None:
+        if self.journal_path is None:
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"Tâche non enregistrée: {e}")
+            return
+        self.journal_entries += 1
+        if self.journal_entries >= COMPACT_AFTER:
+            self.compact()
+
+    def compact(self) -> None:
+        """Réécrit l'instantané et vide le journal"""
+        if self.path is None:
+            return
+        try:
+            tmp = self.path.with_suffix('.tmp')
+            ordered = sorted(self.todos.values(), key=lambda t: t.id)
+            tmp.write_text(json.dumps([t.to_dict() for t in ordered], ensure_ascii=False), encoding='utf-8')
+            tmp.replace(self.path)
+            self.journal_path.unlink(missing_ok=True)
+            self.journal_entries = 0
+        except OSError as e:
+            print(f"Erreur sauvegarde des tâches: {e}")
+
+
+def normalize_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(t.lower().lstrip('#') for t in tags if t.strip('# ')))
+
+
+QUICK_TAG_RE = re.compile(r'(?:^|\s)#(\w[\w-]*)')
+QUICK_PRIORITY_RE = re.compile(r'(?:^|\s)!([0-3])(?=\s|$)')
+QUICK_DUE_RE = re.compile(r'(?:^|\s)@(\S+)')
+QUICK_TIME_RE = re.compile(r'^(\d{1,2})[:h](\d{2})?$')
+
+
+def _parse_due(token: str, now: datetime) -> Optional[datetime]:
+    token = token.lower()
+    day, _, clock = token.partition('t') if token[:1].isdigit() and '-' in token else (token, '', '')
+    base = None
+    if day in ('aujourdhui', "aujourd'hui"):
+        base = now
+    elif day == 'demain':
+        base = now + timedelta(days=1)
+    elif '-' in day:
+        try:
+            base = datetime.strptime(day, '%Y-%m-%d')
+        except ValueError:
+            return None
+    elif QUICK_TIME_RE.match(day):
+        clock = day
+    else:
+        return None
+
+    if clock:
+        match = QUICK_TIME_RE.match(clock)
+        if not match:
+            return None
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        if hour > 23 or minute > 59:
+            return None
+        if base is None:
+            # Heure seule: aujourd'hui, ou demain si elle est passée
+            candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            return candidate if candidate > now else candidate + timedelta(days=1)
+        return base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return base.replace(hour=DEFAULT_REMINDER_HOUR, minute=0, second=0, microsecond=0)
+
+
+def parse_quick_add(text: str, now: Optional[datetime] = None) -> dict:
+    """Saisie rapide: 'Payer le loyer @demain !2 #maison' -> champs de la tâche
+
+    @aujourdhui, @demain, @18:00, @2026-10-20 ou @2026-10-20T18:00 fixent
+    l'échéance, !0 à !3 la priorité, #mot ajoute une étiquette. Un jeton
+    non reconnu reste dans le texte.
+    """
+    now = now or datetime.now()
+    due = None
+    for match in QUICK_DUE_RE.finditer(text):
+        parsed = _parse_due(match.group(1), now)
+        if parsed is not None:
+            due = parsed.timestamp()
+            text = text.replace(match.group(0), ' ', 1)
+    priority = 0
+    match = QUICK_PRIORITY_RE.search(text)
+    if match:
+        priority = int(match.group(1))
+        text = QUICK_PRIORITY_RE.sub(' ', text, count=1)
+    tags = QUICK_TAG_RE.findall(text)
+    text = QUICK_TAG_RE.sub(' ', text)
+    return {'text': ' '.join(text.split()), 'due': due, 'priority': priority, 'tags': tags}
+
+
+def _benchmark(sizes: Tuple[int, ...] = (1_000, 10_000, 100_000), operations: int = 20_000) -> None:
+    """Coût par opération selon la taille: doit rester quasi constant (log n)"""
+    import random
+
+    rng = random.Random(0)
+    now = time.time()
+    tags = [f'tag{n}' for n in range(50)]
+    print(f"{'tâches':>8} {'ajout':>8} {'replanif.':>10} {'bascule':>8} {'en retard':>10} "
+          f"{'étiquette':>10} {'rappel':>8}   (µs/opération)")
+    for size in sizes:
+        store = TodoStore()
+        for n in range(size):
+            store.add(f'tâche {n}', due=now + rng.uniform(-30, 60) * 86400 if n % 4 else None,
+                      priority=rng.randint(0, 3), tags=rng.sample(tags, rng.randint(0, 2)))
+        ids = list(store.todos)
+
+        def timed(operation) -> float:
+            started = time.perf_counter()
+            for _ in range(operations):
+                operation()
+            return (time.perf_counter() - started) / operations * 1e6
+
+        results = [
+            timed(lambda: store.add('nouvelle', due=now + rng.uniform(0, 86400), tags=('tag1',))),
+            timed(lambda: store.update(rng.choice(ids), due=now + rng.uniform(-86400, 86400 * 30))),
+            timed(lambda: store.toggle(rng.choice(ids))),
+            timed(lambda: store.overdue(now, limit=50)),
+            timed(lambda: store.tagged(rng.choice(tags), limit=50)),
+            # Replanification du prochain rappel: retrait du sommet puis nouvelle échéance
+            timed(lambda: (store.reminders.next_deadline(),
+                           store.reminders.schedule(rng.choice(ids), now + rng.uniform(0, 86400)))),
+        ]
+        print(f"{size:>8} " + ' '.join(f'{value:>{width}.2f}' for value, width in
+                                                   zip(results, (8, 10, 8, 10, 10, 8))))
+
+
+if __name__ == '__main__':
+    _benchmark()
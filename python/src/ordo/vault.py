@@ -0,0 +1,580 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+NOTE_SUFFIX = '.md'
+INDEX_DIR = '.index'
+MAGIC = b'ORDOIX1\0'
+HEADER = struct.Struct('<8sI')
+WORD_RE = re.compile(r'\w+')
+MAX_PREFIX_EXPANSIONS = 16
+CHAMPION_LIMIT = 512         # Postings conservés par terme, meilleurs impacts d'abord
+EXPANSION_POSTINGS = 64      # Postings lus par terme issu d'un préfixe
+PARALLEL_THRESHOLD = 256     # En dessous, démarrer des processus coûte plus qu'il ne rapporte
+COMPACT_AFTER = 1000         # Entrées du journal avant reconstruction complète
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Postings d'un terme: (note, fréquence, position du premier caractère)
+Posting = Tuple[int, int, int]
+
+
+def _normalize_word(word: str) -> str:
+    """Minuscules sans accents, comme le lanceur ('Éditeur' -> 'editeur')"""
+    word = word.lower()
+    if word.isascii():
+        return word
+    decomposed = unicodedata.normalize('NFKD', word)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int]]:
+    """Termes normalisés et leur position (caractère) dans le texte d'origine"""
+    for match in WORD_RE.finditer(text):
+        yield _normalize_word(match.group()), match.start()
+
+
+def analyze(text: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """Longueur en termes et, par terme, (fréquence, première position)"""
+    counts: Dict[str, int] = {}
+    first: Dict[str, int] = {}
+    normalized: Dict[str, str] = {}  # Un mot revient souvent: normalisé une fois
+    for match in WORD_RE.finditer(text):
+        word = match.group()
+        term = normalized.get(word)
+        if term is None:
+            term = normalized[word] = _normalize_word(word)
+        if term in counts:
+            counts[term] += 1
+        else:
+            counts[term] = 1
+            first[term] = match.start()
+    return sum(counts.values()), {term: (count, first[term]) for term, count in counts.items()}
+
+
+def note_title(rel: str) -> str:
+    return Path(rel).stem
+
+
+@dataclass
+class NoteEntry:
+    id: int
+    path: str  # Chemin relatif POSIX dans le coffre
+    title: str
+    mtime: float
+    size: int
+    length: int
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    path: str
+    title: str
+    score: float
+    offset: int  # Première occurrence du meilleur terme, pour placer le curseur
+
+
+def _impact(tf: int, length: int, average: float) -> float:
+    """Part de BM25 propre à la note (sans l'idf du terme)"""
+    return tf / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average))
+
+
+def _index_chunk(root: str, chunk: List[Tuple[int, str]]) -> Tuple[list, Dict[str, Tuple[int, list]]]:
+    """Tâche de reconstruction: index inversé partiel d'un lot de notes
+
+    Chaque terme garde sa fréquence documentaire et ses CHAMPION_LIMIT
+    meilleurs postings (impact, note, fréquence, position), triés par impact
+    décroissant: le tri, coûteux, est ainsi réparti entre les processus.
+    """
+    notes = []
+    analyzed = []
+    for note_id, rel in chunk:
+        path = Path(root) / rel
+        try:
+            stat = path.stat()
+            text = path.read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            continue
+        length, terms = analyze(text)
+        notes.append((note_id, rel, note_title(rel), stat.st_mtime, stat.st_size, length))
+        analyzed.append((note_id, length, terms))
+
+    # Longueur moyenne du lot: approximation de celle du coffre
+    average = sum(length for _, length, _ in analyzed) / len(analyzed) if analyzed else 1.0
+    postings: Dict[str, list] = {}
+    for note_id, length, terms in analyzed:
+        for term, (tf, offset) in terms.items():
+            entry = (_impact(tf, length, average or 1.0), note_id, tf, offset)
+            bucket = postings.get(term)
+            if bucket is None:
+                postings[term] = [entry]
+            else:
+                bucket.append(entry)
+    return notes, {term: (len(bucket), heapq.nlargest(CHAMPION_LIMIT, bucket))
+                   for term, bucket in postings.items()}
+
+
+class VaultIndex:
+    """Index inversé persistant des notes (terme -> note, fréquence, position)
+
+    La base est un fichier binaire projeté en mémoire (en-tête JSON puis
+    tableaux de postings), seuls les termes interrogés sont lus. Chaque terme
+    ne garde que ses meilleurs postings par impact BM25 (listes de champions):
+    une requête lit au plus CHAMPION_LIMIT postings par terme. Chaque
+    sauvegarde ajoute une entrée à un journal; l'ancienne version de la note
+    est simplement ignorée jusqu'à la prochaine reconstruction, qui retokenise
+    tout le coffre en parallèle.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.dir = root / INDEX_DIR
+        self.base_path = self.dir / 'index.bin'
+        self.journal_path = self.dir / 'journal.jsonl'
+        self.notes: Dict[int, NoteEntry] = {}
+        self.by_path: Dict[str, int] = {}
+        self.next_id = 0
+        self.journal_entries = 0
+        self._total_length = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._data_start = 0
+        self._base_terms: Dict[str, Tuple[int, int, int]] = {}  # terme -> (début, conservés, df)
+        self._sorted_terms: List[str] = []
+        self._delta: Dict[str, Dict[int, Tuple[int, int]]] = {}
+        self._lock = threading.RLock()
+
+    # --- Chargement -----------------------------------------------------
+
+    def load(self) -> bool:
+        """Ouvre la base et rejoue le journal; False si une reconstruction s'impose"""
+        with self._lock:
+            self._close_base()
+            self._reset_state()
+            if not self.base_path.exists():
+                return False
+            try:
+                self._open_base()
+            except (OSError, ValueError) as e:
+                print(f"Index des notes illisible, reconstruction: {e}")
+                self._close_base()
+                self._reset_state()
+                return False
+            self._replay_journal()
+            return True
+
+    def _reset_state(self) -> None:
+        self.notes, self.by_path, self._delta = {}, {}, {}
+        self._base_terms, self._sorted_terms = {}, []
+        self.next_id = self.journal_entries = self._total_length = 0
+
+    def _open_base(self) -> None:
+        self._file = open(self.base_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError('signature invalide')
+        header = json.loads(self._map[HEADER.size:HEADER.size + header_len])
+        if header.get('byteorder') != sys.byteorder:
+            raise ValueError('index créé sur une autre architecture')
+        self._data_start = HEADER.size + header_len
+        self._base_terms = {term: tuple(loc) for term, loc in header['terms'].items()}
+        self._sorted_terms = sorted(self._base_terms)
+        self.next_id = header['next_id']
+        for note_id, (rel, title, mtime, size, length) in header['notes'].items():
+            self._add_note(NoteEntry(int(note_id), rel, title, mtime, size, length))
+
+    def _close_base(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _replay_journal(self) -> None:
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue  # Dernière ligne tronquée par un arrêt brutal
+                    self.journal_entries += 1
+        except FileNotFoundError:
+            pass
+
+    # --- Mise à jour ----------------------------------------------------
+
+    def _add_note(self, note: NoteEntry) -> None:
+        self._drop_note(note.path)
+        self.notes[note.id] = note
+        self.by_path[note.path] = note.id
+        self._total_length += note.length
+
+    def _drop_note(self, rel: str) -> None:
+        old_id = self.by_path.pop(rel, None)
+        if old_id is not None:
+            old = self.notes.pop(old_id)
+            self._total_length -= old.length
+
+    def _apply(self, record: dict) -> None:
+        if record['op'] == 'del':
+            self._drop_note(record['path'])
+            return
+        note = NoteEntry(record['id'], record['path'], note_title(record['path']),
+                         record['mtime'], record['size'], record['length'])
+        self._add_note(note)
+        self.next_id = max(self.next_id, note.id + 1)
+        for term, (tf, offset) in record['terms'].items():
+            postings = self._delta.get(term)
+            if postings is None:
+                postings = self._delta[term] = {}
+                if term not in self._base_terms:
+                    self._sorted_terms.insert(bisect_left(self._sorted_terms, term), term)
+            postings[note.id] = (tf, offset)
+
+    def _journal(self, record: dict) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.journal_entries += 1
+
+    def update(self, rel: str, text: str, mtime: float, size: int) -> None:
+        """Réindexe une note (appelé après chaque sauvegarde)"""
+        length, terms = analyze(text)  # Hors verrou: la recherche reste disponible
+        with self._lock:
+            record = {'op': 'put', 'id': self.next_id, 'path': rel, 'mtime': mtime,
+                      'size': size, 'length': length, 'terms': terms}
+            self.next_id += 1
+            self._apply(record)
+            self._journal(record)
+
+    def remove(self, rel: str) -> None:
+        with self._lock:
+            if rel in self.by_path:
+                record = {'op': 'del', 'path': rel}
+                self._apply(record)
+                self._journal(record)
+
+    # --- Reconstruction -------------------------------------------------
+
+    def _journal_position(self) -> int:
+        try:
+            return self.journal_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _journal_since(self, position: int) -> List[dict]:
+        """Entrées du journal écrites après `position` (octets)"""
+        records = []
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(position)
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # Dernière ligne tronquée par un arrêt brutal
+        except FileNotFoundError:
+            pass
+        return records
+
+    def rebuild(self, paths: List[str], workers: Optional[int] = None) -> None:
+        """Retokenise toutes les notes (en parallèle) et réécrit la base
+
+        Les sauvegardes faites pendant la reconstruction restent dans le
+        journal: seules les entrées antérieures à son début sont absorbées
+        par la nouvelle base, les suivantes sont renumérotées et conservées.
+        """
+        workers = workers or os.cpu_count() or 1
+        with self._lock:
+            position = self._journal_position()
+        numbered = list(enumerate(paths))
+        if len(paths) < PARALLEL_THRESHOLD:
+            results = [_index_chunk(str(self.root), numbered)]
+        else:
+            # Deux lots par cœur pour équilibrer la charge
+            size = -(-len(numbered) // (2 * workers))
+            chunks = [numbered[i:i + size] for i in range(0, len(numbered), size)]
+            # 'spawn': pas de fork d'un processus Qt multithreadé. Les processus
+            # réimportent le script principal: run.py n'importe pas Qt au
+            # niveau du module.
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                results = list(pool.map(_index_chunk, [str(self.root)] * len(chunks), chunks))
+
+        notes = {}
+        merged: Dict[str, Tuple[int, list]] = {}
+        for chunk_notes, postings in results:
+            for note_id, rel, title, mtime, size, length in chunk_notes:
+                notes[str(note_id)] = [rel, title, mtime, size, length]
+            for term, (df, champions) in postings.items():
+                seen = merged.get(term)
+                if seen is None:
+                    merged[term] = (df, champions)
+                else:
+                    merged[term] = (seen[0] + df, heapq.nlargest(CHAMPION_LIMIT, seen[1] + champions))
+
+        # Par terme: notes, fréquences puis positions (u32), meilleurs impacts d'abord
+        terms = {}
+        data = bytearray()
+        for term, (df, champions) in merged.items():
+            terms[term] = (len(data), len(champions), df)
+            data += array('I', [entry[1] for entry in champions]).tobytes()
+            data += array('I', [entry[2] for entry in champions]).tobytes()
+            data += array('I', [entry[3] for entry in champions]).tobytes()
+        header = json.dumps({'byteorder': sys.byteorder, 'next_id': len(paths),
+                             'notes': notes, 'terms': terms}, ensure_ascii=False).encode('utf-8')
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.base_path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            f.write(data)
+        with self._lock:
+            # Les identifiants de la base repartent de zéro: ceux des entrées
+            # écrites pendant la reconstruction sont décalés à la suite
+            later = self._journal_since(position)
+            next_id = len(paths)
+            for record in later:
+                if record.get('op') == 'put':
+                    record['id'] = next_id
+                    next_id += 1
+            # Sous Windows, un fichier projeté ne peut pas être remplacé
+            self._close_base()
+            tmp.replace(self.base_path)
+            if later:
+                journal_tmp = self.journal_path.with_suffix('.tmp')
+                with open(journal_tmp, 'w', encoding='utf-8') as f:
+                    f.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in later)
+                journal_tmp.replace(self.journal_path)
+            else:
+                self.journal_path.unlink(missing_ok=True)
+            self.load()
+
+    # --- Recherche ------------------------------------------------------
+
+    def _postings(self, term: str, limit: int) -> Iterator[Posting]:
+        """Postings du terme: les `limit` meilleurs de la base, puis ceux du journal"""
+        location = self._base_terms.get(term)
+        if location is not None and self._map is not None:
+            start, count, _ = location
+            take = min(count, limit)
+            base = self._data_start + start
+            # Copies des seules tranches lues (pas de vue exportée: la base reste fermable)
+            columns = []
+            for column in range(3):
+                values = array('I')
+                values.frombytes(self._map[base + 4 * count * column:base + 4 * (count * column + take)])
+                columns.append(values)
+            yield from zip(*columns)
+        delta = self._delta.get(term)
+        if delta:
+            for note_id, (tf, offset) in delta.items():
+                yield note_id, tf, offset
+
+    def _document_frequency(self, term: str) -> int:
+        location = self._base_terms.get(term)
+        return (location[2] if location else 0) + len(self._delta.get(term, ()))
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect_left(self._sorted_terms, prefix)
+        expansions = []
+        for term in self._sorted_terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Recherche classée (BM25); le dernier mot est un préfixe (frappe en cours)"""
+        words = [term for term, _ in tokenize(query)]
+        if not words:
+            return []
+        as_prefix = not query[-1:].isspace()
+        with self._lock:
+            total = len(self.notes)
+            if not total:
+                return []
+            average = self._total_length / total or 1.0
+            scores: Dict[int, float] = {}
+            matched: Dict[int, int] = {}
+            offsets: Dict[int, Tuple[float, int]] = {}
+            for position, word in enumerate(words):
+                if as_prefix and position == len(words) - 1:
+                    terms, depth = self._expand(word), EXPANSION_POSTINGS
+                else:
+                    terms, depth = [word], CHAMPION_LIMIT
+                seen: Set[int] = set()
+                for term in terms:
+                    df = self._document_frequency(term)
+                    idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                    for note_id, tf, offset in self._postings(term, depth):
+                        note = self.notes.get(note_id)
+                        if note is None:
+                            continue  # Version remplacée ou note supprimée
+                        norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * note.length / average)
+                        gain = idf * tf * (BM25_K1 + 1) / norm
+                        scores[note_id] = scores.get(note_id, 0.0) + gain
+                        if note_id not in seen:
+                            seen.add(note_id)
+                            matched[note_id] = matched.get(note_id, 0) + 1
+                        best = offsets.get(note_id)
+                        if best is None or gain > best[0]:
+                            offsets[note_id] = (gain, offset)
+            # Les notes contenant tous les mots passent devant
+            top = heapq.nlargest(limit, scores, key=lambda n: (matched[n], scores[n]))
+            return [SearchHit(self.notes[n].path, self.notes[n].title, scores[n], offsets[n][1]) for n in top]
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_base()
+
+
+class Vault:
+    """Dossier de notes Markdown et son index plein texte"""
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = root or Path.home() / '.ordo_notes'
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index = VaultIndex(self.root)
+
+    def list_notes(self) -> List[str]:
+        """Chemins relatifs POSIX des notes, triés"""
+        notes = []
+        for path in self.root.rglob('*' + NOTE_SUFFIX):
+            rel = path.relative_to(self.root)
+            if rel.parts[0] != INDEX_DIR:
+                notes.append(rel.as_posix())
+        return sorted(notes)
+
+    def path_of(self, rel: str) -> Path:
+        return self.root / rel
+
+    def read(self, rel: str) -> str:
+        return self.path_of(rel).read_text(encoding='utf-8')
+
+    def write(self, rel: str, text: str) -> None:
+        """Écrit la note sur disque (la réindexation est faite par `reindex`)"""
+        path = self.path_of(rel)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+    def reindex(self, rel: str, text: str) -> None:
+        stat = self.path_of(rel).stat()
+        self.index.update(rel, text, stat.st_mtime, stat.st_size)
+
+    def create(self, title: str) -> str:
+        """Nouvelle note vide; retourne son chemin relatif (titre dédoublonné)"""
+        safe = ' '.join(re.sub(r'[\\/:*?"<>|]+', ' ', title).split()) or 'Sans titre'
+        rel, n = safe + NOTE_SUFFIX, 2
+        while self.path_of(rel).exists():
+            rel, n = f'{safe} ({n}){NOTE_SUFFIX}', n + 1
+        self.write(rel, '')
+        self.reindex(rel, '')
+        return rel
+
+    def sync(self, workers: Optional[int] = None) -> None:
+        """Met l'index en phase avec le disque (modifications faites hors de l'éditeur)
+
+        Une base absente, un journal trop long ou beaucoup de notes modifiées
+        déclenchent une reconstruction complète; sinon seules les notes
+        changées sont réindexées.
+        """
+        paths = self.list_notes()
+        if not self.index.load() or self.index.journal_entries > COMPACT_AFTER:
+            self.index.rebuild(paths, workers)
+            return
+
+        changed = []
+        for rel in paths:
+            note_id = self.index.by_path.get(rel)
+            stat = self.path_of(rel).stat()
+            note = self.index.notes.get(note_id) if note_id is not None else None
+            if note is None or note.mtime != stat.st_mtime or note.size != stat.st_size:
+                changed.append(rel)
+        if len(changed) > PARALLEL_THRESHOLD:
+            self.index.rebuild(paths, workers)
+            return
+        for rel in changed:
+            try:
+                self.reindex(rel, self.read(rel))
+            except OSError as e:
+                print(f"Note illisible '{rel}': {e}")
+        for rel in set(self.index.by_path) - set(paths):
+            self.index.remove(rel)
+
+
+_shared: Dict[Path, Vault] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_vault(root: Optional[Path] = None) -> Vault:
+    """Coffre unique par dossier dans le processus (un éditeur par écran)
+
+    Deux index ouverts sur le même dossier écriraient chacun leur journal
+    avec leurs propres identifiants de notes.
+    """
+    root = (root or Path.home() / '.ordo_notes').resolve()
+    with _shared_lock:
+        vault = _shared.get(root)
+        if vault is None:
+            vault = _shared[root] = Vault(root)
+        return vault
+
+
+def _benchmark(notes: int = 10000, note_size: int = 10000) -> None:
+    """Coffre synthétique (notes x note_size octets): reconstruction et requêtes"""
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(0)
+    vocabulary = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10)))
+                  for _ in range(50000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]  # Loi de Zipf
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Vault(Path(tmp))
+        started = time.perf_counter()
+        for n in range(notes):
+            words = rng.choices(vocabulary, weights, k=note_size // 7)
+            vault.write(f'note-{n:05d}{NOTE_SUFFIX}', ' '.join(words))
+        print(f"Génération: {notes} notes en {time.perf_counter() - started:.1f} s")
+
+        started = time.perf_counter()
+        vault.sync()
+        print(f"Reconstruction ({os.cpu_count()} cœurs): {time.perf_counter() - started:.1f} s")
+
+        queries = [' '.join(rng.choices(vocabulary[100:20000], k=rng.randint(1, 3))) for _ in range(300)]
+        queries += [q[:rng.randint(2, len(q))] for q in queries[:200]]  # Frappe en cours
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            vault.index.search(query)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"{len(queries)} requêtes: p50 {timings[len(timings) // 2] * 1000:.2f} ms, "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1000:.2f} ms")
+        vault.index.close()
+
+
+if __name__ == '__main__':
+    _benchmark()
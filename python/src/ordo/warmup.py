@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import html
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QTimer, QUrl
+from PySide6.QtNetwork import QNetworkInformation
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def origin_of(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+# Événements qui comptent comme activité de l'utilisateur
+INPUT_EVENTS = frozenset({
+    QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.Wheel,
+    QEvent.TouchBegin, QEvent.TouchUpdate, QEvent.TabletPress,
+})
+
+
+def warmup_allowed() -> bool:
+    """Refuse le préchauffage sur réseau limité, hors ligne ou batterie faible"""
+    if os.environ.get('ORDO_NO_WARMUP') == '1':
+        return False
+
+    if QNetworkInformation.loadDefaultBackend():
+        info = QNetworkInformation.instance()
+        if info is not None:
+            if info.reachability() == QNetworkInformation.Reachability.Disconnected:
+                return False
+            if info.isMetered():
+                return False
+
+    if psutil is not None:
+        try:
+            battery = psutil.sensors_battery()
+        except (AttributeError, NotImplementedError, OSError):
+            battery = None
+        if battery is not None and not battery.power_plugged and battery.percent < IdleWarmer.MIN_BATTERY_PERCENT:
+            return False
+    return True
+
+
+class IdleWarmer(QObject):
+    """Préconnexion et préchargement des apps distantes pendant l'inactivité
+
+    Une page d'arrière-plan du profil partagé charge un document minimal de
+    <link rel="preconnect|prefetch">: DNS, TLS et cache HTTP sont ainsi chauds
+    quand l'utilisateur ouvre l'app. Une seule app est traitée par période
+    d'inactivité, dans la limite d'un budget global par session.
+
+    L'inactivité se mesure sur les saisies réelles (filtre d'événements de
+    l'application). Réseau limité ou batterie faible: les apps restent en
+    attente et la vérification est refaite plus tard.
+    """
+
+    IDLE_DELAY_MS = 5000       # Inactivité avant le premier préchauffage
+    STEP_INTERVAL_MS = 3000    # Espacement entre deux apps (budget CPU)
+    RETRY_DELAY_MS = 60000     # Nouvelle vérification après un refus (réseau, batterie)
+    PAGE_LIFETIME_MS = 10000   # Durée de vie de la page d'arrière-plan
+    MAX_PRECONNECTS = 12       # Budget réseau global pour la session
+    MAX_PREFETCHES = 6
+    MIN_BATTERY_PERCENT = 30
+
+    def __init__(self, apps: Iterable, profile: Optional[QWebEngineProfile] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.profile = profile or QWebEngineProfile.defaultProfile()
+        self._pending: List[Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = []
+        for app in apps:
+            if not app.warm_on_idle or not app.url:
+                continue
+            preconnect = app.preconnect or tuple(filter(None, [origin_of(app.url)]))
+            self._pending.append((app.id, preconnect, app.prefetch))
+
+        self.preconnects_used = 0
+        self.prefetches_used = 0
+        self.warmed: List[str] = []
+        self._page: Optional[QWebEnginePage] = None
+        self._last_input = time.monotonic()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._step)
+
+        self._page_timer = QTimer(self)
+        self._page_timer.setSingleShot(True)
+        self._page_timer.setInterval(self.PAGE_LIFETIME_MS)
+        self._page_timer.timeout.connect(self._release_page)
+
+    def start(self) -> None:
+        if not self._pending:
+            return
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.installEventFilter(self)
+        self._timer.start(self.IDLE_DELAY_MS)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.removeEventFilter(self)
+
+    def postpone(self) -> None:
+        """L'utilisateur est actif: on repousse le préchauffage"""
+        # Une simple date: la minuterie n'est pas réarmée à chaque mouvement de souris
+        self._last_input = time.monotonic()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() in INPUT_EVENTS:
+            self._last_input = time.monotonic()
+        return False
+
+    def _step(self) -> None:
+        if not self._pending:
+            self.stop()
+            return
+        idle_ms = int((time.monotonic() - self._last_input) * 1000)
+        if idle_ms < self.IDLE_DELAY_MS:
+            self._timer.start(self.IDLE_DELAY_MS - idle_ms)
+            return
+        if not warmup_allowed():
+            self._timer.start(self.RETRY_DELAY_MS)
+            return
+
+        app_id, preconnect, prefetch = self._pending.pop(0)
+        preconnect = preconnect[:max(0, self.MAX_PRECONNECTS - self.preconnects_used)]
+        prefetch = prefetch[:max(0, self.MAX_PREFETCHES - self.prefetches_used)]
+        if not preconnect and not prefetch:
+            self._pending.clear()  # Budget épuisé
+            self.stop()
+            return
+
+        self.preconnects_used += len(preconnect)
+        self.prefetches_used += len(prefetch)
+        self._load_hints(preconnect, prefetch)
+        self.warmed.append(app_id)
+        if self._pending:
+            self._timer.start(self.STEP_INTERVAL_MS)
+        else:
+            self.stop()
+
+    def _load_hints(self, preconnect: Tuple[str, ...], prefetch: Tuple[str, ...]) -> None:
+        links = [f'<link rel="preconnect" href="{html.escape(url)}">' for url in preconnect]
+        links += [f'<link rel="prefetch" href="{html.escape(url)}">' for url in prefetch]
+        if self._page is None:
+            self._page = QWebEnginePage(self.profile, self)
+        # Base sur l'origine de l'app: les indications sont émises depuis un contexte HTTP(S)
+        origin = origin_of((preconnect or prefetch)[0])
+        base = QUrl(f'{origin}/') if origin else QUrl('about:blank')
+        self._page.setHtml(f'<!DOCTYPE html><html><head>{"".join(links)}</head></html>', base)
+        self._page_timer.start()
+
+    def _release_page(self) -> None:
+        if self._page is not None:
+            self._page.deleteLater()
+            self._page = None
@@ -0,0 +1,25 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Les modules du serveur (Ordo_browser.py, ordo_*.py) sont à la racine du dépôt
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import Ordo_browser  # noqa: E402
+
+
+@pytest.fixture
+def local_server(tmp_path, monkeypatch):
+    """Serveur local d'Ordo sur un port libre, servant `tmp_path`"""
+    monkeypatch.setattr(Ordo_browser, 'HERE', tmp_path)
+    server = Ordo_browser.OrdoHTTPServer(('127.0.0.1', 0), Ordo_browser.LocalServerHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
@@ -0,0 +1,55 @@
+import http.client
+import os
+
+import pytest
+
+from ordo_pack import AssetPack, build_pack
+
+
+@pytest.fixture
+def packed_server(local_server, tmp_path):
+    (tmp_path / 'index.html').write_text('<h1>Ordo</h1>', encoding='utf-8')
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'app.js').write_text('console.log("v1");', encoding='utf-8')
+    build_pack(tmp_path, tmp_path / 'ordo.pack')
+    # Pas de close(): le thread du handler peut encore tenir une vue sur l'archive
+    local_server.asset_pack = AssetPack(tmp_path / 'ordo.pack', tmp_path)
+    return local_server
+
+
+def fetch(server, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        conn.request('GET', path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def test_packed_asset_served_from_archive(packed_server):
+    response, body = fetch(packed_server, '/js/app.js')
+    assert response.status == 200
+    assert body == b'console.log("v1");'
+    assert response.getheader('ETag').startswith('"')
+
+
+def test_edited_file_bypasses_archive(packed_server, tmp_path):
+    script = tmp_path / 'js' / 'app.js'
+    script.write_text('console.log("v2");', encoding='utf-8')
+    stat = script.stat()
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    response, body = fetch(packed_server, '/js/app.js')
+    assert body == b'console.log("v2");'
+
+
+def test_packed_range(packed_server):
+    response, body = fetch(packed_server, '/js/app.js', {'Range': 'bytes=0-6', 'Accept-Encoding': 'gzip'})
+    assert response.status == 206
+    assert response.getheader('Content-Range') == 'bytes 0-6/18'
+    assert response.getheader('Content-Encoding') is None
+    assert body == b'console'
+
+    response, body = fetch(packed_server, '/js/app.js', {'Range': 'bytes=100-'})
+    assert response.status == 416
+    assert response.getheader('Content-Range') == 'bytes */18'
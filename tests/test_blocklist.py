@@ -0,0 +1,69 @@
+from python.src.ordo.blocklist import Blocklist, compile_blocklist, parse_source
+
+SOURCE = """\
+# Fichier hosts
+0.0.0.0 ads.example.com
+127.0.0.1 localhost
+0.0.0.0 tracker.example.net pixel.example.net  # plusieurs par ligne
+Metrics.Example.ORG
+||doubleclick.net^
+||thirdparty.example^$third-party
+||scripts.example^$script
+||paths.example/banner
+@@||allowed.example^
+! commentaire AdBlock
+[Adblock Plus 2.0]
+192.168.1.1 intranet.example
+not a domain
+"""
+
+
+def test_parse_source_formats():
+    assert list(parse_source(SOURCE.splitlines())) == [
+        'ads.example.com',
+        'tracker.example.net',
+        'pixel.example.net',
+        'metrics.example.org',
+        'doubleclick.net',
+        'thirdparty.example',
+    ]
+
+
+def test_compiled_table_round_trip(tmp_path):
+    source = tmp_path / 'hosts.txt'
+    source.write_text(SOURCE, encoding='utf-8')
+    assert compile_blocklist(source, tmp_path / 'blocklist.bin') == 6
+    blocklist = Blocklist(tmp_path / 'blocklist.bin')
+    try:
+        assert len(blocklist) == 6
+        assert blocklist.header['source'] == str(source.resolve())
+        # Le domaine lui-même et tous ses sous-domaines
+        assert blocklist.match('doubleclick.net') == 'doubleclick.net'
+        assert blocklist.match('stats.g.doubleclick.net') == 'doubleclick.net'
+        assert blocklist.match('cdn.ads.example.com') == 'ads.example.com'
+        # Point final et majuscules: même hôte
+        assert blocklist.match('ads.example.com.') == 'ads.example.com'
+        assert blocklist.match('ADS.Example.COM') == 'ads.example.com'
+        # Parent ou voisin d'un domaine listé: non bloqué
+        assert blocklist.match('example.com') is None
+        assert blocklist.match('notdoubleclick.net') is None
+        assert blocklist.match('allowed.example') is None
+        assert blocklist.match('scripts.example') is None
+        assert blocklist.match('localhost') is None
+    finally:
+        blocklist.close()
+
+
+def test_check_counts_hits_and_honours_exceptions(tmp_path):
+    source = tmp_path / 'hosts.txt'
+    source.write_text(SOURCE, encoding='utf-8')
+    compile_blocklist(source, tmp_path / 'blocklist.bin')
+    blocklist = Blocklist(tmp_path / 'blocklist.bin')
+    try:
+        assert blocklist.check('video', 'pixel.example.net')
+        assert not blocklist.check('video', 'pixel.example.net', allow=('example.net',))
+        assert not blocklist.check('video', 'ordo.example')
+        assert blocklist.checked == 3
+        assert blocklist.hits == {('video', 'pixel.example.net'): 1}
+    finally:
+        blocklist.close()
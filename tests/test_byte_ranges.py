@@ -0,0 +1,126 @@
+import builtins
+import http.client
+
+import pytest
+
+import Ordo_browser
+from Ordo_browser import parse_byte_ranges
+
+GIB = 1 << 30
+
+
+class CountingFile:
+    """Fichier dont on compte les octets réellement lus"""
+
+    def __init__(self, f, counter):
+        self._f = f
+        self._counter = counter
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self._counter['read'] += len(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    counter = {'read': 0}
+
+    def counting_open(*args, **kwargs):
+        return CountingFile(builtins.open(*args, **kwargs), counter)
+
+    monkeypatch.setattr(Ordo_browser, 'open', counting_open, raising=False)
+    return counter
+
+
+@pytest.fixture
+def video(tmp_path):
+    """Fichier creux de 2 Gio avec des marqueurs au début, au milieu et à la fin"""
+    path = tmp_path / 'video.mp4'
+    with open(path, 'wb') as f:
+        f.truncate(2 * GIB)
+        for offset, marker in ((0, b'DEBUT'), (GIB, b'MILIEU'), (2 * GIB - 3, b'FIN')):
+            f.seek(offset)
+            f.write(marker)
+    return path
+
+
+def fetch(server, path, headers):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def test_parse_byte_ranges():
+    assert parse_byte_ranges('bytes=0-9', 100) == [(0, 9)]
+    assert parse_byte_ranges('bytes=90-', 100) == [(90, 99)]
+    assert parse_byte_ranges('bytes=-10', 100) == [(90, 99)]
+    assert parse_byte_ranges('bytes=-500', 100) == [(0, 99)]
+    assert parse_byte_ranges('bytes=95-200', 100) == [(95, 99)]
+    assert parse_byte_ranges('bytes=0-1,5-6', 100) == [(0, 1), (5, 6)]
+    assert parse_byte_ranges('bytes=100-', 100) == []
+    assert parse_byte_ranges('bytes=-5', 0) == []
+    assert parse_byte_ranges('bytes=0-', 0) == []
+    assert parse_byte_ranges('items=0-1', 100) is None
+    assert parse_byte_ranges('bytes=5-1', 100) is None
+    assert parse_byte_ranges('bytes=a-b', 100) is None
+
+
+def test_seek_reads_only_requested_range(local_server, video, reads):
+    response, body = fetch(local_server, '/video.mp4', {'Range': f'bytes={GIB}-{GIB + 99}'})
+    assert response.status == 206
+    assert response.getheader('Content-Range') == f'bytes {GIB}-{GIB + 99}/{2 * GIB}'
+    assert response.getheader('Content-Length') == '100'
+    assert body[:6] == b'MILIEU' and len(body) == 100
+    assert reads['read'] == 100
+
+
+def test_suffix_range_reads_tail_only(local_server, video, reads):
+    response, body = fetch(local_server, '/video.mp4', {'Range': 'bytes=-3'})
+    assert response.status == 206
+    assert body == b'FIN'
+    assert reads['read'] == 3
+
+
+def test_multiple_ranges(local_server, video, reads):
+    response, body = fetch(local_server, '/video.mp4', {'Range': f'bytes=0-4,{GIB}-{GIB + 5}'})
+    assert response.status == 206
+    content_type = response.getheader('Content-Type')
+    assert content_type.startswith('multipart/byteranges; boundary=')
+    boundary = content_type.split('boundary=', 1)[1].encode()
+    assert int(response.getheader('Content-Length')) == len(body)
+    parts = body.split(b'--' + boundary)
+    assert parts[-1] == b'--\r\n'
+    assert b'Content-Range: bytes 0-4/' in parts[1] and parts[1].endswith(b'DEBUT\r\n')
+    assert f'Content-Range: bytes {GIB}-{GIB + 5}/'.encode() in parts[2]
+    assert parts[2].endswith(b'MILIEU\r\n')
+    assert reads['read'] == 11
+
+
+def test_unsatisfiable_range(local_server, video, reads):
+    response, body = fetch(local_server, '/video.mp4', {'Range': f'bytes={2 * GIB}-'})
+    assert response.status == 416
+    assert response.getheader('Content-Range') == f'bytes */{2 * GIB}'
+    assert body == b''
+    assert reads['read'] == 0
+
+
+def test_suffix_range_on_empty_file(local_server, tmp_path):
+    (tmp_path / 'vide.txt').write_bytes(b'')
+    response, body = fetch(local_server, '/vide.txt', {'Range': 'bytes=-5'})
+    assert response.status == 416
+    assert response.getheader('Content-Range') == 'bytes */0'
+
+
+def test_if_range_mismatch_sends_full_file(local_server, tmp_path):
+    (tmp_path / 'petit.txt').write_bytes(b'0123456789')
+    response, body = fetch(local_server, '/petit.txt', {'Range': 'bytes=0-1', 'If-Range': '"autre"'})
+    assert response.status == 200
+    assert body == b'0123456789'
@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip('PySide6.QtWebEngineCore')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QCoreApplication, Qt  # noqa: E402
+from PySide6.QtWebEngineCore import QWebEngineProfile  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from python.src.ordo.eink import EinkController  # noqa: E402
+
+MAX_RATE = 2.0  # Rafraîchissements par seconde
+
+
+@pytest.fixture(scope='module')
+def qapp():
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def eink(qapp, monkeypatch):
+    monkeypatch.setenv('ORDO_EINK', '1')
+    controller = EinkController(MAX_RATE, profile=QWebEngineProfile())
+    yield controller
+    qapp.removeEventFilter(controller)
+    controller.deleteLater()
+
+
+@pytest.fixture
+def timer_window(qapp, eink):
+    from python.src.ordo.apps_local.timer import TimerWindow
+    window = TimerWindow()
+    window.resize(400, 200)
+    window.show()
+    run_for(0.5)  # Premier affichage hors budget
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+def run_for(seconds, each=None):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if each is not None:
+            each()
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+
+def test_idle_desktop_with_running_timer_stays_within_budget(eink, timer_window):
+    assert timer_window.eink
+    timer_window.toggle()  # Minuteur démarré: un tic par minute en e-ink
+    run_for(0.5)
+    eink.reset_stats()
+    run_for(3.0)
+    stats = eink.stats()
+    # Au repos, le minuteur ne redessine qu'à la minute: au plus un passage ici
+    assert stats['refreshes'] <= 1
+    assert stats['refreshes_per_min'] <= 20
+
+
+def test_busy_window_is_throttled_and_regions_merged(eink, timer_window):
+    eink.reset_stats()
+    seconds = 2.0
+    run_for(seconds, each=timer_window.display.update)
+    stats = eink.stats()
+    assert stats['refreshes'] <= seconds * MAX_RATE + 1
+    assert stats['deferred'] > stats['refreshes']
+    # Surface comptée dans le passage lui-même: jamais plus que la fenêtre par passage
+    area = timer_window.width() * timer_window.height()
+    assert 0 < stats['dirty_area'] <= stats['refreshes'] * area
@@ -0,0 +1,49 @@
+import random
+
+from python.src.ordo.markdown import MarkdownDocument
+
+LINES = ['```', '```python', '~~~', '- item', '* autre', '1. premier', '  suite',
+         '> citation', '# Titre', 'texte', 'encore du texte', '', '']
+
+
+def structure(doc):
+    return [(b.start, b.end, b.kind, b.source, b.fence, b.carry) for b in doc.blocks]
+
+
+def test_random_edits_match_full_reparse():
+    rng = random.Random(7)
+    for _ in range(200):
+        doc = MarkdownDocument('\n'.join(rng.choice(LINES) for _ in range(rng.randint(0, 20))))
+        rendered = doc.html_blocks()
+        for _ in range(20):
+            first = rng.randint(0, len(doc.lines))
+            removed = rng.randint(0, min(3, len(doc.lines) - first))
+            new_lines = [rng.choice(LINES) for _ in range(rng.randint(0, 3))]
+            if len(doc.lines) - removed + len(new_lines) == 0:
+                continue  # Un document a toujours au moins une ligne
+            patch = doc.apply_edit(first, removed, new_lines)
+            if patch is not None:
+                index, count, html = patch
+                rendered[index:index + count] = html
+
+            full = MarkdownDocument('\n'.join(doc.lines))
+            assert structure(doc) == structure(full)
+            # Le rendu patché suit le document, y compris le HTML gardé des blocs inchangés
+            assert rendered == doc.html_blocks() == full.html_blocks()
+
+
+def test_unchanged_blocks_keep_their_html():
+    doc = MarkdownDocument('# Titre\n\nparagraphe\n\n- a\n- b')
+    doc.html_blocks()
+    title = doc.blocks[0].html
+    assert doc.apply_edit(2, 1, ['paragraphe modifié']) == (1, 1, ['<p>paragraphe modifié</p>'])
+    assert doc.blocks[0].html is title
+
+
+def test_opening_fence_turns_the_rest_into_code():
+    doc = MarkdownDocument('texte\n\n# Titre\n\n- a')
+    doc.html_blocks()
+    doc.apply_edit(1, 0, ['```'])
+    assert [b.kind for b in doc.blocks] == [b.kind for b in MarkdownDocument('\n'.join(doc.lines)).blocks]
+    doc.apply_edit(1, 1, [])
+    assert structure(doc) == structure(MarkdownDocument('texte\n\n# Titre\n\n- a'))
@@ -0,0 +1,67 @@
+import http.client
+import re
+
+from ordo_metrics import MetricsRegistry
+
+
+def get(server, target):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        conn.request('GET', target)
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def scrape(server):
+    response, body = get(server, '/__ordo/metrics')
+    assert response.status == 200
+    assert response.getheader('Content-Type') == 'text/plain; version=0.0.4; charset=utf-8'
+    return body.decode('utf-8').splitlines()
+
+
+def test_metrics_endpoint_renders_prometheus_text(local_server, tmp_path):
+    (tmp_path / 'index.html').write_bytes(b'<p>ordo</p>')
+    for _ in range(2):
+        response, _ = get(local_server, '/index.html')
+        assert response.status == 200
+    get(local_server, '/absent.html')
+
+    lines = scrape(local_server)
+    assert 'ordo_requests_total{method="GET",status="200"} 2' in lines
+    assert 'ordo_requests_total{method="GET",status="404"} 1' in lines
+    assert 'ordo_request_duration_seconds_bucket{path="/index.html",le="+Inf"} 2' in lines
+    assert 'ordo_request_duration_seconds_count{path="/index.html"} 2' in lines
+    assert '# TYPE ordo_request_duration_seconds histogram' in lines
+    # Chaque série appartient à une famille déclarée par un TYPE
+    families = {line.split()[2] for line in lines if line.startswith('# TYPE ')}
+    for line in lines:
+        if not line.startswith('#'):
+            name = re.match(r'[a-z_]+', line).group()
+            assert name in families or re.sub(r'_(bucket|sum|count)$', '', name) in families
+
+
+def test_proxied_requests_share_one_path_label(local_server):
+    # Proxy désactivé: refusées, mais toujours comptées sous un seul chemin
+    for n in range(5):
+        get(local_server, f'/__ordo/proxy/https://cdn{n}.example/lib.js')
+        get(local_server, f'http://site{n}.example/page')
+
+    lines = scrape(local_server)
+    paths = {line.split('path="', 1)[1].split('"', 1)[0]
+             for line in lines if line.startswith('ordo_request_duration_seconds_count')}
+    assert paths == {'/__ordo/proxy/'}
+    assert 'ordo_request_duration_seconds_count{path="/__ordo/proxy/"} 10' in lines
+
+
+def test_label_values_are_escaped():
+    metrics = MetricsRegistry()
+    metrics.observe_request('GET', '/a"b\\c\nd', 200, 10, 0.002)
+    metrics.observe_cache('pack', True)
+    metrics.observe_cache('pack', False)
+    text = metrics.render()
+    assert 'ordo_request_duration_seconds_count{path="/a\\"b\\\\c\\nd"} 1\n' in text
+    assert 'ordo_request_duration_seconds_bucket{path="/a\\"b\\\\c\\nd",le="0.0025"} 1\n' in text
+    assert 'ordo_cache_hit_ratio{cache="pack"} 0.5\n' in text
+    assert 'ordo_response_bytes_total 10\n' in text
@@ -0,0 +1,222 @@
+import http.client
+import http.server
+import socket
+import threading
+
+import pytest
+
+import ordo_proxy
+from ordo_proxy import CachingProxy, ProxyCache, ProxyPolicy
+
+
+class OriginHandler(http.server.BaseHTTPRequestHandler):
+    """Origine simulée: ressources fraîches, à revalider, volumineuses, et POST"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path, self.headers.get('If-None-Match')))
+        if self.path == '/fresh':
+            self._send(200, b'contenu frais', {'Cache-Control': 'max-age=60'})
+        elif self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, b'', {'ETag': '"v1"', 'Cache-Control': 'no-cache'})
+            else:
+                self._send(200, b'version 1', {'ETag': '"v1"', 'Cache-Control': 'no-cache'})
+        elif self.path == '/private':
+            self._send(200, b'mon compte', {'Cache-Control': 'private, max-age=60'})
+        elif self.path == '/public':
+            self._send(200, b'public', {'Cache-Control': 'public, max-age=60'})
+        elif self.path == '/cookie':
+            self._send(200, b'avec cookie', {'Cache-Control': 'max-age=60', 'Set-Cookie': 'session=secret'})
+        elif self.path.startswith('/big/'):
+            self._send(200, self.path.encode().ljust(600, b'.'), {'Cache-Control': 'max-age=60'})
+        else:
+            self._send(404, b'absent', {})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append(('POST', self.path, None))
+        self._send(200, b'recu: ' + body, {})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), OriginHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def proxy_server(local_server, tmp_path, origin):
+    # L'origine de test est sur la boucle locale: autorisée pour ces tests seulement
+    policy = ProxyPolicy(ports=(origin.server_address[1],), allow_private=True)
+    local_server.proxy = CachingProxy(ProxyCache(tmp_path / 'cache', max_bytes=2000), policy)
+    return local_server
+
+
+def request(server, method, target, body=None, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        conn.request(method, target, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def test_second_fetch_is_a_cache_hit(proxy_server, origin):
+    first, body1 = request(proxy_server, 'GET', origin.url + '/fresh')
+    second, body2 = request(proxy_server, 'GET', origin.url + '/fresh')
+    assert first.getheader('X-Ordo-Cache') == 'MISS'
+    assert second.getheader('X-Ordo-Cache') == 'HIT'
+    assert body1 == body2 == b'contenu frais'
+    assert [r[1] for r in origin.requests] == ['/fresh']
+
+
+def test_reverse_proxy_path_uses_the_same_cache(proxy_server, origin):
+    request(proxy_server, 'GET', origin.url + '/fresh')
+    response, body = request(proxy_server, 'GET', '/__ordo/proxy/' + origin.url + '/fresh',
+                             headers={'Cookie': 'session=locale'})
+    assert response.getheader('X-Ordo-Cache') == 'HIT'
+    assert body == b'contenu frais'
+
+
+def test_stale_entry_is_revalidated(proxy_server, origin):
+    first, _ = request(proxy_server, 'GET', origin.url + '/etag')
+    second, body = request(proxy_server, 'GET', origin.url + '/etag')
+    assert first.getheader('X-Ordo-Cache') == 'MISS'
+    assert second.getheader('X-Ordo-Cache') == 'HIT'
+    assert body == b'version 1'
+    assert origin.requests == [('GET', '/etag', None), ('GET', '/etag', '"v1"')]
+
+
+def test_stale_entry_served_when_origin_is_down(proxy_server, origin):
+    request(proxy_server, 'GET', origin.url + '/etag')
+    origin.shutdown()
+    origin.server_close()
+    response, body = request(proxy_server, 'GET', origin.url + '/etag')
+    assert response.status == 200
+    assert body == b'version 1'
+    assert 'Revalidation Failed' in response.getheader('Warning')
+
+
+def test_least_recently_used_entry_is_evicted(proxy_server, origin, tmp_path):
+    for n in range(1, 5):
+        request(proxy_server, 'GET', f'{origin.url}/big/{n}')
+    cache = proxy_server.proxy.cache
+    assert cache._size <= cache.max_bytes
+    assert len(list((tmp_path / 'cache').glob('*.body'))) == len(cache._lru) < 4
+
+    recent, _ = request(proxy_server, 'GET', f'{origin.url}/big/4')
+    evicted, body = request(proxy_server, 'GET', f'{origin.url}/big/1')
+    assert recent.getheader('X-Ordo-Cache') == 'HIT'
+    assert evicted.getheader('X-Ordo-Cache') == 'MISS'
+    assert body.startswith(b'/big/1')
+
+
+def test_post_is_relayed_and_invalidates_cached_get(proxy_server, origin):
+    request(proxy_server, 'GET', origin.url + '/fresh')
+    response, body = request(proxy_server, 'POST', origin.url + '/fresh', body=b'a=1',
+                             headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    assert response.status == 200
+    assert body == b'recu: a=1'
+    again, _ = request(proxy_server, 'GET', origin.url + '/fresh')
+    assert again.getheader('X-Ordo-Cache') == 'MISS'
+
+
+def test_policy_refuses_local_network_and_other_ports(local_server, tmp_path, origin):
+    local_server.proxy = CachingProxy(ProxyCache(tmp_path / 'cache'), ProxyPolicy())
+    response, _ = request(local_server, 'GET', origin.url + '/fresh')
+    assert response.status == 403
+    response, _ = request(local_server, 'GET', 'http://localhost/fresh')
+    assert response.status == 403
+    response, _ = request(local_server, 'CONNECT', '127.0.0.1:22')
+    assert response.status == 403
+    response, _ = request(local_server, 'CONNECT', 'localhost:443')
+    assert response.status == 403
+    assert origin.requests == []
+
+
+def test_policy_host_list():
+    policy = ProxyPolicy(hosts=['youtube.com', 'searx.be'])
+    assert policy.allows_host('www.youtube.com')
+    assert policy.allows_host('searx.be')
+    assert not policy.allows_host('notyoutube.com')
+    assert policy.check('i.youtube.com', 443, connect=True) is None
+    assert policy.check('youtube.com', 8080) is not None
+    assert policy.check('evil.example', 443) is not None
+
+
+def test_private_response_is_not_stored(proxy_server, origin):
+    first, _ = request(proxy_server, 'GET', origin.url + '/private')
+    second, body = request(proxy_server, 'GET', origin.url + '/private')
+    assert first.getheader('X-Ordo-Cache') == second.getheader('X-Ordo-Cache') == 'MISS'
+    assert body == b'mon compte'
+    assert len(origin.requests) == 2
+
+
+def test_authenticated_request_stored_only_if_public(proxy_server, origin):
+    auth = {'Authorization': 'Bearer jeton'}
+    request(proxy_server, 'GET', origin.url + '/fresh', headers=auth)
+    again, _ = request(proxy_server, 'GET', origin.url + '/fresh', headers=auth)
+    assert again.getheader('X-Ordo-Cache') == 'MISS'
+
+    request(proxy_server, 'GET', origin.url + '/public', headers=auth)
+    again, _ = request(proxy_server, 'GET', origin.url + '/public', headers=auth)
+    assert again.getheader('X-Ordo-Cache') == 'HIT'
+
+
+def test_set_cookie_is_not_replayed_from_cache(proxy_server, origin):
+    first, _ = request(proxy_server, 'GET', origin.url + '/cookie')
+    second, body = request(proxy_server, 'GET', origin.url + '/cookie')
+    assert first.getheader('Set-Cookie') == 'session=secret'
+    assert second.getheader('X-Ordo-Cache') == 'HIT'
+    assert second.getheader('Set-Cookie') is None
+    assert body == b'avec cookie'
+
+
+def test_connection_uses_the_checked_address(local_server, tmp_path, origin, monkeypatch):
+    """Rebinding DNS: la seconde résolution pointerait vers la boucle locale"""
+    port = origin.server_address[1]
+    answers = iter(['93.184.216.34', '127.0.0.1'])
+    real_getaddrinfo = socket.getaddrinfo
+    real_create_connection = socket.create_connection
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != 'rebind.example':
+            return real_getaddrinfo(host, port, *args, **kwargs)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (next(answers, '127.0.0.1'), port))]
+
+    monkeypatch.setattr(ordo_proxy.socket, 'getaddrinfo', getaddrinfo)
+    connected = []
+
+    def create_connection(address, *args, **kwargs):
+        if address[1] != port:
+            return real_create_connection(address, *args, **kwargs)  # Client de test
+        connected.append(address)
+        raise OSError('injoignable')
+
+    monkeypatch.setattr(ordo_proxy.socket, 'create_connection', create_connection)
+    local_server.proxy = CachingProxy(ProxyCache(tmp_path / 'cache'), ProxyPolicy(ports=(port,)))
+    response, _ = request(local_server, 'GET', f'http://rebind.example:{port}/fresh')
+    assert response.status == 502
+    assert connected == [('93.184.216.34', port)]
+    assert origin.requests == []
@@ -0,0 +1,31 @@
+from python.src.ordo.routing import BLOCK, reverse_proxy_url, route_subresource, upstream_url
+
+BASE = 'http://127.0.0.1:8000'
+
+
+class FakeBlocklist:
+    def check(self, site, host, allow=()):
+        return host.endswith('ads.example') and host not in allow
+
+
+def test_blocked_before_redirect():
+    route = route_subresource('https://cdn.ads.example/x.js', 'app', 'GET', True,
+                              blocklist=FakeBlocklist(), proxy_base=BASE, proxied=lambda host: True)
+    assert route == BLOCK
+
+
+def test_https_cacheable_get_of_proxied_host_is_redirected():
+    url = 'https://i.ytimg.com/vi/a.jpg?x=1'
+    route = route_subresource(url, 'youtube', 'GET', True, proxy_base=BASE,
+                              proxied=lambda host: host.endswith('ytimg.com'))
+    assert route == reverse_proxy_url(BASE, url)
+    assert upstream_url(route, BASE) == url
+
+
+def test_other_requests_are_left_alone():
+    proxied = lambda host: True  # noqa: E731
+    assert route_subresource('http://a.example/x.js', 'app', 'GET', True, proxy_base=BASE, proxied=proxied) is None
+    assert route_subresource('https://a.example/api', 'app', 'POST', True, proxy_base=BASE, proxied=proxied) is None
+    assert route_subresource('https://a.example/api', 'app', 'GET', False, proxy_base=BASE, proxied=proxied) is None
+    assert route_subresource('https://a.example/x.js', 'app', 'GET', True, proxied=proxied) is None
+    assert upstream_url('https://a.example/x.js', BASE) is None
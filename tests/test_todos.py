@@ -0,0 +1,145 @@
+import json
+import random
+from datetime import datetime
+
+import pytest
+
+from python.src.ordo.todos import ReminderQueue, SortedIndex, TodoStore, parse_quick_add
+
+
+def test_sorted_index_matches_sorted_list_across_splits_and_removals(monkeypatch):
+    monkeypatch.setattr(SortedIndex, 'LOAD', 4)  # Seaux minuscules: beaucoup de découpes
+    rng = random.Random(1)
+    index, reference = SortedIndex(), []
+    for _ in range(2000):
+        key = (rng.randint(0, 300), rng.randint(0, 10))
+        if reference and rng.random() < 0.4:
+            key = rng.choice(reference)
+            index.remove(key)
+            reference.remove(key)
+        else:
+            index.add(key)
+            reference.append(key)
+        assert len(index) == len(reference)
+    reference.sort()
+    assert list(index.irange()) == reference
+    assert list(index.irange((100,), (200,))) == [k for k in reference if (100,) <= k < (200,)]
+    assert list(index.irange((1000,))) == []
+
+
+def test_sorted_index_remove_missing_key_raises():
+    index = SortedIndex()
+    index.add(5)
+    for missing in (4, 6):
+        with pytest.raises(KeyError):
+            index.remove(missing)
+
+
+def test_reminder_queue_skips_stale_entries():
+    queue = ReminderQueue()
+    queue.schedule(1, 100.0)
+    queue.schedule(2, 50.0)
+    queue.schedule(2, 300.0)  # Replanifié: l'entrée à 50 devient périmée
+    queue.schedule(3, 200.0)
+    queue.cancel(3)
+    assert queue.next_deadline() == 100.0
+    assert queue.pop_due(250.0) == [1]
+    assert queue.pop_due(1000.0) == [2]
+    assert queue.next_deadline() is None
+    assert len(queue) == 0
+
+
+def test_reminder_queue_rebuilds_when_stale_entries_dominate():
+    queue = ReminderQueue()
+    for n in range(1000):
+        queue.schedule(0, float(n))
+    assert len(queue._heap) <= 2 * len(queue) + 64
+    assert queue.pop_due(2000.0) == [0]
+
+
+def test_store_views_follow_updates():
+    store = TodoStore()
+    a = store.add('a', due=200.0, tags=['#Maison'])
+    b = store.add('b', due=100.0, priority=2, tags=['maison'])
+    c = store.add('c')
+    assert [t.id for t in store.open_todos()] == [b.id, a.id, c.id]
+    assert [t.id for t in store.tagged('MAISON')] == [b.id, a.id]
+    store.update(a.id, due=50.0)
+    assert [t.id for t in store.overdue(150.0)] == [a.id, b.id]
+    store.toggle(b.id)
+    assert [t.id for t in store.completed()] == [b.id]
+    assert [t.id for t in store.tagged('maison')] == [a.id]
+    store.remove(a.id)
+    assert 'maison' not in store.tags
+    assert [t.id for t in store.open_todos()] == [c.id]
+
+
+def test_reminder_delivered_once_and_rearmed_by_new_due():
+    store = TodoStore()
+    todo = store.add('appel', due=100.0)
+    assert [t.id for t in store.pop_due_reminders(150.0)] == [todo.id]
+    assert store.pop_due_reminders(1000.0) == []
+    store.update(todo.id, due=2000.0)
+    assert store.reminders.next_deadline() == 2000.0
+
+
+def test_journal_replay_survives_truncated_line(tmp_path):
+    path = tmp_path / 'todos.json'
+    store = TodoStore(path)
+    first = store.add('premier', due=100.0)
+    second = store.add('second')
+    store.update(first.id, text='premier modifié')
+    store.remove(second.id)
+    with open(store.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "put", "todo": {"id": 9, "te')  # Arrêt brutal en pleine écriture
+
+    reloaded = TodoStore(path)
+    reloaded.load()
+    assert {t.id: t.text for t in reloaded.todos.values()} == {first.id: 'premier modifié'}
+    assert reloaded.journal_entries == 4
+    assert reloaded.next_id == 2
+    assert reloaded.reminders.next_deadline() == 100.0
+
+
+def test_compact_writes_snapshot_and_clears_journal(tmp_path):
+    path = tmp_path / 'todos.json'
+    store = TodoStore(path)
+    store.add('a', tags=['x'])
+    store.add('b')
+    store.compact()
+    assert not store.journal_path.exists()
+    assert [item['text'] for item in json.loads(path.read_text(encoding='utf-8'))] == ['a', 'b']
+    reloaded = TodoStore(path)
+    reloaded.load()
+    assert [t.text for t in reloaded.tagged('x')] == ['a']
+
+
+def test_legacy_snapshot_format_is_read(tmp_path):
+    path = tmp_path / 'todos.json'
+    path.write_text(json.dumps([{'text': 'ancien', 'completed': True}]), encoding='utf-8')
+    store = TodoStore(path)
+    store.load()
+    assert [(t.id, t.text, t.completed) for t in store.todos.values()] == [(0, 'ancien', True)]
+
+
+def test_quick_add_fields():
+    now = datetime(2026, 10, 19, 12, 0)
+    parsed = parse_quick_add('Payer le loyer @demain !2 #maison #Urgent', now)
+    assert parsed['text'] == 'Payer le loyer'
+    assert parsed['priority'] == 2
+    assert parsed['tags'] == ['maison', 'Urgent']
+    assert datetime.fromtimestamp(parsed['due']) == datetime(2026, 10, 20, 9, 0)
+
+    parsed = parse_quick_add('Réunion @2026-10-21T14:30', now)
+    assert datetime.fromtimestamp(parsed['due']) == datetime(2026, 10, 21, 14, 30)
+
+    parsed = parse_quick_add('écrire à @marie !9', now)
+    assert parsed == {'text': 'écrire à @marie !9', 'due': None, 'priority': 0, 'tags': []}
+
+
+def test_quick_add_time_only_rolls_over_to_tomorrow():
+    evening = parse_quick_add('Sport @18:00', datetime(2026, 10, 19, 12, 0))
+    assert datetime.fromtimestamp(evening['due']) == datetime(2026, 10, 19, 18, 0)
+    late = parse_quick_add('Sport @18h', datetime(2026, 10, 19, 18, 0))
+    assert datetime.fromtimestamp(late['due']) == datetime(2026, 10, 20, 18, 0)
+    assert parse_quick_add('x @25:00', datetime(2026, 10, 19))['due'] is None
@@ -0,0 +1,35 @@
+from python.src.ordo import vault as vault_module
+from python.src.ordo.vault import Vault
+
+
+def test_saves_during_rebuild_are_kept(tmp_path, monkeypatch):
+    notes = Vault(tmp_path)
+    for n in range(3):
+        notes.write(f'note-{n}.md', f'ancien contenu {n}')
+    notes.sync()
+
+    index_chunk = vault_module._index_chunk
+
+    def save_while_indexing(root, chunk):
+        # Sauvegarde pendant la reconstruction, une fois les notes lues
+        result = index_chunk(root, chunk)
+        notes.write('note-0.md', 'texte modifie pendant la reconstruction')
+        notes.reindex('note-0.md', notes.read('note-0.md'))
+        notes.write('nouvelle.md', 'note creee pendant la reconstruction')
+        notes.reindex('nouvelle.md', notes.read('nouvelle.md'))
+        return result
+
+    monkeypatch.setattr(vault_module, '_index_chunk', save_while_indexing)
+    notes.index.rebuild(notes.list_notes())
+
+    assert [hit.path for hit in notes.index.search('modifie')] == ['note-0.md']
+    assert [hit.path for hit in notes.index.search('creee')] == ['nouvelle.md']
+    assert sorted(hit.path for hit in notes.index.search('ancien ')) == ['note-1.md', 'note-2.md']
+    assert len(set(notes.index.by_path.values())) == len(notes.index.by_path) == 4
+
+    # Le journal conservé survit à une réouverture
+    reopened = Vault(tmp_path)
+    assert reopened.index.load()
+    assert [hit.path for hit in reopened.index.search('creee')] == ['nouvelle.md']
+    notes.index.close()
+    reopened.index.close()
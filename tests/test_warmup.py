@@ -0,0 +1,130 @@
+import http.server
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('PySide6.QtWebEngineCore')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, Qt, QUrl  # noqa: E402
+from PySide6.QtGui import QKeyEvent  # noqa: E402
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from python.src.ordo import warmup  # noqa: E402
+
+ORIGIN_DELAY = 0.3  # Temps de réponse simulé de l'origine (premier octet)
+
+
+class OriginHandler(http.server.BaseHTTPRequestHandler):
+    """Origine distante simulée: ressource cachable, servie lentement"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        time.sleep(ORIGIN_DELAY)
+        body = b'window.warm = true;'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/javascript')
+        self.send_header('Cache-Control', 'public, max-age=3600')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def qapp():
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def origin():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), OriginHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fast_warmer(monkeypatch):
+    monkeypatch.setattr(warmup.IdleWarmer, 'IDLE_DELAY_MS', 50)
+    monkeypatch.setattr(warmup.IdleWarmer, 'STEP_INTERVAL_MS', 50)
+    monkeypatch.setattr(warmup.IdleWarmer, 'RETRY_DELAY_MS', 50)
+    monkeypatch.setattr(warmup, 'warmup_allowed', lambda: True)
+
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+    return predicate()
+
+
+def make_app(origin):
+    return SimpleNamespace(id='distante', url=origin.url + '/', warm_on_idle=True,
+                           preconnect=(origin.url,), prefetch=(origin.url + '/app.js',))
+
+
+def first_load_seconds(profile, origin):
+    """Durée de chargement d'une page qui utilise la ressource de l'origine"""
+    page = QWebEnginePage(profile)
+    done = []
+    page.loadFinished.connect(done.append)
+    start = time.monotonic()
+    page.setHtml(f'<script src="{origin.url}/app.js"></script>', QUrl(origin.url + '/'))
+    assert wait_until(lambda: done)
+    elapsed = time.monotonic() - start
+    page.deleteLater()
+    return elapsed
+
+
+def test_warmup_prefetches_and_speeds_up_first_load(qapp, origin, fast_warmer):
+    cold = first_load_seconds(QWebEngineProfile(), origin)
+    assert origin.requests == ['/app.js']
+
+    profile = QWebEngineProfile()
+    warmer = warmup.IdleWarmer([make_app(origin)], profile=profile)
+    warmer.start()
+    assert wait_until(lambda: len(origin.requests) == 2)
+    assert warmer.warmed == ['distante']
+    assert warmer.prefetches_used == 1
+
+    warm = first_load_seconds(profile, origin)
+    # Servie depuis le cache HTTP du profil: l'origine n'est pas recontactée
+    assert len(origin.requests) == 2
+    assert warm < cold - ORIGIN_DELAY / 2
+
+
+def test_refused_warmup_is_retried(qapp, origin, fast_warmer, monkeypatch):
+    answers = iter([False, False, True])
+    monkeypatch.setattr(warmup, 'warmup_allowed', lambda: next(answers, True))
+    warmer = warmup.IdleWarmer([make_app(origin)], profile=QWebEngineProfile())
+    warmer.start()
+    assert wait_until(lambda: warmer.warmed == ['distante'])
+    assert wait_until(lambda: origin.requests == ['/app.js'])
+
+
+def test_user_input_postpones_warmup(qapp, origin, fast_warmer, monkeypatch):
+    monkeypatch.setattr(warmup.IdleWarmer, 'IDLE_DELAY_MS', 300)
+    warmer = warmup.IdleWarmer([make_app(origin)], profile=QWebEngineProfile())
+    warmer.start()
+    target = QObject()
+    typing_until = time.monotonic() + 1.0
+    while time.monotonic() < typing_until:
+        # Le filtre de l'application voit les saisies destinées à tout objet
+        QCoreApplication.sendEvent(target, QKeyEvent(QEvent.KeyPress, Qt.Key_A, Qt.NoModifier, 'a'))
+        QCoreApplication.processEvents()
+        time.sleep(0.05)
+    assert warmer.warmed == []
+    assert wait_until(lambda: warmer.warmed == ['distante'])